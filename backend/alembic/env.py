@@ -15,6 +15,9 @@ from app.models.equipment import Equipment  # noqa: F401
 from app.models.technique import Technique  # noqa: F401
 from app.models.embedding import CulinaryEmbedding  # noqa: F401
 from app.models.plan_history import PlanHistory  # noqa: F401
+from app.models.substitute_neighbor import SubstituteNeighbor  # noqa: F401
+from app.models.llm_cache import LLMCacheEntry  # noqa: F401
+from app.models.plan_job import PlanJob  # noqa: F401
 
 config = context.config
 config.set_main_option("sqlalchemy.url", settings.database_url)
@@ -0,0 +1,40 @@
+"""substitute neighbors
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "002"
+down_revision = "001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "substitute_neighbors",
+        sa.Column(
+            "ingredient_id",
+            sa.Integer(),
+            sa.ForeignKey("ingredients.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column(
+            "neighbor_id",
+            sa.Integer(),
+            sa.ForeignKey("ingredients.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("jaccard_score", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("ingredient_id", "rank", name="pk_substitute_neighbors"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("substitute_neighbors")
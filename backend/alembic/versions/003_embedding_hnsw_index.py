@@ -0,0 +1,30 @@
+"""hnsw index on culinary_embeddings
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+# revision identifiers
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # HNSW needs no training data, so unlike IVFFlat it can be created up
+    # front and is maintained as ingest adds rows.  Rebuild or switch to
+    # IVFFlat with `python -m seed.vector_index`.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_culinary_embeddings_embedding_hnsw "
+        "ON culinary_embeddings USING hnsw (embedding vector_cosine_ops) "
+        "WITH (m = 16, ef_construction = 64)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_culinary_embeddings_embedding_hnsw")
+    op.execute("DROP INDEX IF EXISTS ix_culinary_embeddings_embedding_ivfflat")
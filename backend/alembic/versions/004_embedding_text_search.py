@@ -0,0 +1,33 @@
+"""full-text search column on culinary_embeddings
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+# revision identifiers
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Generated column, so ingest needs no changes to populate it
+    op.execute(
+        "ALTER TABLE culinary_embeddings ADD COLUMN text_search tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', text_content)) STORED"
+    )
+    op.create_index(
+        "ix_culinary_embeddings_text_search",
+        "culinary_embeddings",
+        ["text_search"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_culinary_embeddings_text_search", table_name="culinary_embeddings")
+    op.drop_column("culinary_embeddings", "text_search")
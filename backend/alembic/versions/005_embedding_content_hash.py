@@ -0,0 +1,34 @@
+"""content hash on culinary_embeddings
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "culinary_embeddings", sa.Column("content_hash", sa.String(64), nullable=True)
+    )
+    # Same digest as app.services.knowledge_base.content_hash (sha256 of UTF-8 text)
+    op.execute(
+        "UPDATE culinary_embeddings "
+        "SET content_hash = encode(sha256(convert_to(text_content, 'UTF8')), 'hex')"
+    )
+    op.create_index(
+        "ix_culinary_embeddings_content_hash", "culinary_embeddings", ["content_hash"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_culinary_embeddings_content_hash", table_name="culinary_embeddings")
+    op.drop_column("culinary_embeddings", "content_hash")
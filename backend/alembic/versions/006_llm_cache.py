@@ -0,0 +1,41 @@
+"""llm response cache
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = "006"
+down_revision = "005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_cache",
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("value", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "accessed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_llm_cache_accessed_at", "llm_cache", ["accessed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_cache_accessed_at", table_name="llm_cache")
+    op.drop_table("llm_cache")
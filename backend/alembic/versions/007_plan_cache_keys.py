@@ -0,0 +1,38 @@
+"""plan cache keys on plan_history
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+from app.core.config import settings
+
+# revision identifiers
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("plan_history", sa.Column("request_hash", sa.String(64), nullable=True))
+    op.add_column("plan_history", sa.Column("constraint_hash", sa.String(64), nullable=True))
+    # Same dimension as the PlanHistory model; changing EMBEDDING_DIM later needs a migration
+    op.add_column(
+        "plan_history",
+        sa.Column("request_embedding", Vector(settings.embedding_dim), nullable=True),
+    )
+    op.create_index("ix_plan_history_request_hash", "plan_history", ["request_hash"])
+    op.create_index("ix_plan_history_constraint_hash", "plan_history", ["constraint_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_plan_history_constraint_hash", table_name="plan_history")
+    op.drop_index("ix_plan_history_request_hash", table_name="plan_history")
+    op.drop_column("plan_history", "request_embedding")
+    op.drop_column("plan_history", "constraint_hash")
+    op.drop_column("plan_history", "request_hash")
@@ -0,0 +1,45 @@
+"""plan generation job queue
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+# revision identifiers
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "plan_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("status", sa.String(16), nullable=False, server_default="pending"),
+        sa.Column("audit_request", JSONB(), nullable=False),
+        sa.Column("llm_backend", sa.String(32), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("worker_id", sa.String(100), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_plan_jobs_claim", "plan_jobs", ["llm_backend", "status", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_plan_jobs_claim", table_name="plan_jobs")
+    op.drop_table("plan_jobs")
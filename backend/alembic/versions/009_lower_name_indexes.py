@@ -0,0 +1,24 @@
+"""functional lower(name) indexes for bulk name resolution
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+# revision identifiers
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX ix_ingredients_lower_name ON ingredients (lower(name))")
+    op.execute("CREATE INDEX ix_equipment_lower_name ON equipment (lower(name))")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_equipment_lower_name")
+    op.execute("DROP INDEX IF EXISTS ix_ingredients_lower_name")
@@ -5,14 +5,16 @@ and flags impossible scenarios.
 """
 
 import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
 
-from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.base import AgentContext, AgentTrace
 from app.models.equipment import Equipment
 from app.models.ingredient import Ingredient
 from app.schemas.audit import ConstraintFlags
+from app.services.name_resolver import resolve_names
 
 logger = logging.getLogger(__name__)
 
@@ -43,12 +45,41 @@ CAPABILITY_RULES: dict[str, list[str]] = {
 }
 
 
-async def run_audit(ctx: AgentContext, session: AsyncSession) -> AgentContext:
-    """Run the auditor agent to map constraints."""
+@dataclass
+class AuditCatalog:
+    """Equipment and ingredient rows keyed by lowercased name, loaded once for
+    several requests (batch generation)."""
+
+    equipment: dict[str, Equipment]
+    ingredients: dict[str, Ingredient]
+
+
+async def load_audit_catalog(
+    session: AsyncSession, equipment: Iterable[str], ingredients: Iterable[str]
+) -> AuditCatalog:
+    """One ``lower(name) = ANY(...)`` query per table, however many names."""
+    return AuditCatalog(
+        equipment=await resolve_names(session, Equipment, equipment),
+        ingredients=await resolve_names(session, Ingredient, ingredients),
+    )
+
+
+async def run_audit(
+    ctx: AgentContext, session: AsyncSession | None, catalog: AuditCatalog | None = None
+) -> AgentContext:
+    """Run the auditor agent to map constraints.
+
+    The request's equipment and ingredients are resolved in bulk (or taken
+    from a preloaded batch ``catalog``, in which case ``session`` may be None);
+    resolved ingredient rows are kept on the context for the Translator.
+    """
     import time
     start = time.monotonic()
 
     req = ctx.audit_request
+    if catalog is None:
+        catalog = await load_audit_catalog(session, req.equipment, req.ingredients)
+    ctx.ingredient_rows = dict(catalog.ingredients)
 
     # Determine capabilities from equipment
     capabilities = set()
@@ -59,12 +90,8 @@ async def run_audit(ctx: AgentContext, session: AsyncSession) -> AgentContext:
             if pattern in equip_lower:
                 capabilities.update(caps)
 
-        # Also check DB for capabilities (exact match first, then substring)
-        stmt = select(Equipment).where(
-            func.lower(Equipment.name) == equip_lower
-        )
-        result = await session.execute(stmt)
-        db_equip = result.scalar_one_or_none()
+        # Also check the resolved DB row for capabilities
+        db_equip = catalog.equipment.get(equip_lower)
         if db_equip and db_equip.capabilities:
             capabilities.update(db_equip.capabilities)
 
@@ -93,11 +120,7 @@ async def run_audit(ctx: AgentContext, session: AsyncSession) -> AgentContext:
     # Validate ingredients exist in DB
     flags = []
     for ing_name in req.ingredients:
-        stmt = select(Ingredient).where(
-            func.lower(Ingredient.name) == ing_name.lower()
-        )
-        result = await session.execute(stmt)
-        if not result.scalar_one_or_none():
+        if ing_name.lower() not in catalog.ingredients:
             flags.append(f"Ingredient '{ing_name}' not in database — will use LLM knowledge")
 
     # Flag potential issues
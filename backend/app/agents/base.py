@@ -1,7 +1,9 @@
 """Shared context passed through the 4-agent pipeline."""
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
 
+from app.models.ingredient import Ingredient
 from app.schemas.audit import AuditRequest, ConstraintFlags
 from app.schemas.plan import (
     ChefSecret,
@@ -18,6 +20,9 @@ class AgentTrace:
     output_summary: str
     latency_ms: int = 0
     error: str | None = None
+    # Wall-clock offsets from pipeline start (set by the DAG scheduler)
+    started_ms: int | None = None
+    finished_ms: int | None = None
 
 
 @dataclass
@@ -28,6 +33,14 @@ class AgentContext:
     # Phase 1: Auditor output
     constraints: ConstraintFlags | None = None
     flags: list[str] = field(default_factory=list)
+    # Ingredient rows resolved by lowercased name; the Translator's scaling
+    # step reuses them and adds any it has to resolve itself
+    ingredient_rows: dict[str, Ingredient] = field(default_factory=dict)
+
+    # Translator prefetches (run concurrently with the Auditor)
+    affinities_text: list[str] | None = None
+    flavor_set_suggestions: list[str] | None = None
+    knowledge_text: str | None = None
 
     # Phase 2: Translator output
     dish_concept: str = ""
@@ -48,6 +61,9 @@ class AgentContext:
     # Tracing
     trace: list[AgentTrace] = field(default_factory=list)
 
+    # Progress sink for streaming clients: emit(event_name, data)
+    emit: Callable[[str, dict], None] | None = None
+
     def to_plan(self) -> ExecutionPlan:
         return ExecutionPlan(
             dish_name=self.dish_name,
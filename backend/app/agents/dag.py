@@ -0,0 +1,144 @@
+"""Minimal DAG scheduler for pipeline stages.
+
+Each stage declares the context keys it ``requires`` and ``provides``; a stage
+starts as soon as everything it requires has been provided, so independent
+stages (e.g. the Auditor and the Translator's knowledge/affinity prefetches)
+run concurrently.  ``audit_request`` is available from the start.
+
+An ``AsyncSession`` must not be shared by concurrent tasks, so stages with
+``uses_db`` get their own session from ``session_factory``.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.base import AgentContext, AgentTrace
+
+logger = logging.getLogger(__name__)
+
+INITIAL_KEYS = frozenset({"audit_request"})
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    run: Callable[[AgentContext, AsyncSession | None], Awaitable[object]]
+    requires: frozenset[str] = frozenset()
+    provides: frozenset[str] = frozenset()
+    uses_db: bool = False
+
+
+def validate_stages(stages: list[Stage]) -> None:
+    """Raise ValueError on duplicate names/outputs or unsatisfiable requirements."""
+    names = [s.name for s in stages]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate stage names: {names}")
+    provided = set(INITIAL_KEYS)
+    for stage in stages:
+        overlap = provided & stage.provides
+        if overlap:
+            raise ValueError(f"{stage.name} re-provides {sorted(overlap)}")
+        provided |= stage.provides
+
+    available = set(INITIAL_KEYS)
+    remaining = list(stages)
+    while remaining:
+        ready = [s for s in remaining if s.requires <= available]
+        if not ready:
+            missing = {s.name: sorted(s.requires - available) for s in remaining}
+            raise ValueError(f"Unsatisfiable or cyclic stage requirements: {missing}")
+        for stage in ready:
+            available |= stage.provides
+            remaining.remove(stage)
+
+
+def _record(ctx: AgentContext, stage: Stage, started: float, origin: float, error: str | None):
+    """Attach wall-clock offsets to the stage's own AgentTrace, or add one."""
+    started_ms = int((started - origin) * 1000)
+    finished_ms = int((time.monotonic() - origin) * 1000)
+    for trace in ctx.trace:
+        if trace.agent_name == stage.name and trace.started_ms is None:
+            trace.started_ms, trace.finished_ms = started_ms, finished_ms
+            if error:
+                trace.error = error
+            break
+    else:
+        trace = AgentTrace(
+            agent_name=stage.name,
+            input_summary=", ".join(sorted(stage.requires)) or "audit_request",
+            output_summary=", ".join(sorted(stage.provides)),
+            latency_ms=finished_ms - started_ms,
+            error=error,
+            started_ms=started_ms,
+            finished_ms=finished_ms,
+        )
+        ctx.trace.append(trace)
+
+    if ctx.emit is not None:
+        ctx.emit("stage", {
+            "name": stage.name,
+            "summary": trace.output_summary,
+            "started_ms": started_ms,
+            "finished_ms": finished_ms,
+            "error": error,
+        })
+
+
+async def _run_stage(
+    stage: Stage,
+    ctx: AgentContext,
+    session_factory: Callable[[], AsyncSession],
+    origin: float,
+) -> None:
+    started = time.monotonic()
+    try:
+        if stage.uses_db:
+            async with session_factory() as session:
+                await stage.run(ctx, session)
+        else:
+            await stage.run(ctx, None)
+    except Exception as e:
+        _record(ctx, stage, started, origin, str(e))
+        raise
+    _record(ctx, stage, started, origin, None)
+
+
+async def run_dag(
+    stages: list[Stage],
+    ctx: AgentContext,
+    session_factory: Callable[[], AsyncSession],
+) -> AgentContext:
+    """Run every stage once, each as soon as its requirements are met.
+
+    The first failing stage cancels the others and its exception propagates.
+    """
+    validate_stages(stages)
+    origin = time.monotonic()
+    available = set(INITIAL_KEYS)
+    pending = list(stages)
+    running: dict[asyncio.Task, Stage] = {}
+
+    try:
+        while pending or running:
+            for stage in [s for s in pending if s.requires <= available]:
+                pending.remove(stage)
+                task = asyncio.create_task(_run_stage(stage, ctx, session_factory, origin))
+                running[task] = stage
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage = running.pop(task)
+                task.result()  # re-raise stage failures
+                available |= stage.provides
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    return ctx
@@ -1,57 +1,93 @@
-"""Pipeline Orchestrator — runs all 4 agents sequentially and persists result."""
+"""Pipeline Orchestrator — runs the 4 agents as a stage DAG and persists result.
 
+The Auditor and the Translator's affinity and knowledge prefetches depend only
+on the request, so they run concurrently; Translator → Scheduler → Executive
+Chef stay sequential.  ``run_pipeline_batch`` runs several requests with one
+shared Auditor catalog, bounded concurrency and a single plan_history insert.
+"""
+
+import asyncio
 import logging
 import time
 import uuid
+from collections.abc import Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.agents.auditor import run_audit
+from app.agents.auditor import AuditCatalog, load_audit_catalog, run_audit
 from app.agents.base import AgentContext
+from app.agents.dag import Stage, run_dag
 from app.agents.executive_chef import run_executive_chef
 from app.agents.scheduler import run_scheduler
-from app.agents.translator import run_translator
+from app.agents.translator import prefetch_affinities, prefetch_knowledge, run_translator
+from app.core.config import settings
+from app.core.database import async_session
 from app.models.plan_history import PlanHistory
 from app.schemas.audit import AuditRequest
 from app.schemas.plan import ExecutionPlan
 from app.services.llm.base import LLMService
+from app.services.plan_cache import plan_cache_columns
 
 logger = logging.getLogger(__name__)
 
 
-async def run_pipeline(
+def build_stages(llm: LLMService, catalog: AuditCatalog | None = None) -> list[Stage]:
+    return [
+        Stage(
+            "Auditor", lambda ctx, session: run_audit(ctx, session, catalog),
+            provides=frozenset({"constraints"}), uses_db=catalog is None,
+        ),
+        Stage(
+            "Affinities", prefetch_affinities,
+            provides=frozenset({"affinities"}), uses_db=True,
+        ),
+        Stage(
+            "Knowledge", lambda ctx, session: prefetch_knowledge(ctx, session, llm),
+            provides=frozenset({"knowledge"}), uses_db=True,
+        ),
+        Stage(
+            "Translator", lambda ctx, session: run_translator(ctx, session, llm),
+            requires=frozenset({"constraints", "affinities", "knowledge"}),
+            provides=frozenset({"ingredients"}), uses_db=True,
+        ),
+        Stage(
+            "Scheduler", lambda ctx, _: run_scheduler(ctx, llm),
+            requires=frozenset({"ingredients"}), provides=frozenset({"timeline"}),
+        ),
+        Stage(
+            "Executive Chef", lambda ctx, _: run_executive_chef(ctx, llm),
+            requires=frozenset({"timeline"}), provides=frozenset({"chefs_secrets"}),
+        ),
+    ]
+
+
+async def build_plan_record(
     request: AuditRequest,
-    session: AsyncSession,
     llm: LLMService,
-) -> tuple[str, ExecutionPlan]:
-    """Run the full 4-agent pipeline and return (plan_id, plan)."""
+    session_factory: Callable[[], AsyncSession] = async_session,
+    emit: Callable[[str, dict], None] | None = None,
+    plan_id: str | None = None,
+    catalog: AuditCatalog | None = None,
+) -> tuple[PlanHistory, ExecutionPlan]:
+    """Run the stage DAG and return the (unsaved) plan_history row and plan."""
     pipeline_start = time.monotonic()
 
-    ctx = AgentContext(audit_request=request)
-
-    # Phase 1: Audit (deterministic)
-    logger.info("Running Auditor...")
-    ctx = await run_audit(ctx, session)
-
-    # Phase 2: Translation (LLM)
-    logger.info("Running Translator...")
-    ctx = await run_translator(ctx, session, llm)
-
-    # Phase 3: Schedule (LLM)
-    logger.info("Running Scheduler...")
-    ctx = await run_scheduler(ctx, llm)
-
-    # Phase 4: Executive Chef review (LLM)
-    logger.info("Running Executive Chef...")
-    ctx = await run_executive_chef(ctx, llm)
+    ctx = AgentContext(audit_request=request, emit=emit)
+    await run_dag(build_stages(llm, catalog), ctx, session_factory)
 
     # Build final plan
     plan = ctx.to_plan()
 
     total_ms = int((time.monotonic() - pipeline_start) * 1000)
 
-    # Persist to plan_history
-    plan_id = str(uuid.uuid4())
+    cache_columns = {}
+    if settings.plan_cache_enabled:
+        try:
+            cache_columns = await plan_cache_columns(llm, request)
+        except Exception as e:
+            logger.warning(f"Could not compute plan cache keys: {e}")
+
+    plan_id = plan_id or str(uuid.uuid4())
     history = PlanHistory(
         id=uuid.UUID(plan_id),
         audit_request=request.model_dump(),
@@ -63,15 +99,93 @@ async def run_pipeline(
                 "input": t.input_summary,
                 "output": t.output_summary,
                 "latency_ms": t.latency_ms,
+                "started_ms": t.started_ms,
+                "finished_ms": t.finished_ms,
                 "error": t.error,
             }
             for t in ctx.trace
         ],
         model_used=getattr(llm, "_model", "unknown"),
         latency_ms=total_ms,
+        **cache_columns,
     )
+    logger.info(f"Pipeline complete in {total_ms}ms — plan_id={plan_id}")
+    return history, plan
+
+
+async def run_pipeline(
+    request: AuditRequest,
+    session: AsyncSession,
+    llm: LLMService,
+    session_factory: Callable[[], AsyncSession] = async_session,
+    emit: Callable[[str, dict], None] | None = None,
+    plan_id: str | None = None,
+) -> tuple[str, ExecutionPlan]:
+    """Run the full 4-agent pipeline and return (plan_id, plan).
+
+    Stages that touch the database get their own sessions from
+    ``session_factory``; ``session`` is used to persist the result.  With
+    ``emit``, stage completions and partial Translator output are reported
+    as they happen.  ``plan_id`` pre-assigns the id (queued jobs).
+    """
+    history, plan = await build_plan_record(request, llm, session_factory, emit, plan_id)
+
+    # Persist to plan_history
     session.add(history)
     await session.commit()
+    return str(history.id), plan
 
-    logger.info(f"Pipeline complete in {total_ms}ms — plan_id={plan_id}")
-    return plan_id, plan
+
+async def run_pipeline_batch(
+    requests: list[AuditRequest],
+    session: AsyncSession,
+    llm: LLMService,
+    session_factory: Callable[[], AsyncSession] = async_session,
+    max_concurrency: int | None = None,
+) -> list[tuple[str, ExecutionPlan] | BaseException]:
+    """Run many requests; one result or exception per request, in order.
+
+    Equipment and ingredient rows for the whole batch are loaded in one
+    catalog pass, at most ``max_concurrency`` pipelines run at a time, and
+    every successful plan is inserted in a single transaction on ``session``.
+    Each item gets its own plan, even when two items are identical (callers
+    that want reuse go through the plan cache first).  If that commit fails
+    the plans are saved one by one, and only the rows that fail report an error.
+    """
+    catalog = await load_audit_catalog(
+        session,
+        (e for r in requests for e in r.equipment),
+        (i for r in requests for i in r.ingredients),
+    )
+    semaphore = asyncio.Semaphore(max_concurrency or settings.plan_batch_concurrency)
+
+    async def generate(request: AuditRequest):
+        async with semaphore:
+            return await build_plan_record(
+                request, llm, session_factory, catalog=catalog
+            )
+
+    outcomes = await asyncio.gather(
+        *(generate(r) for r in requests), return_exceptions=True
+    )
+
+    records = {i: o[0] for i, o in enumerate(outcomes) if not isinstance(o, BaseException)}
+    try:
+        session.add_all(records.values())
+        await session.commit()
+    except Exception as e:
+        # One bad row must not lose the rest of the batch
+        await session.rollback()
+        logger.warning(f"Batch insert failed, saving plans one at a time: {e}")
+        for index, record in records.items():
+            try:
+                session.add(record)
+                await session.commit()
+            except Exception as item_error:
+                await session.rollback()
+                outcomes[index] = item_error
+
+    return [
+        o if isinstance(o, BaseException) else (str(o[0].id), o[1])
+        for o in outcomes
+    ]
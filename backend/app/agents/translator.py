@@ -2,26 +2,35 @@
 
 Retrieves culinary knowledge via pgvector, gets flavor affinities,
 calls Claude to generate dish concept + ingredients, handles scaling.
+When the context has an ``emit`` sink the output is streamed and partial
+fields are emitted as ``translator`` events while the model is still writing.
 """
 
+import json
 import logging
 import time
+from collections.abc import Callable
 
 from pydantic import BaseModel
-from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.base import AgentContext, AgentTrace
 from app.models.ingredient import Ingredient
 from app.prompts.translator import TRANSLATOR_SYSTEM, TRANSLATOR_USER
 from app.schemas.plan import PlanIngredient
-from app.services.flavor_graph import get_affinities_for_ingredient
+from app.services.flavor_graph import complete_flavor_set, get_affinities_for_ingredients
 from app.services.knowledge_base import search_knowledge
 from app.services.llm.base import LLMService
+from app.services.name_resolver import resolve_names
+from app.services.partial_json import PartialJSONParser
 from app.services.scaling import scale_ingredient, compute_rcf
 
 logger = logging.getLogger(__name__)
 
+# Knowledge chunks are token-bounded at ingest (~chunk_max_tokens), so this only
+# trims rows ingested before that; it no longer cuts a chunk to its first lines.
+_KNOWLEDGE_SNIPPET_CHARS = 1200
+
 
 class TranslatorOutput(BaseModel):
     dish_name: str
@@ -31,38 +40,114 @@ class TranslatorOutput(BaseModel):
     substitution_notes: list[str] = []
 
 
-async def run_translator(
-    ctx: AgentContext, session: AsyncSession, llm: LLMService
-) -> AgentContext:
-    start = time.monotonic()
+_STREAMED_FIELDS = ("dish_name", "dish_description", "difficulty")
+
+
+def _partial_output(value: dict, complete: bool) -> dict:
+    """Fields of a partially streamed TranslatorOutput worth showing yet."""
+    partial = {k: value[k] for k in _STREAMED_FIELDS if isinstance(value.get(k), str)}
+    items = value.get("ingredients")
+    if isinstance(items, list):
+        # The last item may still be mid-write until the document closes
+        done = items if complete else items[:-1]
+        ingredients = []
+        for item in done:
+            try:
+                ingredients.append(PlanIngredient.model_validate(item).model_dump())
+            except ValueError:
+                break
+        partial["ingredients"] = ingredients
+    return partial
+
+
+async def _generate_streaming(
+    llm: LLMService,
+    user_prompt: str,
+    emit: Callable[[str, dict], None],
+) -> TranslatorOutput:
+    system_prompt = TRANSLATOR_SYSTEM + (
+        f"\n\nRespond with valid JSON matching this schema: "
+        f"{json.dumps(TranslatorOutput.model_json_schema())}"
+    )
+    parser = PartialJSONParser()
+    last = None
+    async for token in llm.generate_stream(system_prompt, user_prompt, temperature=0.8):
+        value = parser.feed(token)
+        if not isinstance(value, dict):
+            continue
+        partial = _partial_output(value, parser.complete)
+        if partial and partial != last:
+            emit("translator", partial)
+            last = partial
+
+    if not parser.complete:
+        raise ValueError("Translator stream ended before its JSON output was complete")
+    return TranslatorOutput.model_validate(parser.value())
+
+
+def _intent(ctx: AgentContext) -> str:
     req = ctx.audit_request
-    constraints = ctx.constraints
+    return req.intent or f"dish with {', '.join(req.ingredients[:4])}"
+
 
-    # Look up ingredient IDs for affinity queries
+async def prefetch_affinities(ctx: AgentContext, session: AsyncSession) -> AgentContext:
+    """Affinity lines and flavor-set suggestions — needs only the request."""
+    req = ctx.audit_request
+
+    # Flavor affinities for the top ingredients, resolved in one batch
     affinities_text = []
-    for ing_name in req.ingredients[:6]:  # Top 6 for affordability
-        stmt = select(Ingredient).where(func.lower(Ingredient.name) == ing_name.lower())
-        result = await session.execute(stmt)
-        ing = result.scalar_one_or_none()
-        if ing:
-            affs = await get_affinities_for_ingredient(session, ing.id, min_score=0.5, limit=5)
-            for a in affs:
-                affinities_text.append(
-                    f"  {ing_name} + {a['ingredient_name']}: {a['affinity_score']:.2f}"
-                )
+    top_ingredients = req.ingredients[:6]  # Top 6 for affordability
+    affinities = await get_affinities_for_ingredients(
+        session, top_ingredients, min_score=0.5, limit=5
+    )
+    for ing_name in top_ingredients:
+        for a in affinities.get(ing_name, []):
+            affinities_text.append(
+                f"  {ing_name} + {a['ingredient_name']}: {a['affinity_score']:.2f}"
+            )
+
+    # Ingredients that would round out the set (from the affinity matrix)
+    suggestions = await complete_flavor_set(session, req.ingredients)
+    ctx.flavor_set_suggestions = [
+        f"  + {' & '.join(sug['add'])} (adds {sug['score']:.2f} total affinity)"
+        for sug in suggestions
+    ]
+    ctx.affinities_text = affinities_text
+    return ctx
 
-    # Semantic search for relevant culinary knowledge
-    knowledge_text = ""
-    intent = req.intent or f"dish with {', '.join(req.ingredients[:4])}"
+
+async def prefetch_knowledge(
+    ctx: AgentContext, session: AsyncSession, llm: LLMService
+) -> AgentContext:
+    """Semantic search for relevant culinary knowledge — needs only the request."""
     try:
         async with session.begin_nested():
-            knowledge = await search_knowledge(session, llm, intent, top_k=3)
-            knowledge_text = "\n".join(
-                f"- {k['text_content'][:200]}" for k in knowledge
+            knowledge = await search_knowledge(session, llm, _intent(ctx), top_k=3)
+            ctx.knowledge_text = "\n".join(
+                f"- {k['text_content'][:_KNOWLEDGE_SNIPPET_CHARS]}" for k in knowledge
             )
     except Exception as e:
         logger.warning(f"Knowledge base search failed: {e}")
-        knowledge_text = "(No knowledge base results available)"
+        ctx.knowledge_text = "(No knowledge base results available)"
+    return ctx
+
+
+async def run_translator(
+    ctx: AgentContext, session: AsyncSession, llm: LLMService
+) -> AgentContext:
+    start = time.monotonic()
+    req = ctx.audit_request
+    constraints = ctx.constraints
+    intent = _intent(ctx)
+
+    # Prefetches normally ran earlier, concurrently with the Auditor
+    if ctx.affinities_text is None or ctx.flavor_set_suggestions is None:
+        await prefetch_affinities(ctx, session)
+    if ctx.knowledge_text is None:
+        await prefetch_knowledge(ctx, session, llm)
+    affinities_text = ctx.affinities_text
+    suggestions_text = ctx.flavor_set_suggestions
+    knowledge_text = ctx.knowledge_text
 
     # Build capabilities string
     cap_list = []
@@ -83,25 +168,31 @@ async def run_translator(
         guest_count=req.guest_count,
         intent=intent,
         affinities="\n".join(affinities_text) if affinities_text else "  (No affinity data available)",
+        flavor_set_suggestions="\n".join(suggestions_text) if suggestions_text else "  (None)",
         knowledge=knowledge_text or "  (No additional knowledge)",
     )
 
-    result = await llm.generate(
-        system_prompt=TRANSLATOR_SYSTEM,
-        user_prompt=user_prompt,
-        response_model=TranslatorOutput,
-        temperature=0.8,
-    )
+    if ctx.emit is not None:
+        result = await _generate_streaming(llm, user_prompt, ctx.emit)
+    else:
+        result = await llm.generate(
+            system_prompt=TRANSLATOR_SYSTEM,
+            user_prompt=user_prompt,
+            response_model=TranslatorOutput,
+            temperature=0.8,
+        )
 
     # Apply scaling if guest count != 4 (base serving)
     if req.guest_count != 4:
         rcf = compute_rcf(req.guest_count, base_servings=4)
+        # Scaling info: rows the Auditor resolved, plus one bulk query for the rest
+        rows = ctx.ingredient_rows
+        missing = [ing.name for ing in result.ingredients if ing.name.lower() not in rows]
+        if missing:
+            rows.update(await resolve_names(session, Ingredient, missing))
         scaled_ingredients = []
         for ing in result.ingredients:
-            # Look up scaling info from DB
-            stmt = select(Ingredient).where(func.lower(Ingredient.name) == ing.name.lower())
-            db_result = await session.execute(stmt)
-            db_ing = db_result.scalar_one_or_none()
+            db_ing = rows.get(ing.name.lower())
 
             if db_ing and db_ing.is_potent:
                 scaled = scale_ingredient(
@@ -119,6 +210,9 @@ async def run_translator(
 
             scaled_ingredients.append(ing)
         result.ingredients = scaled_ingredients
+        if ctx.emit is not None:
+            # Streamed amounts were for the base servings
+            ctx.emit("translator", {"ingredients": [i.model_dump() for i in scaled_ingredients]})
 
     ctx.dish_name = result.dish_name
     ctx.dish_description = result.dish_description
@@ -4,8 +4,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_session
-from app.schemas.common import HealthResponse, ReadinessResponse
+from app.schemas.common import HealthResponse, MetricsResponse, ReadinessResponse
+from app.services.embedding_cache import get_embedding_cache
+from app.services.llm.embedding import embedder_status
 from app.services.llm.factory import get_llm_service
+from app.services.plan_cache import plan_cache_stats
+from app.services.plan_jobs import plan_worker_stats
 
 router = APIRouter(tags=["health"])
 
@@ -34,5 +38,26 @@ async def readiness(session: AsyncSession = Depends(get_session)):
     except Exception:
         llm_status = "unavailable"
 
+    # Embedder (reported only; a cold model still loads on first use)
+    embedder = embedder_status()
+
     overall = "ok" if db_status == "ok" and llm_status == "ok" else "degraded"
-    return ReadinessResponse(status=overall, database=db_status, llm=llm_status)
+    return ReadinessResponse(
+        status=overall,
+        database=db_status,
+        llm=llm_status,
+        embedder="ok" if embedder["loaded"] else "not_loaded",
+        embedder_load_ms=embedder["load_ms"],
+    )
+
+
+@router.get("/health/metrics", response_model=MetricsResponse)
+async def metrics():
+    llm = get_llm_service(settings)
+    return MetricsResponse(
+        embedding_cache=get_embedding_cache().stats(),
+        llm_connections=llm.connection_stats() if hasattr(llm, "connection_stats") else None,
+        llm_cache=llm.cache_stats() if hasattr(llm, "cache_stats") else None,
+        plan_cache=plan_cache_stats(),
+        plan_jobs=plan_worker_stats(),
+    )
@@ -5,8 +5,21 @@ from sqlalchemy.orm import selectinload
 
 from app.core.database import get_session
 from app.models.ingredient import Ingredient
-from app.schemas.ingredient import AffinityOut, IngredientOut, IngredientSearchResult
-from app.services.flavor_graph import get_affinities_for_ingredient
+from app.schemas.ingredient import (
+    AffinityBatchRequest,
+    AffinityBatchResponse,
+    AffinityOut,
+    IngredientOut,
+    IngredientSearchResult,
+    PairingRequest,
+    PairingResponse,
+)
+from app.services.affinity_graph import get_affinity_graph
+from app.services.flavor_graph import (
+    get_affinities_for_ingredient,
+    get_affinities_for_ingredients,
+    pairing_paths,
+)
 
 router = APIRouter(prefix="/ingredients", tags=["ingredients"])
 
@@ -29,6 +42,42 @@ async def search_ingredients(
     return result.scalars().all()
 
 
+@router.post("/affinities:batch", response_model=AffinityBatchResponse)
+async def get_ingredient_affinities_batch(
+    body: AffinityBatchRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    affinities = await get_affinities_for_ingredients(
+        session, body.names, body.min_score, body.limit
+    )
+    return AffinityBatchResponse(
+        affinities=affinities,
+        not_found=[n for n in body.names if n not in affinities],
+    )
+
+
+@router.post("/pairings", response_model=PairingResponse)
+async def get_ingredient_pairings(
+    body: PairingRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    graph = await get_affinity_graph(session)
+    ids = {name: graph.id_for_name(name) for name in body.names}
+    pairings = await pairing_paths(
+        session,
+        [i for i in ids.values() if i is not None],
+        depth=body.depth,
+        min_score=body.min_score,
+        beam_width=body.beam_width,
+        combine=body.combine,
+        limit=body.limit,
+    )
+    return PairingResponse(
+        pairings=pairings,
+        not_found=[name for name, i in ids.items() if i is None],
+    )
+
+
 @router.get("/{ingredient_id}", response_model=IngredientOut)
 async def get_ingredient(
     ingredient_id: int,
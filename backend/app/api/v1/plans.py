@@ -1,32 +1,41 @@
+import asyncio
+import json
+import logging
 import uuid
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.agents.orchestrator import run_pipeline
+from app.agents.orchestrator import run_pipeline, run_pipeline_batch
 from app.core.config import settings
-from app.core.database import get_session
+from app.core.database import async_session, get_session
 from app.models.plan_history import PlanHistory
 from app.schemas.audit import AuditRequest
 from app.schemas.plan import (
     ExecutionPlan,
+    PlanBatchItemResult,
+    PlanBatchRequest,
+    PlanBatchResponse,
     PlanGenerateRequest,
     PlanGenerateResponse,
     PlanGetResponse,
+    PlanJobResponse,
 )
-from app.services.llm.factory import get_llm_service
+from app.services.llm.base import LLMService
+from app.services.llm.factory import get_llm_service, llm_backend_name
+from app.services.plan_cache import lookup_cached_plan
+from app.services.plan_jobs import enqueue_plan_job, get_plan_job
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/plans", tags=["plans"])
 
 
-@router.post("/generate", response_model=PlanGenerateResponse)
-async def generate_plan(
-    body: PlanGenerateRequest,
-    session: AsyncSession = Depends(get_session),
-):
-    llm = get_llm_service(settings)
-    audit_request = AuditRequest(
+def _audit_request(body: PlanGenerateRequest) -> AuditRequest:
+    return AuditRequest(
         ingredients=body.ingredients,
         equipment=body.equipment,
         time_limit_minutes=body.time_limit_minutes,
@@ -34,6 +43,34 @@ async def generate_plan(
         guest_count=body.guest_count,
         intent=body.intent,
     )
+
+
+async def _cached_plan(
+    session: AsyncSession, llm: LLMService, audit_request: AuditRequest, force: bool = False
+) -> tuple[str, ExecutionPlan] | None:
+    if force or not settings.plan_cache_enabled:
+        return None
+    try:
+        async with session.begin_nested():
+            return await lookup_cached_plan(session, llm, audit_request)
+    except Exception as e:
+        logger.warning(f"Plan cache lookup failed: {e}")
+        return None
+
+
+@router.post("/generate", response_model=PlanGenerateResponse)
+async def generate_plan(
+    body: PlanGenerateRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    llm = get_llm_service(settings)
+    audit_request = _audit_request(body)
+
+    cached = await _cached_plan(session, llm, audit_request, body.force)
+    if cached is not None:
+        plan_id, plan = cached
+        return PlanGenerateResponse(id=plan_id, plan=plan, cached=True)
+
     try:
         plan_id, plan = await run_pipeline(audit_request, session, llm)
     except Exception as e:
@@ -42,7 +79,129 @@ async def generate_plan(
     return PlanGenerateResponse(id=plan_id, plan=plan)
 
 
-@router.get("/{plan_id}", response_model=PlanGetResponse)
+@router.post("/generate:batch", response_model=PlanBatchResponse)
+async def generate_plan_batch(
+    body: PlanBatchRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    if len(body.items) > settings.plan_batch_max_items:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.plan_batch_max_items} plans per batch",
+        )
+    llm = get_llm_service(settings)
+    requests = [_audit_request(item) for item in body.items]
+
+    results: list[PlanBatchItemResult | None] = [None] * len(requests)
+    to_generate = []
+    for index, (item, audit_request) in enumerate(zip(body.items, requests)):
+        cached = await _cached_plan(session, llm, audit_request, item.force)
+        if cached is not None:
+            results[index] = PlanBatchItemResult(
+                index=index, id=cached[0], plan=cached[1], cached=True
+            )
+        else:
+            to_generate.append(index)
+
+    if to_generate:
+        try:
+            outcomes = await run_pipeline_batch(
+                [requests[i] for i in to_generate], session, llm
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Plan generation failed: {str(e)}")
+        for index, outcome in zip(to_generate, outcomes):
+            if isinstance(outcome, BaseException):
+                results[index] = PlanBatchItemResult(
+                    index=index, error=f"Plan generation failed: {str(outcome)}"
+                )
+            else:
+                results[index] = PlanBatchItemResult(
+                    index=index, id=outcome[0], plan=outcome[1]
+                )
+
+    return PlanBatchResponse(results=results)
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def plan_events(
+    audit_request: AuditRequest, llm: LLMService, force: bool = False
+) -> AsyncIterator[str]:
+    """SSE stream for one plan: ``accepted`` immediately, then ``stage`` per
+    pipeline stage, ``translator`` partial output, and ``plan`` or ``error``.
+
+    Runs on its own session — the request-scoped one is closed before a
+    streaming body is sent.
+    """
+    yield sse_event("accepted", {})
+
+    async with async_session() as session:
+        cached = await _cached_plan(session, llm, audit_request, force)
+        if cached is not None:
+            plan_id, plan = cached
+            yield sse_event("plan", {"id": plan_id, "plan": plan.model_dump(), "cached": True})
+            return
+
+        queue: asyncio.Queue[tuple[str, dict] | None] = asyncio.Queue()
+
+        async def pipeline():
+            try:
+                return await run_pipeline(
+                    audit_request, session, llm,
+                    emit=lambda event, data: queue.put_nowait((event, data)),
+                )
+            finally:
+                queue.put_nowait(None)
+
+        task = asyncio.create_task(pipeline())
+        try:
+            while (item := await queue.get()) is not None:
+                yield sse_event(*item)
+            plan_id, plan = await task
+        except Exception as e:
+            logger.warning(f"Streaming plan generation failed: {e}")
+            yield sse_event("error", {"detail": f"Plan generation failed: {str(e)}"})
+            return
+        finally:
+            # Client went away mid-stream
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    yield sse_event("plan", {"id": plan_id, "plan": plan.model_dump(), "cached": False})
+
+
+@router.post("/generate:stream")
+async def generate_plan_stream(body: PlanGenerateRequest):
+    llm = get_llm_service(settings)
+    return StreamingResponse(
+        plan_events(_audit_request(body), llm, body.force),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/generate:async", response_model=PlanJobResponse, status_code=202)
+async def generate_plan_async(
+    body: PlanGenerateRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """Queue the plan and return its id at once; poll ``GET /plans/{id}``."""
+    llm = get_llm_service(settings)
+    audit_request = _audit_request(body)
+
+    cached = await _cached_plan(session, llm, audit_request, body.force)
+    if cached is not None:
+        return PlanJobResponse(id=cached[0], status="done")
+
+    job = await enqueue_plan_job(session, audit_request, llm_backend_name(settings))
+    return PlanJobResponse(id=str(job.id), status=job.status)
+
+
+@router.get("/{plan_id}", response_model=PlanGetResponse | PlanJobResponse)
 async def get_plan(
     plan_id: str,
     session: AsyncSession = Depends(get_session),
@@ -57,7 +216,12 @@ async def get_plan(
     record = result.scalar_one_or_none()
 
     if not record:
-        raise HTTPException(status_code=404, detail="Plan not found")
+        job = await get_plan_job(session, uid)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Plan not found")
+        return PlanJobResponse(
+            id=plan_id, status=job.status, attempts=job.attempts, error=job.error
+        )
 
     plan = ExecutionPlan.model_validate(record.execution_plan)
     return PlanGetResponse(
@@ -13,6 +13,16 @@ class Settings(BaseSettings):
 
     # LLM
     llm_model: str = "qwen2.5"
+    # Pooled keep-alive HTTP client for Ollama
+    ollama_max_connections: int = 10
+    ollama_max_keepalive_connections: int = 5
+    ollama_keepalive_expiry: float = 60.0
+    # Exact-match generate() cache: "none", "memory", "sqlite" (llm_cache_path)
+    # or "postgres" (llm_cache table)
+    llm_cache_backend: str = "none"
+    llm_cache_max_entries: int = 1024
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_path: str = "llm_cache.sqlite3"
 
     # Server
     backend_host: str = "0.0.0.0"
@@ -22,6 +32,79 @@ class Settings(BaseSettings):
     # Embedding
     embedding_model: str = "all-MiniLM-L6-v2"
     embedding_dim: int = 384
+    # sentence-transformers backend: "torch", "onnx" or "openvino".  For a quantized
+    # int8 CPU model set embedding_model_file, e.g. "onnx/model_qint8_avx512_vnni.onnx"
+    embedding_backend: str = "torch"
+    embedding_model_file: str = ""
+    # Load the model and run a dummy encode at startup
+    embedding_warmup: bool = True
+    # Concurrent embed() calls are coalesced into one encode batch off the event loop
+    embedding_batch_size: int = 64
+    embedding_batch_wait_ms: float = 5.0
+    embedding_queue_size: int = 256
+    # Knowledge chunking: all-MiniLM-L6-v2 truncates at 256 word-pieces; the
+    # chunker's token estimate runs low on rare words, so stay well under it
+    chunk_max_tokens: int = 200
+    chunk_overlap_tokens: int = 40
+    # ANN index on culinary_embeddings: "hnsw" or "ivfflat" (build with seed.vector_index)
+    vector_index_method: str = "hnsw"
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 64
+    # Query-time recall/speed trade-off for the active index method
+    hnsw_ef_search: int = 40
+    ivfflat_probes: int = 10
+    # Knowledge search backend: "pgvector" (database ANN index) or "memory"
+    # (in-process NumPy matrix, for small corpora)
+    knowledge_backend: str = "pgvector"
+    # Optional .npy file the in-process matrix is memory-mapped from
+    vector_store_path: str = ""
+    # How often the in-process store polls culinary_embeddings for changes
+    vector_store_check_seconds: float = 30.0
+    # "vector" (embedding similarity only) or "hybrid" (full-text + vector fused
+    # with reciprocal rank fusion; always served by Postgres)
+    knowledge_search_mode: str = "vector"
+    # RRF damping constant and candidates taken from each leg before fusion
+    rrf_k: int = 60
+    hybrid_candidates: int = 20
+    embedding_cache_size: int = 2048
+    embedding_cache_ttl_seconds: int = 86400
+    # Optional .npz file the query-embedding cache is loaded from / saved to
+    embedding_cache_path: str = ""
+
+    # Plan cache: reuse plan_history rows for canonically identical requests, or for
+    # requests with the same hard constraints whose ingredients + intent embedding
+    # is at least this similar (1.0 = exact matches only)
+    plan_cache_enabled: bool = True
+    plan_cache_similarity_threshold: float = 0.97
+
+    # Async plan jobs (plan_jobs table, migration 008).  Queued jobs need workers:
+    # python -m seed.plan_worker (the plan-worker compose service), or set
+    # plan_workers to run them inside the API process (off by default so the API
+    # starts on a database without the table)
+    plan_workers: int = 0
+    plan_job_poll_seconds: float = 1.0
+    # Cap on running jobs per LLM backend ("anthropic" / "ollama"), across all workers
+    plan_job_concurrency: dict[str, int] = {"anthropic": 8, "ollama": 1}
+    # A running job not finished within this long is reclaimed by another worker
+    plan_job_timeout_seconds: int = 600
+    plan_job_max_attempts: int = 3
+    # Batch generation (POST /plans/generate:batch): items per request and
+    # pipelines run at once
+    plan_batch_max_items: int = 50
+    plan_batch_concurrency: int = 4
+
+    # Substitutions — "index" (in-memory bitsets), "precomputed" (substitute_neighbors
+    # table), "matrix" (intensity-weighted), "sql" (single grouped query) or "loop"
+    # (per-candidate queries, for benchmarking)
+    substitution_engine: str = "index"
+    # Neighbors stored per ingredient in substitute_neighbors
+    substitute_neighbors_k: int = 20
+    # Metric for the "matrix" engine: "weighted_jaccard" or "cosine"
+    substitution_metric: str = "weighted_jaccard"
+    # How often the in-process affinity graph polls flavor_affinities for changes
+    affinity_graph_check_seconds: float = 30.0
+    # How often the in-process substitution engines poll flavor_profiles for changes
+    flavor_profiles_check_seconds: float = 30.0
 
     model_config = {"env_file": ".env", "extra": "ignore"}
 
@@ -6,6 +6,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.core.config import settings
+from app.core.database import async_session
+from app.services.affinity_graph import get_affinity_graph
+from app.services.descriptor_index import get_descriptor_index
+from app.services.embedding_cache import load_embedding_cache, save_embedding_cache
+from app.services.llm.embedding import warm_up_embedder
+from app.services.llm.factory import close_llm_service, get_llm_service, llm_backend_name
+from app.services.plan_jobs import PlanWorkerPool
+from app.services.vector_store import get_vector_store
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,8 +22,40 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Chef de Cuisine API starting up...")
+    warm_ups = [("Descriptor index", get_descriptor_index), ("Affinity graph", get_affinity_graph)]
+    if settings.knowledge_backend == "memory":
+        warm_ups.append(("Vector store", get_vector_store))
+    for name, warm_up in warm_ups:
+        # Own session each, so one failure neither skips nor poisons the others
+        try:
+            async with async_session() as session:
+                await warm_up(session)
+        except Exception:
+            logger.warning("%s warm-up failed — will build on first use", name, exc_info=True)
+    try:
+        load_embedding_cache()
+    except Exception:
+        logger.warning("Could not load persisted embedding cache", exc_info=True)
+    if settings.embedding_warmup:
+        try:
+            await warm_up_embedder()
+        except Exception:
+            logger.warning("Embedding model warm-up failed — will load on first use", exc_info=True)
+    plan_workers = None
+    if settings.plan_workers > 0:
+        plan_workers = PlanWorkerPool(
+            settings.plan_workers, get_llm_service(settings), llm_backend_name(settings)
+        )
+        plan_workers.start()
     yield
     logger.info("Chef de Cuisine API shutting down...")
+    if plan_workers is not None:
+        await plan_workers.stop()
+    try:
+        save_embedding_cache()
+    except Exception:
+        logger.warning("Could not persist embedding cache", exc_info=True)
+    await close_llm_service()
 
 
 app = FastAPI(
@@ -1,8 +1,8 @@
 from typing import Any
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Computed, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.config import settings
@@ -19,3 +19,8 @@ class CulinaryEmbedding(Base):
     text_content: Mapped[str] = mapped_column(Text, nullable=False)
     embedding: Mapped[Any] = mapped_column(Vector(settings.embedding_dim), nullable=False)
     metadata_: Mapped[dict | None] = mapped_column("metadata", JSONB)
+    # sha256 of text_content — ingest dedupes on this instead of the full text
+    content_hash: Mapped[str | None] = mapped_column(String(64), index=True)
+    text_search: Mapped[Any] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('english', text_content)", persisted=True)
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Integer, String
+from sqlalchemy import Boolean, Index, Integer, String, func
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -14,3 +14,8 @@ class Equipment(Base):
     is_professional: Mapped[bool] = mapped_column(Boolean, default=False)
     capabilities: Mapped[list[str]] = mapped_column(ARRAY(String), default=list)
     home_alt: Mapped[str | None] = mapped_column(String(200))
+
+    __table_args__ = (
+        # Case-insensitive name resolution (app.services.name_resolver)
+        Index("ix_equipment_lower_name", func.lower(name)),
+    )
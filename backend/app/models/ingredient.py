@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Float, Index, Integer, String
+from sqlalchemy import Boolean, Float, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -22,4 +22,6 @@ class Ingredient(Base):
     __table_args__ = (
         Index("ix_ingredients_name_trgm", "name", postgresql_using="gin",
               postgresql_ops={"name": "gin_trgm_ops"}),
+        # Case-insensitive name resolution (app.services.name_resolver)
+        Index("ix_ingredients_lower_name", func.lower(name)),
     )
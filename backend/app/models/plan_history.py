@@ -1,11 +1,14 @@
 import uuid
 from datetime import datetime
+from typing import Any
 
+from pgvector.sqlalchemy import Vector
 from sqlalchemy import DateTime, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
+from app.core.config import settings
 from app.models.base import Base
 
 
@@ -24,3 +27,8 @@ class PlanHistory(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # Plan cache keys (app.services.plan_cache): exact canonical-request hash,
+    # hash of the hard constraints, and an embedding of ingredients + intent
+    request_hash: Mapped[str | None] = mapped_column(String(64), index=True)
+    constraint_hash: Mapped[str | None] = mapped_column(String(64), index=True)
+    request_embedding: Mapped[Any | None] = mapped_column(Vector(settings.embedding_dim))
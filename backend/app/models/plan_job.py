@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class PlanJob(Base):
+    """Queued plan generation; ``id`` becomes the plan_history id when it finishes."""
+
+    __tablename__ = "plan_jobs"
+    __table_args__ = (
+        Index("ix_plan_jobs_claim", "llm_backend", "status", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    # pending → running → done | failed
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
+    audit_request: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # Workers only claim jobs for the backend they run (per-backend concurrency)
+    llm_backend: Mapped[str] = mapped_column(String(32), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text)
+    worker_id: Mapped[str | None] = mapped_column(String(100))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
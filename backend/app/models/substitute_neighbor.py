@@ -0,0 +1,19 @@
+from sqlalchemy import Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class SubstituteNeighbor(Base):
+    """Precomputed top-K Jaccard substitutes for an ingredient, one row per rank."""
+
+    __tablename__ = "substitute_neighbors"
+
+    ingredient_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ingredients.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    neighbor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("ingredients.id", ondelete="CASCADE"), nullable=False
+    )
+    jaccard_score: Mapped[float] = mapped_column(Float, nullable=False)
@@ -8,6 +8,7 @@ Key principles:
 - Honor time constraints absolutely
 - If a professional technique is needed but equipment is missing, suggest the best achievable alternative
 - Flavor combinations should be well-established (use the affinity data provided)
+- Suggested additions are optional; include one only if it is likely on hand or easy to get
 
 IMPORTANT — Adapt detail to the cook's skill level:
 - **Home Cook**: Explain every technique in plain language. Never assume the cook knows
@@ -30,6 +31,9 @@ TRANSLATOR_USER = """Create an execution plan for this scenario:
 **Flavor Affinities (top pairings from database):**
 {affinities}
 
+**Suggested Additions (ingredients that add the most pairwise affinity to this set):**
+{flavor_set_suggestions}
+
 **Relevant Culinary Knowledge:**
 {knowledge}
 
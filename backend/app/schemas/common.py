@@ -10,3 +10,13 @@ class ReadinessResponse(BaseModel):
     status: str
     database: str
     llm: str
+    embedder: str = "not_loaded"
+    embedder_load_ms: int | None = None
+
+
+class MetricsResponse(BaseModel):
+    embedding_cache: dict
+    llm_connections: dict | None = None
+    llm_cache: dict | None = None
+    plan_cache: dict | None = None
+    plan_jobs: dict | None = None
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class FlavorProfileOut(BaseModel):
@@ -31,3 +33,35 @@ class AffinityOut(BaseModel):
     ingredient_name: str
     affinity_score: float
     source: str | None = None
+
+
+class AffinityBatchRequest(BaseModel):
+    names: list[str] = Field(max_length=50)
+    min_score: float = Field(default=0.0, ge=0, le=1)
+    limit: int = Field(default=20, ge=1, le=50)
+
+
+class AffinityBatchResponse(BaseModel):
+    affinities: dict[str, list[AffinityOut]]
+    not_found: list[str] = []
+
+
+class PairingRequest(BaseModel):
+    names: list[str] = Field(min_length=1, max_length=20)
+    depth: int = Field(default=2, ge=1, le=3)
+    min_score: float = Field(default=0.5, ge=0, le=1)
+    beam_width: int = Field(default=20, ge=1, le=100)
+    combine: Literal["product", "min"] = "product"
+    limit: int = Field(default=10, ge=1, le=50)
+
+
+class PairingOut(BaseModel):
+    ingredient_id: int
+    ingredient_name: str
+    score: float
+    paths: dict[str, list[str]]
+
+
+class PairingResponse(BaseModel):
+    pairings: list[PairingOut]
+    not_found: list[str] = []
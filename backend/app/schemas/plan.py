@@ -46,6 +46,8 @@ class ExecutionPlan(BaseModel):
 class PlanGenerateResponse(BaseModel):
     id: str
     plan: ExecutionPlan
+    # True when an existing plan was reused by the plan cache
+    cached: bool = False
 
 
 class PlanGetResponse(BaseModel):
@@ -53,10 +55,21 @@ class PlanGetResponse(BaseModel):
     plan: ExecutionPlan
     model_used: str
     latency_ms: int
+    status: str = "done"
 
     model_config = {"from_attributes": True}
 
 
+class PlanJobResponse(BaseModel):
+    """A queued plan that has no plan_history row yet (or failed)."""
+
+    id: str
+    # pending | running | failed (done plans are returned as PlanGetResponse)
+    status: str
+    attempts: int = 0
+    error: str | None = None
+
+
 class PlanGenerateRequest(BaseModel):
     ingredients: list[str] = Field(default_factory=list)
     equipment: list[str] = Field(default_factory=list)
@@ -64,3 +77,20 @@ class PlanGenerateRequest(BaseModel):
     user_skill: str = Field(default="Ambitious Amateur")
     guest_count: int = Field(default=2, ge=1, le=20)
     intent: str | None = None
+    force: bool = Field(default=False, description="Skip the plan cache and always generate")
+
+
+class PlanBatchRequest(BaseModel):
+    items: list[PlanGenerateRequest] = Field(min_length=1)
+
+
+class PlanBatchItemResult(BaseModel):
+    index: int
+    id: str | None = None
+    plan: ExecutionPlan | None = None
+    cached: bool = False
+    error: str | None = None
+
+
+class PlanBatchResponse(BaseModel):
+    results: list[PlanBatchItemResult]
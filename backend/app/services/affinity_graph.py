@@ -0,0 +1,296 @@
+"""In-process adjacency cache over ``flavor_affinities``.
+
+Affinity pairs are stored once in canonical (a < b) order, which forces the
+SQL lookup into an ``OR`` of both directions.  This cache loads the table
+once into a symmetric adjacency list with each ingredient's neighbors
+pre-sorted by ``affinity_score``, so a min_score/limit query is a bisect and
+a slice.
+
+The seed runner writes affinities from another process, so staleness is
+detected by polling a cheap aggregate over ``flavor_affinities`` and
+``ingredients`` at most every ``affinity_graph_check_seconds``; in-process
+writers call ``bump_affinity_version()`` to force the check on next use.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.flavor_affinity import FlavorAffinity
+from app.models.ingredient import Ingredient
+
+logger = logging.getLogger(__name__)
+
+_NO_PATH: tuple[float, tuple[int, ...]] = (0.0, ())
+
+
+class AffinityGraph:
+    """Symmetric adjacency list: ingredient id -> neighbors sorted by score desc."""
+
+    def __init__(
+        self,
+        names: dict[int, str],
+        edges: list[tuple[int, int, float, str | None]],
+        version: tuple = (),
+    ):
+        """Build the graph.
+
+        names: ingredient_id -> name
+        edges: (ingredient_a_id, ingredient_b_id, affinity_score, source)
+        """
+        self.version = version
+        self.names = names
+        self._ids_by_name = {name.lower(): ing_id for ing_id, name in names.items()}
+
+        adjacency: dict[int, list[tuple[float, int, str | None]]] = {}
+        for a, b, score, source in edges:
+            adjacency.setdefault(a, []).append((score, b, source))
+            adjacency.setdefault(b, []).append((score, a, source))
+
+        self._neighbors: dict[int, list[tuple[float, int, str | None]]] = {}
+        self._neg_scores: dict[int, list[float]] = {}
+        for ing_id, neighbors in adjacency.items():
+            neighbors.sort(key=lambda n: (-n[0], n[1]))
+            self._neighbors[ing_id] = neighbors
+            self._neg_scores[ing_id] = [-n[0] for n in neighbors]
+
+        # Dense symmetric affinity matrix for set-level scoring
+        self._matrix_ids = np.array(sorted(names), dtype=np.int64)
+        self._matrix_row = {int(ing_id): i for i, ing_id in enumerate(self._matrix_ids)}
+        self._matrix = np.zeros((len(self._matrix_ids),) * 2, dtype=np.float32)
+        for a, b, score, _ in edges:
+            i, j = self._matrix_row.get(a), self._matrix_row.get(b)
+            if i is not None and j is not None:
+                self._matrix[i, j] = self._matrix[j, i] = score
+
+    def __len__(self) -> int:
+        return len(self._neighbors)
+
+    def id_for_name(self, name: str) -> int | None:
+        return self._ids_by_name.get(name.lower())
+
+    def neighbors(
+        self, ingredient_id: int, min_score: float = 0.0, limit: int | None = None
+    ) -> list[tuple[float, int, str | None]]:
+        """(score, neighbor_id, source) tuples with score >= min_score, best first."""
+        neg_scores = self._neg_scores.get(ingredient_id)
+        if not neg_scores:
+            return []
+        end = bisect.bisect_right(neg_scores, -min_score)
+        if limit is not None:
+            end = min(end, limit)
+        return self._neighbors[ingredient_id][:end]
+
+    def affinities(
+        self, ingredient_id: int, min_score: float = 0.0, limit: int = 20
+    ) -> list[dict]:
+        """Same shape as ``flavor_graph.get_affinities_for_ingredient``."""
+        return [
+            {"ingredient_name": self.names[n_id], "affinity_score": score, "source": source}
+            for score, n_id, source in self.neighbors(ingredient_id, min_score, limit)
+        ]
+
+    def _reachable(
+        self, start_id: int, depth: int, min_score: float, beam_width: int, combine: str
+    ) -> dict[int, tuple[float, tuple[int, ...]]]:
+        """Best path score and path from ``start_id`` to every node within ``depth`` hops.
+
+        Each hop expands at most ``beam_width`` neighbors per frontier node and
+        keeps only the ``beam_width`` best new nodes as the next frontier.
+        """
+        best: dict[int, tuple[float, tuple[int, ...]]] = {start_id: (1.0, (start_id,))}
+        frontier = [start_id]
+        for _ in range(depth):
+            candidates: dict[int, tuple[float, tuple[int, ...]]] = {}
+            for node in frontier:
+                node_score, node_path = best[node]
+                for edge, neighbor, _ in self.neighbors(node, min_score, beam_width):
+                    if neighbor in node_path:
+                        continue
+                    score = node_score * edge if combine == "product" else min(node_score, edge)
+                    if score <= best.get(neighbor, _NO_PATH)[0]:
+                        continue
+                    if score <= candidates.get(neighbor, _NO_PATH)[0]:
+                        continue
+                    candidates[neighbor] = (score, node_path + (neighbor,))
+            if not candidates:
+                break
+            frontier = sorted(candidates, key=lambda n: -candidates[n][0])[:beam_width]
+            for node in frontier:
+                best[node] = candidates[node]
+        return best
+
+    def pairing_paths(
+        self,
+        start_ids: list[int],
+        depth: int = 2,
+        min_score: float = 0.0,
+        beam_width: int = 20,
+        combine: str = "product",
+        limit: int = 10,
+    ) -> list[dict]:
+        """Rank ingredients that pair well with *all* of ``start_ids``.
+
+        For each start ingredient a beam-limited traversal finds the best path
+        (up to ``depth`` hops) to every reachable ingredient, scoring a path by
+        the product or the min of its edge weights.  A candidate must be
+        reachable from every start; its overall score combines the per-start
+        path scores the same way.
+        """
+        if combine not in ("product", "min"):
+            raise ValueError(f"Unknown combine mode: {combine}")
+        starts = [s for s in dict.fromkeys(start_ids) if s in self.names]
+        if not starts:
+            return []
+
+        reach = [self._reachable(s, depth, min_score, beam_width, combine) for s in starts]
+        common = set(reach[0]).intersection(*reach[1:]).difference(starts)
+
+        ranked = []
+        for candidate in common:
+            path_scores = [r[candidate][0] for r in reach]
+            if combine == "product":
+                score = 1.0
+                for ps in path_scores:
+                    score *= ps
+            else:
+                score = min(path_scores)
+            ranked.append((score, candidate))
+        ranked.sort(key=lambda x: (-x[0], x[1]))
+
+        return [
+            {
+                "ingredient_id": candidate,
+                "ingredient_name": self.names[candidate],
+                "score": round(score, 4),
+                "paths": {
+                    self.names[s]: [self.names[n] for n in r[candidate][1]]
+                    for s, r in zip(starts, reach)
+                },
+            }
+            for score, candidate in ranked[:limit]
+        ]
+
+    def complete_flavor_set(
+        self,
+        ingredient_ids: list[int],
+        top_n: int = 3,
+        pool_size: int = 30,
+    ) -> list[dict]:
+        """Best one- and two-ingredient additions to an ingredient set.
+
+        An addition's score is the total affinity it adds: the sum of its
+        affinities with every current ingredient, plus (for a pair) the
+        affinity between the two additions.  Singles are ranked with one
+        row-sum over the affinity matrix; pairs are searched among the
+        ``pool_size`` best singles with one broadcast add.
+
+        Returns up to ``top_n`` singles followed by up to ``top_n`` pairs.
+        """
+        rows = [self._matrix_row[i] for i in dict.fromkeys(ingredient_ids) if i in self._matrix_row]
+        if not rows:
+            return []
+
+        gain = self._matrix[rows].sum(axis=0)
+        gain[rows] = 0.0
+        pool = np.flatnonzero(gain > 0)
+        if len(pool) == 0:
+            return []
+        if len(pool) > pool_size:
+            pool = pool[np.argpartition(-gain[pool], pool_size)[:pool_size]]
+        pool = pool[np.argsort(-gain[pool], kind="stable")]
+
+        suggestions = [
+            {"add": [self.names[int(self._matrix_ids[i])]], "score": round(float(gain[i]), 3)}
+            for i in pool[:top_n]
+        ]
+
+        if len(pool) >= 2:
+            pair_gain = gain[pool][:, None] + gain[pool][None, :] + self._matrix[np.ix_(pool, pool)]
+            upper_i, upper_j = np.triu_indices(len(pool), k=1)
+            flat = pair_gain[upper_i, upper_j]
+            for k in np.argsort(-flat, kind="stable")[:top_n]:
+                i, j = pool[upper_i[k]], pool[upper_j[k]]
+                suggestions.append({
+                    "add": [
+                        self.names[int(self._matrix_ids[i])],
+                        self.names[int(self._matrix_ids[j])],
+                    ],
+                    "score": round(float(flat[k]), 3),
+                })
+        return suggestions
+
+
+async def _table_version(session: AsyncSession) -> tuple:
+    """Changes whenever an affinity or ingredient row is added, removed or rescored."""
+    result = await session.execute(
+        select(
+            func.count(),
+            func.coalesce(func.max(FlavorAffinity.id), 0),
+            func.coalesce(func.sum(FlavorAffinity.affinity_score), 0.0),
+        )
+    )
+    pairs, max_pair_id, score_sum = result.one()
+    result = await session.execute(
+        select(func.count(), func.coalesce(func.max(Ingredient.id), 0))
+    )
+    nodes, max_node_id = result.one()
+    return (
+        int(pairs), int(max_pair_id), round(float(score_sum), 6), int(nodes), int(max_node_id)
+    )
+
+
+async def build_affinity_graph(session: AsyncSession) -> AffinityGraph:
+    version = await _table_version(session)
+    result = await session.execute(select(Ingredient.id, Ingredient.name))
+    names = {row.id: row.name for row in result.all()}
+
+    result = await session.execute(
+        select(
+            FlavorAffinity.ingredient_a_id,
+            FlavorAffinity.ingredient_b_id,
+            FlavorAffinity.affinity_score,
+            FlavorAffinity.source,
+        )
+    )
+    edges = [tuple(row) for row in result.all()]
+
+    graph = AffinityGraph(names, edges, version)
+    logger.info("Built affinity graph: %d nodes, %d edges", len(graph), len(edges))
+    return graph
+
+
+_graph: AffinityGraph | None = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+
+
+async def get_affinity_graph(session: AsyncSession) -> AffinityGraph:
+    """Return the process-wide affinity graph, reloading it if the tables changed."""
+    global _graph, _checked_at
+    interval = settings.affinity_graph_check_seconds
+    if _graph is not None and time.monotonic() - _checked_at < interval:
+        return _graph
+    # One build at a time; callers that waited reuse the graph just built
+    async with _lock:
+        now = time.monotonic()
+        if _graph is None:
+            _graph = await build_affinity_graph(session)
+            _checked_at = now
+        elif now - _checked_at >= interval:
+            _checked_at = now
+            if await _table_version(session) != _graph.version:
+                _graph = await build_affinity_graph(session)
+    return _graph
+
+
+def bump_affinity_version() -> None:
+    """Re-check the tables on next use (after in-process writes to affinities/ingredients)."""
+    global _checked_at
+    _checked_at = float("-inf")
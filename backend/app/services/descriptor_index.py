@@ -0,0 +1,205 @@
+"""In-memory flavor descriptor index for Jaccard substitute scoring.
+
+Each ingredient's descriptor set is packed into a bitset over a shared
+descriptor vocabulary.  Jaccard similarity against a whole candidate set is
+then one vectorized popcount pass — no per-candidate SQL.
+
+The index is process-wide: built from ``flavor_profiles`` (warmed in the
+application lifespan) and rebuilt after ``invalidate_descriptor_index()``.  The
+seed runner writes profiles from another process, so ``get_descriptor_index``
+also polls ``flavor_profiles_version`` at most every
+``flavor_profiles_check_seconds`` and rebuilds when it moved.
+"""
+
+import asyncio
+import logging
+import time
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.flavor_profile import FlavorProfile
+from app.models.ingredient import Ingredient
+
+logger = logging.getLogger(__name__)
+
+_WORD_BITS = 64
+
+
+class DescriptorIndex:
+    """Packed descriptor bitsets for every ingredient, keyed by ingredient id."""
+
+    def __init__(
+        self,
+        ingredients: dict[int, tuple[str, str]],
+        descriptors: dict[int, set[str]],
+        version: tuple = (),
+    ):
+        """Build the index.
+
+        ingredients: ingredient_id -> (name, category)
+        descriptors: ingredient_id -> set of flavor descriptors
+        """
+        self.version = version
+        self.vocabulary: list[str] = sorted({d for ds in descriptors.values() for d in ds})
+        column = {d: i for i, d in enumerate(self.vocabulary)}
+        n_words = max(1, -(-len(self.vocabulary) // _WORD_BITS))
+
+        self._ids = np.array(sorted(ingredients), dtype=np.int64)
+        self._row = {int(ing_id): row for row, ing_id in enumerate(self._ids)}
+        self._names = [ingredients[int(i)][0] for i in self._ids]
+        self._categories = np.array([ingredients[int(i)][1] for i in self._ids], dtype=object)
+
+        self._bits = np.zeros((len(self._ids), n_words), dtype=np.uint64)
+        for ing_id, ds in descriptors.items():
+            row = self._row.get(ing_id)
+            if row is None:
+                continue
+            for d in ds:
+                col = column[d]
+                self._bits[row, col // _WORD_BITS] |= np.uint64(1 << (col % _WORD_BITS))
+        self._counts = np.bitwise_count(self._bits).sum(axis=1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, ingredient_id: int) -> bool:
+        return ingredient_id in self._row
+
+    def jaccard_scores(self, ingredient_id: int, rows: np.ndarray) -> np.ndarray:
+        """Jaccard similarity of ``ingredient_id`` against the given index rows."""
+        target = self._row[ingredient_id]
+        inter = np.bitwise_count(self._bits[rows] & self._bits[target]).sum(
+            axis=1, dtype=np.int64
+        )
+        union = self._counts[rows] + self._counts[target] - inter
+        return np.divide(
+            inter, union, out=np.zeros(len(rows), dtype=np.float64), where=union > 0
+        )
+
+    def find_substitutes(
+        self,
+        ingredient_id: int,
+        candidate_ids: list[int] | None = None,
+        top_k: int = 5,
+    ) -> list[dict]:
+        """Same contract as ``flavor_graph.find_substitutes``, served from memory."""
+        target = self._row.get(ingredient_id)
+        if target is None:
+            return []
+
+        if candidate_ids:
+            rows = np.array(
+                sorted({self._row[c] for c in candidate_ids if c in self._row}), dtype=np.int64
+            )
+        else:
+            rows = np.flatnonzero(self._categories == self._categories[target])
+            rows = rows[rows != target]
+
+        if len(rows) == 0:
+            return []
+
+        scores = np.round(self.jaccard_scores(ingredient_id, rows), 3)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [
+            {
+                "ingredient_id": int(self._ids[rows[i]]),
+                "ingredient_name": self._names[rows[i]],
+                "jaccard_score": float(scores[i]),
+            }
+            for i in order
+        ]
+
+
+async def flavor_profiles_version(session: AsyncSession) -> tuple:
+    """Changes whenever an ingredient or flavor profile row is added, removed or edited.
+
+    Counts, max ids and a sum of per-row ``hashtext`` values — one scan of each
+    table, no sort.
+    """
+    result = await session.execute(
+        select(
+            func.count(),
+            func.coalesce(func.max(FlavorProfile.id), 0),
+            func.coalesce(func.sum(func.hashtext(
+                func.concat_ws(
+                    ":", FlavorProfile.ingredient_id, FlavorProfile.descriptor,
+                    FlavorProfile.intensity,
+                )
+            )), 0),
+        )
+    )
+    profiles = tuple(int(v) for v in result.one())
+    result = await session.execute(
+        select(
+            func.count(),
+            func.coalesce(func.max(Ingredient.id), 0),
+            func.coalesce(func.sum(func.hashtext(
+                func.concat_ws(":", Ingredient.id, Ingredient.name, Ingredient.category)
+            )), 0),
+        )
+    )
+    return profiles + tuple(int(v) for v in result.one())
+
+
+async def build_descriptor_index(
+    session: AsyncSession, ingredient_ids: list[int] | None = None
+) -> DescriptorIndex:
+    """Load ingredients and flavor descriptors and pack them into an index.
+
+    ``ingredient_ids`` limits the index to those ingredients (default: all);
+    only a full index records the table version.
+    """
+    version = await flavor_profiles_version(session) if ingredient_ids is None else ()
+    ing_stmt = select(Ingredient.id, Ingredient.name, Ingredient.category)
+    fp_stmt = select(FlavorProfile.ingredient_id, FlavorProfile.descriptor)
+    if ingredient_ids is not None:
+        ing_stmt = ing_stmt.where(Ingredient.id.in_(ingredient_ids))
+        fp_stmt = fp_stmt.where(FlavorProfile.ingredient_id.in_(ingredient_ids))
+
+    result = await session.execute(ing_stmt)
+    ingredients = {row.id: (row.name, row.category) for row in result.all()}
+
+    result = await session.execute(fp_stmt)
+    descriptors: dict[int, set[str]] = {}
+    for row in result.all():
+        descriptors.setdefault(row.ingredient_id, set()).add(row.descriptor)
+
+    index = DescriptorIndex(ingredients, descriptors, version)
+    logger.info(
+        "Built descriptor index: %d ingredients, %d descriptors",
+        len(index), len(index.vocabulary),
+    )
+    return index
+
+
+_index: DescriptorIndex | None = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+
+
+async def get_descriptor_index(session: AsyncSession) -> DescriptorIndex:
+    """Return the process-wide descriptor index, rebuilding it if the tables changed."""
+    global _index, _checked_at
+    interval = settings.flavor_profiles_check_seconds
+    if _index is not None and time.monotonic() - _checked_at < interval:
+        return _index
+    # One build at a time; callers that waited reuse the index just built
+    async with _lock:
+        now = time.monotonic()
+        if _index is None:
+            _index = await build_descriptor_index(session)
+            _checked_at = now
+        elif now - _checked_at >= interval:
+            _checked_at = now
+            if await flavor_profiles_version(session) != _index.version:
+                _index = await build_descriptor_index(session)
+    return _index
+
+
+def invalidate_descriptor_index() -> None:
+    """Drop the cached index so the next lookup rebuilds it from the database."""
+    global _index
+    _index = None
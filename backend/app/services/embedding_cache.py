@@ -0,0 +1,148 @@
+"""LRU + TTL cache for query embeddings.
+
+Knowledge-base queries (``req.intent`` or an ingredients-derived string)
+repeat constantly across users, so their embeddings are cached keyed on the
+embedding model name and the whitespace/case-normalized query text.  Vectors
+are stored as float32.  The cache can be persisted to a local ``.npz`` file
+so a warm restart skips sentence-transformers inference entirely.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.llm.base import LLMService
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class EmbeddingCache:
+    """In-memory LRU of (model, normalized text) -> float32 vector with a TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 86400,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[float, np.ndarray]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, model: str, text: str) -> np.ndarray | None:
+        key = (model, normalize_query(text))
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() - entry[0] > self.ttl_seconds:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, model: str, text: str, vector) -> None:
+        key = (model, normalize_query(text))
+        self._entries[key] = (self._clock(), np.asarray(vector, dtype=np.float32))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def save(self, path: Path) -> None:
+        """Write live entries to an ``.npz`` file (oldest first, preserving LRU order)."""
+        if not self._entries:
+            return
+        keys = list(self._entries)
+        stored_at = [self._entries[k][0] for k in keys]
+        try:
+            vectors = np.stack([self._entries[k][1] for k in keys])
+        except ValueError:
+            logger.warning("Embedding cache holds mixed dimensions — not persisting")
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                models=np.array([k[0] for k in keys]),
+                texts=np.array([k[1] for k in keys]),
+                stored_at=np.array(stored_at, dtype=np.float64),
+                vectors=vectors,
+            )
+        logger.info("Saved %d cached embeddings to %s", len(keys), path)
+
+    def load(self, path: Path) -> int:
+        """Load entries from ``save()`` output, skipping expired ones. Returns count loaded."""
+        if not path.is_file():
+            return 0
+        now = self._clock()
+        with np.load(path, allow_pickle=False) as data:
+            rows = zip(data["models"], data["texts"], data["stored_at"], data["vectors"])
+            for model, text, stored_at, vector in rows:
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries[(str(model), str(text))] = (float(stored_at), vector)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        logger.info("Loaded %d cached embeddings from %s", len(self._entries), path)
+        return len(self._entries)
+
+
+_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache(
+            max_entries=settings.embedding_cache_size,
+            ttl_seconds=settings.embedding_cache_ttl_seconds,
+        )
+    return _cache
+
+
+async def embed_query(llm_service: LLMService, query: str) -> list[float]:
+    """Embed a single query, served from the cache when possible."""
+    cache = get_embedding_cache()
+    model = settings.embedding_model
+    vector = cache.get(model, query)
+    if vector is None:
+        vector = (await llm_service.embed([query]))[0]
+        cache.put(model, query, vector)
+    return np.asarray(vector, dtype=np.float32).tolist()
+
+
+def load_embedding_cache() -> None:
+    if settings.embedding_cache_path:
+        get_embedding_cache().load(Path(settings.embedding_cache_path))
+
+
+def save_embedding_cache() -> None:
+    if settings.embedding_cache_path:
+        get_embedding_cache().save(Path(settings.embedding_cache_path))
@@ -1,14 +1,19 @@
 """Flavor affinity queries and Jaccard similarity for substitutions.
 
-Replaces Neo4j graph with SQL queries against PostgreSQL.
+Replaces Neo4j graph with SQL queries against PostgreSQL, backed by
+in-process caches (affinity adjacency list, descriptor index) for hot paths.
 """
 
-from sqlalchemy import or_, select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.flavor_affinity import FlavorAffinity
+from app.core.config import settings
 from app.models.flavor_profile import FlavorProfile
 from app.models.ingredient import Ingredient
+from app.services.affinity_graph import get_affinity_graph
+from app.services.descriptor_index import get_descriptor_index, invalidate_descriptor_index
+from app.services.flavor_matrix import get_flavor_matrix, refresh_flavor_matrix
+from app.services.substitute_neighbors import lookup_substitutes, refresh_substitute_neighbors
 
 
 async def get_affinities_for_ingredient(
@@ -17,38 +22,66 @@ async def get_affinities_for_ingredient(
     min_score: float = 0.0,
     limit: int = 20,
 ) -> list[dict]:
-    """Get top flavor affinities for an ingredient, sorted by score."""
-    # Query both directions of the pair
-    stmt = (
-        select(
-            FlavorAffinity.affinity_score,
-            FlavorAffinity.source,
-            Ingredient.name,
-        )
-        .join(
-            Ingredient,
-            or_(
-                (FlavorAffinity.ingredient_a_id == ingredient_id)
-                & (Ingredient.id == FlavorAffinity.ingredient_b_id),
-                (FlavorAffinity.ingredient_b_id == ingredient_id)
-                & (Ingredient.id == FlavorAffinity.ingredient_a_id),
-            ),
-        )
-        .where(
-            or_(
-                FlavorAffinity.ingredient_a_id == ingredient_id,
-                FlavorAffinity.ingredient_b_id == ingredient_id,
-            )
-        )
-        .where(FlavorAffinity.affinity_score >= min_score)
-        .order_by(FlavorAffinity.affinity_score.desc())
-        .limit(limit)
-    )
-    result = await session.execute(stmt)
-    return [
-        {"ingredient_name": row.name, "affinity_score": row.affinity_score, "source": row.source}
-        for row in result.all()
-    ]
+    """Get top flavor affinities for an ingredient, sorted by score.
+
+    Served from the in-process adjacency cache, which holds both directions
+    of every pair.
+    """
+    graph = await get_affinity_graph(session)
+    return graph.affinities(ingredient_id, min_score, limit)
+
+
+async def get_affinities_for_ingredients(
+    session: AsyncSession,
+    names: list[str],
+    min_score: float = 0.0,
+    limit: int = 20,
+) -> dict[str, list[dict]]:
+    """Resolve several ingredient names and fetch each one's top affinities.
+
+    Returns {requested name: affinities} for every name that matched an
+    ingredient (case-insensitive); unknown names are omitted.  Name
+    resolution and neighbor lookup both come from the adjacency cache, so the
+    whole batch costs at most the one cache load.
+    """
+    graph = await get_affinity_graph(session)
+    results: dict[str, list[dict]] = {}
+    for name in names:
+        ingredient_id = graph.id_for_name(name)
+        if ingredient_id is not None:
+            results[name] = graph.affinities(ingredient_id, min_score, limit)
+    return results
+
+
+async def pairing_paths(
+    session: AsyncSession,
+    start_ids: list[int],
+    depth: int = 2,
+    min_score: float = 0.0,
+    beam_width: int = 20,
+    combine: str = "product",
+    limit: int = 10,
+) -> list[dict]:
+    """Ingredients that pair well with all of ``start_ids``, via multi-hop paths.
+
+    See ``AffinityGraph.pairing_paths``; runs entirely in-process.
+    """
+    graph = await get_affinity_graph(session)
+    return graph.pairing_paths(start_ids, depth, min_score, beam_width, combine, limit)
+
+
+async def complete_flavor_set(
+    session: AsyncSession,
+    names: list[str],
+    top_n: int = 3,
+) -> list[dict]:
+    """Best one- and two-ingredient additions to a set of ingredient names.
+
+    See ``AffinityGraph.complete_flavor_set``; unknown names are ignored.
+    """
+    graph = await get_affinity_graph(session)
+    ids = [i for i in (graph.id_for_name(n) for n in names) if i is not None]
+    return graph.complete_flavor_set(ids, top_n=top_n)
 
 
 async def get_flavor_descriptors(
@@ -79,18 +112,76 @@ async def jaccard_similarity(
     return len(intersection) / len(union) if union else 0.0
 
 
-async def find_substitutes(
+_SUBSTITUTES_SQL = """
+    WITH target AS (
+        SELECT descriptor FROM flavor_profiles WHERE ingredient_id = :ingredient_id
+    ),
+    candidates AS (
+        SELECT i.id, i.name
+        FROM ingredients i
+        WHERE EXISTS (SELECT 1 FROM ingredients WHERE id = :ingredient_id)
+          AND {candidate_filter}
+    ),
+    overlap AS (
+        SELECT c.id, c.name,
+               COUNT(fp.descriptor) AS n_candidate,
+               COUNT(t.descriptor) AS n_shared
+        FROM candidates c
+        LEFT JOIN flavor_profiles fp ON fp.ingredient_id = c.id
+        LEFT JOIN target t ON t.descriptor = fp.descriptor
+        GROUP BY c.id, c.name
+    )
+    SELECT o.id, o.name,
+           CASE WHEN o.n_candidate + n.n_target - o.n_shared = 0 THEN 0.0
+                ELSE o.n_shared::float / (o.n_candidate + n.n_target - o.n_shared)
+           END AS score
+    FROM overlap o
+    CROSS JOIN (SELECT COUNT(*) AS n_target FROM target) n
+    ORDER BY score DESC, o.id
+    LIMIT :top_k
+"""
+
+
+async def find_substitutes_sql(
     session: AsyncSession,
     ingredient_id: int,
     candidate_ids: list[int] | None = None,
     top_k: int = 5,
 ) -> list[dict]:
-    """Find best substitutes for an ingredient using Jaccard similarity.
+    """Rank substitutes with one grouped query over flavor_profiles.
 
-    If candidate_ids is provided, only consider those ingredients.
-    Otherwise, considers all ingredients in the same category.
+    Intersection and union counts for every candidate are computed in the
+    database, so this is a single round trip regardless of category size.
     """
-    # Get the target ingredient
+    params: dict = {"ingredient_id": ingredient_id, "top_k": top_k}
+    if candidate_ids:
+        candidate_filter = "i.id = ANY(:candidate_ids)"
+        params["candidate_ids"] = list(candidate_ids)
+    else:
+        candidate_filter = (
+            "i.category = (SELECT category FROM ingredients WHERE id = :ingredient_id)"
+            " AND i.id <> :ingredient_id"
+        )
+
+    sql = text(_SUBSTITUTES_SQL.format(candidate_filter=candidate_filter))
+    result = await session.execute(sql, params)
+    return [
+        {
+            "ingredient_id": row.id,
+            "ingredient_name": row.name,
+            "jaccard_score": round(float(row.score), 3),
+        }
+        for row in result.all()
+    ]
+
+
+async def _find_substitutes_loop(
+    session: AsyncSession,
+    ingredient_id: int,
+    candidate_ids: list[int] | None = None,
+    top_k: int = 5,
+) -> list[dict]:
+    """Reference N+1 implementation: one jaccard_similarity call per candidate."""
     target = await session.get(Ingredient, ingredient_id)
     if not target:
         return []
@@ -117,3 +208,62 @@ async def find_substitutes(
 
     scores.sort(key=lambda x: x["jaccard_score"], reverse=True)
     return scores[:top_k]
+
+
+SUBSTITUTION_ENGINES = ("index", "precomputed", "matrix", "sql", "loop")
+
+
+async def find_substitutes(
+    session: AsyncSession,
+    ingredient_id: int,
+    candidate_ids: list[int] | None = None,
+    top_k: int = 5,
+    engine: str | None = None,
+) -> list[dict]:
+    """Find best substitutes for an ingredient using Jaccard similarity.
+
+    If candidate_ids is provided, only consider those ingredients.
+    Otherwise, considers all ingredients in the same category.
+
+    The scoring engine defaults to ``settings.substitution_engine``:
+    "index" (in-memory descriptor bitsets), "precomputed" (the
+    substitute_neighbors table), "matrix" (intensity-weighted, scored with
+    ``settings.substitution_metric``), "sql" (one grouped query) or "loop"
+    (the original per-candidate queries, kept for benchmarking).
+    """
+    engine = engine or settings.substitution_engine
+    if engine == "precomputed":
+        # The table only holds same-category neighbors; explicit candidate
+        # lists and deeper requests are answered by the live index instead,
+        # as are ingredients with no rows yet (empty or not-yet-refreshed table).
+        if not candidate_ids and top_k <= settings.substitute_neighbors_k:
+            results = await lookup_substitutes(session, ingredient_id, top_k)
+            if results:
+                return results
+        engine = "index"
+    if engine == "matrix":
+        matrix = await get_flavor_matrix(session)
+        return matrix.find_substitutes(
+            ingredient_id, candidate_ids, top_k, metric=settings.substitution_metric
+        )
+    if engine == "sql":
+        return await find_substitutes_sql(session, ingredient_id, candidate_ids, top_k)
+    if engine == "loop":
+        return await _find_substitutes_loop(session, ingredient_id, candidate_ids, top_k)
+    if engine != "index":
+        raise ValueError(f"Unknown substitution engine: {engine}")
+
+    index = await get_descriptor_index(session)
+    return index.find_substitutes(ingredient_id, candidate_ids, top_k)
+
+
+async def flavor_profiles_changed(session: AsyncSession, ingredient_ids: list[int]) -> None:
+    """Notify substitution engines that these ingredients' profiles changed.
+
+    The intensity matrix and the substitute_neighbors table update just the
+    affected rows; the bitset index is dropped and rebuilt on next use.  The
+    caller owns the transaction.
+    """
+    await refresh_flavor_matrix(session, ingredient_ids)
+    await refresh_substitute_neighbors(session, ingredient_ids)
+    invalidate_descriptor_index()
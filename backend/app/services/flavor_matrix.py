@@ -0,0 +1,268 @@
+"""Dense ingredient × descriptor intensity matrix for weighted substitute scoring.
+
+Unlike the descriptor bitset index, this engine uses ``FlavorProfile.intensity``:
+each ingredient is a row of descriptor intensities, and every candidate is
+scored at once — cosine as one matrix-vector product, weighted Jaccard
+(Σmin / Σmax) as one vectorized min/max reduction.
+
+Rows are updated in place when an ingredient's profiles change, so the matrix
+never needs a full rebuild after the initial load.  Profiles are re-seeded from
+another process, so ``get_flavor_matrix`` polls ``flavor_profiles_version`` at
+most every ``flavor_profiles_check_seconds``; when it moved, per-ingredient
+digests pick out the rows to upsert.
+"""
+
+import asyncio
+import logging
+import time
+
+import numpy as np
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.flavor_profile import FlavorProfile
+from app.models.ingredient import Ingredient
+from app.services.descriptor_index import flavor_profiles_version
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("weighted_jaccard", "cosine")
+
+
+class FlavorMatrix:
+    """Intensity matrix with per-row L2 norms cached for cosine scoring."""
+
+    def __init__(
+        self,
+        ingredients: dict[int, tuple[str, str]] | None = None,
+        profiles: dict[int, dict[str, float]] | None = None,
+    ):
+        """Build the matrix in one pass.
+
+        ingredients: ingredient_id -> (name, category)
+        profiles: ingredient_id -> {descriptor: intensity}
+        """
+        ingredients = ingredients or {}
+        profiles = profiles or {}
+        # Table version and ingredient_id -> row digest the matrix reflects
+        self.version: tuple = ()
+        self.digests: dict[int, str] = {}
+
+        self.vocabulary: list[str] = sorted({d for p in profiles.values() for d in p})
+        self._column = {d: i for i, d in enumerate(self.vocabulary)}
+        self._ids = np.array(sorted(ingredients), dtype=np.int64)
+        self._row = {int(ing_id): row for row, ing_id in enumerate(self._ids)}
+        self._names = [ingredients[int(i)][0] for i in self._ids]
+        self._categories = np.array([ingredients[int(i)][1] for i in self._ids], dtype=object)
+
+        self._matrix = np.zeros((len(self._ids), len(self.vocabulary)), dtype=np.float32)
+        for ing_id, profile in profiles.items():
+            row = self._row.get(ing_id)
+            if row is None:
+                continue
+            for d, intensity in profile.items():
+                self._matrix[row, self._column[d]] = intensity
+        self._norms = np.linalg.norm(self._matrix, axis=1).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, ingredient_id: int) -> bool:
+        return ingredient_id in self._row
+
+    def upsert(
+        self, ingredient_id: int, name: str, category: str, profile: dict[str, float]
+    ) -> None:
+        """Insert or replace one ingredient's row, growing the vocabulary if needed."""
+        new_descriptors = [d for d in profile if d not in self._column]
+        if new_descriptors:
+            for d in new_descriptors:
+                self._column[d] = len(self.vocabulary)
+                self.vocabulary.append(d)
+            self._matrix = np.pad(self._matrix, ((0, 0), (0, len(new_descriptors))))
+
+        row = self._row.get(ingredient_id)
+        if row is None:
+            row = len(self._ids)
+            self._row[ingredient_id] = row
+            self._ids = np.append(self._ids, ingredient_id)
+            self._names.append(name)
+            self._categories = np.append(self._categories, np.array([category], dtype=object))
+            self._matrix = np.vstack(
+                [self._matrix, np.zeros((1, len(self.vocabulary)), dtype=np.float32)]
+            )
+            self._norms = np.append(self._norms, np.float32(0))
+        else:
+            self._names[row] = name
+            self._categories[row] = category
+            self._matrix[row] = 0
+
+        for d, intensity in profile.items():
+            self._matrix[row, self._column[d]] = intensity
+        self._norms[row] = np.linalg.norm(self._matrix[row])
+
+    def remove(self, ingredient_id: int) -> None:
+        row = self._row.pop(ingredient_id, None)
+        if row is None:
+            return
+        self._ids = np.delete(self._ids, row)
+        del self._names[row]
+        self._categories = np.delete(self._categories, row)
+        self._matrix = np.delete(self._matrix, row, axis=0)
+        self._norms = np.delete(self._norms, row)
+        self._row = {int(ing_id): r for r, ing_id in enumerate(self._ids)}
+
+    def scores(self, ingredient_id: int, rows: np.ndarray, metric: str) -> np.ndarray:
+        """Similarity of ``ingredient_id`` to each of the given rows."""
+        target = self._matrix[self._row[ingredient_id]]
+        candidates = self._matrix[rows]
+        if metric == "cosine":
+            dots = candidates @ target
+            denom = self._norms[rows] * self._norms[self._row[ingredient_id]]
+        elif metric == "weighted_jaccard":
+            dots = np.minimum(candidates, target).sum(axis=1)
+            denom = np.maximum(candidates, target).sum(axis=1)
+        else:
+            raise ValueError(f"Unknown flavor metric: {metric}")
+        return np.divide(
+            dots, denom, out=np.zeros(len(rows), dtype=np.float32), where=denom > 0
+        )
+
+    def find_substitutes(
+        self,
+        ingredient_id: int,
+        candidate_ids: list[int] | None = None,
+        top_k: int = 5,
+        metric: str = "weighted_jaccard",
+    ) -> list[dict]:
+        """Same contract as ``flavor_graph.find_substitutes``.
+
+        The score is returned under ``jaccard_score`` regardless of metric so
+        callers and ``SubstitutionSuggestion`` stay unchanged.
+        """
+        target = self._row.get(ingredient_id)
+        if target is None:
+            return []
+
+        if candidate_ids:
+            rows = np.array([self._row[c] for c in candidate_ids if c in self._row], dtype=np.int64)
+        else:
+            rows = np.flatnonzero(self._categories == self._categories[target])
+            rows = rows[rows != target]
+
+        if len(rows) == 0:
+            return []
+        rows = np.unique(rows)
+        rows = rows[np.argsort(self._ids[rows], kind="stable")]
+
+        scores = np.round(self.scores(ingredient_id, rows, metric).astype(np.float64), 3)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [
+            {
+                "ingredient_id": int(self._ids[rows[i]]),
+                "ingredient_name": self._names[rows[i]],
+                "jaccard_score": float(scores[i]),
+            }
+            for i in order
+        ]
+
+
+async def _load_rows(
+    session: AsyncSession, ingredient_ids: list[int] | None = None
+) -> tuple[dict[int, tuple[str, str]], dict[int, dict[str, float]]]:
+    ing_stmt = select(Ingredient.id, Ingredient.name, Ingredient.category)
+    fp_stmt = select(
+        FlavorProfile.ingredient_id, FlavorProfile.descriptor, FlavorProfile.intensity
+    )
+    if ingredient_ids is not None:
+        ing_stmt = ing_stmt.where(Ingredient.id.in_(ingredient_ids))
+        fp_stmt = fp_stmt.where(FlavorProfile.ingredient_id.in_(ingredient_ids))
+
+    result = await session.execute(ing_stmt)
+    ingredients = {row.id: (row.name, row.category) for row in result.all()}
+
+    result = await session.execute(fp_stmt)
+    profiles: dict[int, dict[str, float]] = {}
+    for row in result.all():
+        profiles.setdefault(row.ingredient_id, {})[row.descriptor] = row.intensity
+    return ingredients, profiles
+
+
+async def _row_digests(session: AsyncSession) -> dict[int, str]:
+    """ingredient_id -> md5 of its name, category and every descriptor/intensity."""
+    profile = func.concat_ws("=", FlavorProfile.descriptor, FlavorProfile.intensity)
+    result = await session.execute(
+        select(
+            Ingredient.id,
+            func.md5(func.concat_ws(
+                ":",
+                Ingredient.name,
+                Ingredient.category,
+                func.string_agg(
+                    profile, aggregate_order_by(literal_column("','"), FlavorProfile.descriptor)
+                ),
+            )).label("digest"),
+        )
+        .outerjoin(FlavorProfile, FlavorProfile.ingredient_id == Ingredient.id)
+        .group_by(Ingredient.id)
+    )
+    return {row.id: row.digest for row in result.all()}
+
+
+async def build_flavor_matrix(session: AsyncSession) -> FlavorMatrix:
+    version = await flavor_profiles_version(session)
+    digests = await _row_digests(session)
+    ingredients, profiles = await _load_rows(session)
+    matrix = FlavorMatrix(ingredients, profiles)
+    matrix.version, matrix.digests = version, digests
+    logger.info(
+        "Built flavor matrix: %d ingredients × %d descriptors",
+        len(matrix), len(matrix.vocabulary),
+    )
+    return matrix
+
+
+_matrix: FlavorMatrix | None = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+
+
+async def get_flavor_matrix(session: AsyncSession) -> FlavorMatrix:
+    """Return the process-wide flavor matrix, upserting rows that changed in the database."""
+    global _matrix, _checked_at
+    interval = settings.flavor_profiles_check_seconds
+    if _matrix is not None and time.monotonic() - _checked_at < interval:
+        return _matrix
+    async with _lock:
+        now = time.monotonic()
+        if _matrix is None:
+            _matrix = await build_flavor_matrix(session)
+            _checked_at = now
+        elif now - _checked_at >= interval:
+            _checked_at = now
+            version = await flavor_profiles_version(session)
+            if version != _matrix.version:
+                digests = await _row_digests(session)
+                changed = sorted(
+                    {i for i, d in digests.items() if _matrix.digests.get(i) != d}
+                    | (_matrix.digests.keys() - digests.keys())
+                )
+                await refresh_flavor_matrix(session, changed)
+                _matrix.version, _matrix.digests = version, digests
+                logger.info("Flavor matrix: upserted %d changed ingredient(s)", len(changed))
+    return _matrix
+
+
+async def refresh_flavor_matrix(session: AsyncSession, ingredient_ids: list[int]) -> None:
+    """Reload only the given ingredients' rows (removing any that were deleted)."""
+    if _matrix is None or not ingredient_ids:
+        return
+    ingredients, profiles = await _load_rows(session, ingredient_ids)
+    for ing_id in ingredient_ids:
+        if ing_id in ingredients:
+            name, category = ingredients[ing_id]
+            _matrix.upsert(ing_id, name, category, profiles.get(ing_id, {}))
+        else:
+            _matrix.remove(ing_id)
@@ -1,10 +1,71 @@
-"""Semantic search over culinary knowledge using pgvector."""
+"""Semantic search over culinary knowledge using pgvector.
+
+In "hybrid" mode a Postgres full-text leg (``text_search`` tsvector, GIN
+indexed) runs alongside the vector leg in one CTE query and the two rankings
+are fused with reciprocal rank fusion — exact technique names like "beurre
+monté" that embeddings blur still surface.
+"""
+
+import hashlib
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.embedding import CulinaryEmbedding
+from app.services.embedding_cache import embed_query
 from app.services.llm.base import LLMService
+from app.services.vector_index import apply_search_settings
+from app.services.vector_store import get_vector_store, invalidate_vector_store
+
+
+def content_hash(text_content: str) -> str:
+    """Dedup key stored in ``culinary_embeddings.content_hash``."""
+    return hashlib.sha256(text_content.encode("utf-8")).hexdigest()
+
+
+def _hybrid_sql(where_clause: str):
+    """Vector and full-text top candidates, fused by RRF, in one round trip.
+
+    The lexical leg ORs the query's terms (``plainto_tsquery`` ANDs them, which
+    a long intent string would never match) and ranks by ``ts_rank_cd``.
+    """
+    lexical_filter = f"{where_clause} AND" if where_clause else "WHERE"
+    return text(f"""
+        WITH vec AS (
+            SELECT id, embedding <=> CAST(:embedding AS vector) AS distance
+            FROM culinary_embeddings
+            {where_clause}
+            ORDER BY distance
+            LIMIT :candidates
+        ),
+        tsq AS (
+            SELECT replace(plainto_tsquery('english', :query)::text, '&', '|')::tsquery AS q
+        ),
+        lex AS (
+            SELECT id, ts_rank_cd(text_search, tsq.q) AS lexical_rank
+            FROM culinary_embeddings, tsq
+            {lexical_filter} text_search @@ tsq.q
+            ORDER BY lexical_rank DESC
+            LIMIT :candidates
+        ),
+        ranked AS (
+            SELECT id, row_number() OVER (ORDER BY distance) AS rank FROM vec
+            UNION ALL
+            SELECT id, row_number() OVER (ORDER BY lexical_rank DESC) AS rank FROM lex
+        ),
+        fused AS (
+            SELECT id, sum(1.0 / (:rrf_k + rank)) AS rrf_score
+            FROM ranked
+            GROUP BY id
+        )
+        SELECT e.id, e.content_type, e.source_table, e.text_content, e.metadata,
+               1 - (e.embedding <=> CAST(:embedding AS vector)) AS similarity
+        FROM fused
+        JOIN culinary_embeddings e ON e.id = fused.id
+        ORDER BY fused.rrf_score DESC, similarity DESC
+        LIMIT :limit
+    """)
 
 
 async def search_knowledge(
@@ -13,11 +74,19 @@ async def search_knowledge(
     query: str,
     content_type: str | None = None,
     top_k: int = 5,
+    mode: str | None = None,
 ) -> list[dict]:
-    """Semantic search over culinary embeddings."""
-    # Generate query embedding
-    embeddings = await llm_service.embed([query])
-    query_embedding = embeddings[0]
+    """Semantic search over culinary embeddings.
+
+    mode: "vector" or "hybrid"; defaults to ``settings.knowledge_search_mode``.
+    """
+    mode = mode or settings.knowledge_search_mode
+    # Generate query embedding (cached across requests)
+    query_embedding = await embed_query(llm_service, query)
+
+    if settings.knowledge_backend == "memory" and mode == "vector":
+        store = await get_vector_store(session)
+        return store.search(query_embedding, content_type, top_k)
 
     # Build query with cosine similarity
     filters = []
@@ -29,15 +98,22 @@ async def search_knowledge(
 
     where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
 
-    sql = text(f"""
-        SELECT id, content_type, source_table, text_content, metadata,
-               1 - (embedding <=> CAST(:embedding AS vector)) AS similarity
-        FROM culinary_embeddings
-        {where_clause}
-        ORDER BY embedding <=> CAST(:embedding AS vector)
-        LIMIT :limit
-    """)
+    if mode == "hybrid":
+        params["query"] = query
+        params["candidates"] = max(settings.hybrid_candidates, top_k)
+        params["rrf_k"] = settings.rrf_k
+        sql = _hybrid_sql(where_clause)
+    else:
+        sql = text(f"""
+            SELECT id, content_type, source_table, text_content, metadata,
+                   1 - (embedding <=> CAST(:embedding AS vector)) AS similarity
+            FROM culinary_embeddings
+            {where_clause}
+            ORDER BY embedding <=> CAST(:embedding AS vector)
+            LIMIT :limit
+        """)
 
+    await apply_search_settings(session)
     result = await session.execute(sql, params)
     return [
         {
@@ -69,8 +145,10 @@ async def index_content(
         source_id=source_id,
         source_table=source_table,
         text_content=text_content,
+        content_hash=content_hash(text_content),
         embedding=embeddings[0],
         metadata_=metadata,
     )
     session.add(embedding_record)
     await session.flush()
+    invalidate_vector_store()
@@ -5,6 +5,7 @@ import anthropic
 from pydantic import BaseModel
 
 from app.core.config import Settings
+from app.services.llm.embedding import EmbeddingBatcher, get_embedder
 
 logger = logging.getLogger(__name__)
 
@@ -13,14 +14,19 @@ class AnthropicLLMService:
     def __init__(self, settings: Settings):
         self._client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
         self._model = settings.llm_model
-        self._embedder = None
-        self._embedding_model_name = settings.embedding_model
+        self._embedding_batcher = EmbeddingBatcher(
+            self._encode,
+            max_batch_size=settings.embedding_batch_size,
+            max_wait_ms=settings.embedding_batch_wait_ms,
+            max_queue=settings.embedding_queue_size,
+        )
 
     def _get_embedder(self):
-        if self._embedder is None:
-            from sentence_transformers import SentenceTransformer
-            self._embedder = SentenceTransformer(self._embedding_model_name)
-        return self._embedder
+        return get_embedder()
+
+    async def aclose(self) -> None:
+        await self._client.close()
+        await self._embedding_batcher.aclose()
 
     async def generate(
         self,
@@ -93,10 +99,12 @@ class AnthropicLLMService:
             async for text in stream.text_stream:
                 yield text
 
+    def _encode(self, texts: list[str]):
+        # Runs on the batcher's worker thread, never on the event loop
+        return self._get_embedder().encode(texts, show_progress_bar=False)
+
     async def embed(self, texts: list[str]) -> list[list[float]]:
-        embedder = self._get_embedder()
-        embeddings = embedder.encode(texts, show_progress_bar=False)
-        return embeddings.tolist()
+        return await self._embedding_batcher.embed(texts)
 
     async def check_connectivity(self) -> bool:
         try:
@@ -0,0 +1,356 @@
+"""Exact-match response cache in front of any ``LLMService``.
+
+The agents call ``generate`` with fully deterministic prompts, so identical
+requests can be served without touching the model.  Responses are keyed on a
+hash of the model name, system prompt, user prompt, ``response_model`` JSON
+schema, temperature and max_tokens.  The memory backend stores validated
+instances, so a hit skips JSON parsing and ``model_validate`` and returns a deep
+copy.  The persistent backends store ``model_dump_json()`` tagged with the
+response model's name (plain JSON for str responses) and a hit is rebuilt with
+``model_validate_json``.
+
+Backends: in-memory LRU, a local SQLite file, or the ``llm_cache`` Postgres
+table — all with TTL and size-based eviction.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import Settings
+from app.models.llm_cache import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_BACKENDS = ("none", "memory", "sqlite", "postgres")
+
+
+def llm_cache_key(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    response_model: type[BaseModel] | None,
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    schema = response_model.model_json_schema() if response_model is not None else None
+    payload = json.dumps(
+        [model, system_prompt, user_prompt, schema, temperature, max_tokens],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _model_name(response_model: type[BaseModel] | None) -> str:
+    if response_model is None:
+        return ""
+    return f"{response_model.__module__}.{response_model.__qualname__}"
+
+
+def encode_response(value: str | BaseModel) -> bytes:
+    """``<response model name>\n<JSON>`` — the name is empty for str responses."""
+    if isinstance(value, BaseModel):
+        return f"{_model_name(type(value))}\n{value.model_dump_json()}".encode()
+    return f"\n{json.dumps(value)}".encode()
+
+
+def decode_response(
+    blob: bytes, response_model: type[BaseModel] | None
+) -> str | BaseModel | None:
+    """Rebuild an ``encode_response`` blob, or None if it was stored for another model."""
+    name, _, body = blob.decode("utf-8").partition("\n")
+    if name != _model_name(response_model):
+        return None
+    if response_model is None:
+        return json.loads(body)
+    return response_model.model_validate_json(body)
+
+
+class MemoryLLMCache:
+    """Process-local LRU with a TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._clock() - entry[0] > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class SqliteLLMCache:
+    """Encoded responses in a local SQLite file; survives restarts.
+
+    ``get`` returns the stored bytes; ``CachingLLMService`` decodes them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def _get(self, key: str) -> bytes | None:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return row[0]
+
+    def _set(self, key: str, value: str | BaseModel) -> None:
+        now = self._clock()
+        blob = encode_response(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, blob, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ? OR key NOT IN "
+                "(SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT ?)",
+                (now - self.ttl_seconds, self.max_entries),
+            )
+            self._conn.commit()
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str | BaseModel) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PostgresLLMCache:
+    """Encoded responses in the ``llm_cache`` table, shared by all API processes.
+
+    Uses its own sessions so cache writes never join a request's transaction.
+    A hit only bumps ``accessed_at`` once it is ``touch_seconds`` old, so hot
+    keys cost a single SELECT; LRU order is approximate to that granularity.
+    Expired and least-recently-used rows are swept every ``sweep_every`` writes.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        sweep_every: int = 64,
+        touch_seconds: float = 60,
+    ):
+        self._session_factory = session_factory
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sweep_every = sweep_every
+        self.touch_seconds = touch_seconds
+        self._writes = 0
+
+    async def get(self, key: str) -> bytes | None:
+        now = datetime.now(UTC)
+        cutoff = now - timedelta(seconds=self.ttl_seconds)
+        async with self._session_factory() as session, session.begin():
+            row = (await session.execute(
+                select(LLMCacheEntry.value, LLMCacheEntry.accessed_at).where(
+                    LLMCacheEntry.key == key, LLMCacheEntry.created_at >= cutoff
+                )
+            )).first()
+            if row is None:
+                return None
+            if now - row.accessed_at >= timedelta(seconds=self.touch_seconds):
+                await session.execute(
+                    update(LLMCacheEntry)
+                    .where(LLMCacheEntry.key == key)
+                    .values(accessed_at=now)
+                )
+        return row.value
+
+    async def set(self, key: str, value: str | BaseModel) -> None:
+        now = datetime.now(UTC)
+        blob = encode_response(value)
+        stmt = insert(LLMCacheEntry).values(key=key, value=blob, created_at=now, accessed_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LLMCacheEntry.key],
+            set_={"value": blob, "created_at": now, "accessed_at": now},
+        )
+        async with self._session_factory() as session, session.begin():
+            await session.execute(stmt)
+            self._writes += 1
+            if self._writes % self.sweep_every == 0:
+                await self._sweep(session, now)
+
+    async def _sweep(self, session, now: datetime) -> None:
+        keep = (
+            select(LLMCacheEntry.key)
+            .order_by(LLMCacheEntry.accessed_at.desc())
+            .limit(self.max_entries)
+        )
+        await session.execute(
+            delete(LLMCacheEntry).where(
+                (LLMCacheEntry.created_at < now - timedelta(seconds=self.ttl_seconds))
+                | LLMCacheEntry.key.not_in(keep)
+            )
+        )
+
+    async def aclose(self) -> None:
+        pass
+
+
+class CachingLLMService:
+    """``LLMService`` wrapper serving repeated ``generate`` calls from a cache.
+
+    ``generate_stream`` and ``embed`` pass through; any other attribute
+    (``_model``, ``check_connectivity``, ``connection_stats``…) is the inner
+    service's.
+    """
+
+    def __init__(self, inner, backend):
+        self._inner = inner
+        self._backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self._inner, name)
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response_model: type[BaseModel] | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str | BaseModel:
+        key = llm_cache_key(
+            getattr(self._inner, "_model", "unknown"),
+            system_prompt,
+            user_prompt,
+            response_model,
+            temperature,
+            max_tokens,
+        )
+        try:
+            cached = await self._backend.get(key)
+            if isinstance(cached, bytes):
+                cached = decode_response(cached, response_model)
+            elif cached is not None:
+                cached = copy.deepcopy(cached)
+        except Exception:
+            logger.warning("LLM cache read failed", exc_info=True)
+            cached = None
+        if cached is not None and (response_model is None or isinstance(cached, response_model)):
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        result = await self._inner.generate(
+            system_prompt, user_prompt, response_model, temperature, max_tokens
+        )
+        try:
+            await self._backend.set(key, copy.deepcopy(result))
+        except Exception:
+            logger.warning("LLM cache write failed", exc_info=True)
+        return result
+
+    def generate_stream(self, *args, **kwargs):
+        return self._inner.generate_stream(*args, **kwargs)
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return await self._inner.embed(texts)
+
+    def cache_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self._backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        await self._backend.aclose()
+        if hasattr(self._inner, "aclose"):
+            await self._inner.aclose()
+
+
+def build_llm_cache(settings: Settings):
+    """Return the configured cache backend, or None when caching is off."""
+    backend = settings.llm_cache_backend
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return MemoryLLMCache(settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds)
+    if backend == "sqlite":
+        return SqliteLLMCache(
+            settings.llm_cache_path, settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds
+        )
+    if backend == "postgres":
+        from app.core.database import async_session
+
+        return PostgresLLMCache(
+            async_session, settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds
+        )
+    raise ValueError(f"Unknown LLM cache backend: {backend}")
@@ -0,0 +1,159 @@
+"""Shared sentence-transformers embedder and off-loop, micro-batched execution.
+
+The embedding model is loaded once per process by ``get_embedder()`` — used by
+both LLM services and the knowledge ingest — and warmed in the application
+lifespan so the first plan request doesn't pay the load.  ONNX / OpenVINO
+backends (optionally a quantized int8 model file) can be selected by config.
+
+``SentenceTransformer.encode`` is CPU-bound and synchronous; calling it inside
+``async def embed`` stalls the whole event loop.  ``EmbeddingBatcher`` runs
+encode on a dedicated worker thread behind a bounded queue, and coalesces
+``embed()`` calls that arrive within a short window into one encode batch.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_embedder = None
+_embedder_lock = threading.Lock()
+_load_ms: int | None = None
+
+
+def _load_embedder():
+    from sentence_transformers import SentenceTransformer
+
+    kwargs: dict[str, Any] = {}
+    if settings.embedding_backend != "torch":
+        kwargs["backend"] = settings.embedding_backend
+        if settings.embedding_model_file:
+            kwargs["model_kwargs"] = {"file_name": settings.embedding_model_file}
+    return SentenceTransformer(settings.embedding_model, **kwargs)
+
+
+def get_embedder():
+    """Return the process-wide SentenceTransformer, loading it on first use."""
+    global _embedder, _load_ms
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                start = time.monotonic()
+                _embedder = _load_embedder()
+                _load_ms = int((time.monotonic() - start) * 1000)
+                logger.info(
+                    "Loaded embedding model %s (%s backend) in %dms",
+                    settings.embedding_model, settings.embedding_backend, _load_ms,
+                )
+    return _embedder
+
+
+async def warm_up_embedder() -> None:
+    """Load the model and run one dummy encode, off the event loop."""
+    await asyncio.to_thread(lambda: get_embedder().encode(["warm-up"], show_progress_bar=False))
+
+
+def embedder_status() -> dict:
+    return {
+        "model": settings.embedding_model,
+        "backend": settings.embedding_backend,
+        "loaded": _embedder is not None,
+        "load_ms": _load_ms,
+    }
+
+
+class EmbeddingBatcher:
+    """Queue embed requests and serve them in batches on a single encode thread."""
+
+    def __init__(
+        self,
+        encode: Callable[[list[str]], Any],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        max_queue: int = 256,
+    ):
+        """encode: sync function mapping a list of texts to an array-like of vectors."""
+        self._encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self.requests = 0
+        self.batches = 0
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        await queue.put((texts, future))  # blocks when the queue is full
+        return await future
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while size < self.max_batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), remaining)
+                    except TimeoutError:
+                        break
+                batch.append(item)
+                size += len(item[0])
+
+            texts = [t for item_texts, _ in batch for t in item_texts]
+            self.batches += 1
+            try:
+                vectors = await loop.run_in_executor(self._executor, self._encode, texts)
+                vectors = vectors.tolist()
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            offset = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "queued": self._queue.qsize() if self._queue else 0,
+        }
+
+    async def aclose(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._executor.shutdown(wait=False)
@@ -4,10 +4,14 @@ from app.services.llm.base import LLMService
 _instance: LLMService | None = None
 
 
+def llm_backend_name(settings: Settings) -> str:
+    return "anthropic" if "claude" in settings.llm_model.lower() else "ollama"
+
+
 def get_llm_service(settings: Settings) -> LLMService:
     global _instance
     if _instance is None:
-        if "claude" in settings.llm_model.lower():
+        if llm_backend_name(settings) == "anthropic":
             from app.services.llm.anthropic import AnthropicLLMService
 
             _instance = AnthropicLLMService(settings)
@@ -15,4 +19,18 @@ def get_llm_service(settings: Settings) -> LLMService:
             from app.services.llm.local import LocalOllamaService
 
             _instance = LocalOllamaService(settings)
+
+        from app.services.llm.cache import CachingLLMService, build_llm_cache
+
+        cache = build_llm_cache(settings)
+        if cache is not None:
+            _instance = CachingLLMService(_instance, cache)
     return _instance
+
+
+async def close_llm_service() -> None:
+    """Release the service's connections (application shutdown)."""
+    global _instance
+    if _instance is not None and hasattr(_instance, "aclose"):
+        await _instance.aclose()
+    _instance = None
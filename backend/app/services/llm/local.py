@@ -1,4 +1,9 @@
-"""Local Ollama LLM service — drop-in replacement for AnthropicLLMService."""
+"""Local Ollama LLM service — drop-in replacement for AnthropicLLMService.
+
+All calls share one pooled ``httpx.AsyncClient`` with HTTP keep-alive, so the
+LLM calls of a plan reuse a warm connection instead of opening one each.  The
+client is closed via ``aclose()`` from the application lifespan.
+"""
 
 import json
 import logging
@@ -9,6 +14,7 @@ import httpx
 from pydantic import BaseModel
 
 from app.core.config import Settings
+from app.services.llm.embedding import EmbeddingBatcher, get_embedder
 
 logger = logging.getLogger(__name__)
 
@@ -22,19 +28,64 @@ class LocalOllamaService:
     def __init__(self, settings: Settings):
         self._base_url = settings.ollama_base_url.rstrip("/")
         self._model = settings.llm_model
-        self._embedder = None
-        self._embedding_model_name = settings.embedding_model
+        self._limits = httpx.Limits(
+            max_connections=settings.ollama_max_connections,
+            max_keepalive_connections=settings.ollama_max_keepalive_connections,
+            keepalive_expiry=settings.ollama_keepalive_expiry,
+        )
+        self._client: httpx.AsyncClient | None = None
+        self._requests = 0
+        self._connections_opened = 0
+        self._embedding_batcher = EmbeddingBatcher(
+            self._encode,
+            max_batch_size=settings.embedding_batch_size,
+            max_wait_ms=settings.embedding_batch_wait_ms,
+            max_queue=settings.embedding_queue_size,
+        )
 
     # ------------------------------------------------------------------
-    # Embedding (sentence-transformers, lazy-loaded)
+    # Embedding (shared sentence-transformers model)
     # ------------------------------------------------------------------
 
     def _get_embedder(self):
-        if self._embedder is None:
-            from sentence_transformers import SentenceTransformer
+        return get_embedder()
+
+    # ------------------------------------------------------------------
+    # HTTP client (pooled, keep-alive)
+    # ------------------------------------------------------------------
 
-            self._embedder = SentenceTransformer(self._embedding_model_name)
-        return self._embedder
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(120.0),
+                limits=self._limits,
+                event_hooks={"request": [self._on_request]},
+            )
+        return self._client
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self._requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        # Fired only when the pool has no idle connection to hand out
+        if event_name == "connection.connect_tcp.complete":
+            self._connections_opened += 1
+
+    def connection_stats(self) -> dict:
+        reused = max(self._requests - self._connections_opened, 0)
+        return {
+            "requests": self._requests,
+            "connections_opened": self._connections_opened,
+            "reused": reused,
+            "reuse_rate": round(reused / self._requests, 4) if self._requests else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await self._embedding_batcher.aclose()
 
     # ------------------------------------------------------------------
     # Generation
@@ -66,9 +117,8 @@ class LocalOllamaService:
                 f"{json.dumps(response_model.model_json_schema())}"
             )
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(120.0)) as client:
-            resp = await client.post(f"{self._base_url}/api/generate", json=payload)
-            resp.raise_for_status()
+        resp = await self._get_client().post(f"{self._base_url}/api/generate", json=payload)
+        resp.raise_for_status()
 
         text: str = resp.json()["response"]
 
@@ -99,28 +149,29 @@ class LocalOllamaService:
             },
         }
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(120.0)) as client:
-            async with client.stream(
-                "POST", f"{self._base_url}/api/generate", json=payload
-            ) as resp:
-                resp.raise_for_status()
-                async for line in resp.aiter_lines():
-                    if not line:
-                        continue
-                    chunk = json.loads(line)
-                    if token := chunk.get("response", ""):
-                        yield token
-                    if chunk.get("done"):
-                        break
+        async with self._get_client().stream(
+            "POST", f"{self._base_url}/api/generate", json=payload
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if token := chunk.get("response", ""):
+                    yield token
+                if chunk.get("done"):
+                    break
 
     # ------------------------------------------------------------------
     # Embedding
     # ------------------------------------------------------------------
 
+    def _encode(self, texts: list[str]):
+        # Runs on the batcher's worker thread, never on the event loop
+        return self._get_embedder().encode(texts, show_progress_bar=False)
+
     async def embed(self, texts: list[str]) -> list[list[float]]:
-        embedder = self._get_embedder()
-        embeddings = embedder.encode(texts, show_progress_bar=False)
-        return embeddings.tolist()
+        return await self._embedding_batcher.embed(texts)
 
     # ------------------------------------------------------------------
     # Health
@@ -128,9 +179,10 @@ class LocalOllamaService:
 
     async def check_connectivity(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(5.0)) as client:
-                resp = await client.get(f"{self._base_url}/api/tags")
-                return resp.status_code == 200
+            resp = await self._get_client().get(
+                f"{self._base_url}/api/tags", timeout=httpx.Timeout(5.0)
+            )
+            return resp.status_code == 200
         except Exception:
             logger.warning("Ollama connectivity check failed", exc_info=True)
             return False
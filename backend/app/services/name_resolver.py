@@ -0,0 +1,35 @@
+"""Resolve many user-supplied names to catalog rows in one query.
+
+``lower(name) = ANY(:names)`` with the whole list bound as one array, served
+by the ``lower(name)`` functional indexes on ``ingredients`` and ``equipment``.
+Because the statement text does not change with the list length, the
+prepared-statement cache also gets reused.
+"""
+
+from typing import TypeVar
+
+from sqlalchemy import String, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.equipment import Equipment
+from app.models.ingredient import Ingredient
+
+Row = TypeVar("Row", Ingredient, Equipment)
+
+
+def resolve_names_stmt(model: type[Row], names: list[str]):
+    return select(model).where(
+        func.lower(model.name) == any_(bindparam("names", names, type_=ARRAY(String)))
+    )
+
+
+async def resolve_names(
+    session: AsyncSession, model: type[Row], names
+) -> dict[str, Row]:
+    """Rows of ``model`` whose lowercased name is in ``names``, keyed by it."""
+    wanted = sorted({n.lower() for n in names if n})
+    if not wanted:
+        return {}
+    rows = await session.scalars(resolve_names_stmt(model, wanted))
+    return {row.name.lower(): row for row in rows}
@@ -0,0 +1,118 @@
+"""Incremental parsing of a JSON document that is still being streamed.
+
+``PartialJSONParser.feed`` takes the next chunk of LLM output and returns the
+best-effort value of everything received so far: open containers are closed,
+an unfinished string *value* is closed where it stands (so a dish name can be
+shown while it is still being written), and an unfinished key, number or
+literal is dropped back to the last complete element.
+
+The structural scan is incremental (each character is scanned once), but every
+feed still ``json.loads`` the whole repaired prefix, so feeding a document of
+*n* characters token by token costs O(n²) overall.  That is fine for plan-sized
+output; feed coarser chunks if it ever is not.  Text before the first
+``{``/``[`` (prose, a code fence) is skipped, as is anything after the root
+value closes.
+"""
+
+import json
+from typing import Any
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class PartialJSONParser:
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._start: int | None = None
+        self._end: int | None = None
+        self._stack: list[str] = []
+        # Per open object: True while the next string is a key
+        self._expect_key: list[bool] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._escape = False
+        # Last prefix that ends on a complete element, with its open containers
+        self._cut = 0
+        self._cut_stack: list[str] = []
+
+    @property
+    def complete(self) -> bool:
+        """True once the root value has been closed."""
+        return self._end is not None
+
+    def feed(self, chunk: str) -> Any | None:
+        self.text += chunk
+        self._scan()
+        return self.value()
+
+    def _mark(self, cut: int) -> None:
+        self._cut = cut
+        self._cut_stack = list(self._stack)
+
+    def _scan(self) -> None:
+        text = self.text
+        i = self._pos
+        while i < len(text) and self._end is None:
+            ch = text[i]
+            if self._start is None:
+                if ch in _CLOSERS:
+                    self._start = i
+                    continue
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if not self._string_is_key:
+                        self._mark(i + 1)
+            elif ch == '"':
+                self._in_string = True
+                self._string_is_key = bool(self._stack) and self._stack[-1] == "{" and (
+                    self._expect_key[-1]
+                )
+            elif ch in _CLOSERS:
+                self._stack.append(ch)
+                self._expect_key.append(ch == "{")
+                self._mark(i + 1)
+            elif ch in "}]":
+                self._stack.pop()
+                self._expect_key.pop()
+                self._mark(i + 1)
+                if not self._stack:
+                    self._end = i + 1
+            elif ch == ":":
+                self._expect_key[-1] = False
+            elif ch == ",":
+                self._mark(i)
+                if self._stack[-1] == "{":
+                    self._expect_key[-1] = True
+            i += 1
+        self._pos = i
+
+    def value(self) -> Any | None:
+        if self._start is None:
+            return None
+        if self._end is not None:
+            return self._loads(self.text[self._start:self._end])
+
+        if self._in_string and not self._string_is_key:
+            head = self.text[self._start:]
+            if self._escape:
+                head = head[:-1]
+            closed = head + '"' + "".join(_CLOSERS[c] for c in reversed(self._stack))
+            value = self._loads(closed)
+            if value is not None:
+                return value
+
+        head = self.text[self._start:self._cut].rstrip().removesuffix(",")
+        return self._loads(head + "".join(_CLOSERS[c] for c in reversed(self._cut_stack)))
+
+    @staticmethod
+    def _loads(text: str) -> Any | None:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
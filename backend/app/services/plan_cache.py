@@ -0,0 +1,141 @@
+"""Reuse past plans for equivalent or near-identical requests.
+
+Requests are canonicalized first — ingredients and equipment lowercased,
+whitespace-collapsed, deduplicated and sorted; skill resolved to its tier — so
+order and casing differences hit the same ``plan_history`` row via
+``request_hash``.  Otherwise the most similar past request with the *same*
+hard constraints (equipment, skill tier, time limit, guest count —
+``constraint_hash``) is reused when the cosine similarity of the
+ingredients + intent embedding clears ``plan_cache_similarity_threshold`` and
+the past plan used no ingredient the new request lacks.  The stored request is
+re-canonicalized to confirm both, since the embedding and hash alone cannot.
+"""
+
+import hashlib
+import json
+import logging
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.auditor import SKILL_MAP
+from app.core.config import settings
+from app.models.plan_history import PlanHistory
+from app.schemas.audit import AuditRequest
+from app.schemas.plan import ExecutionPlan
+from app.services.embedding_cache import embed_query
+from app.services.llm.base import LLMService
+
+logger = logging.getLogger(__name__)
+
+_HARD_KEYS = ("equipment", "skill_tier", "time_limit_minutes", "guest_count")
+# Nearest neighbours checked for ingredient/constraint compatibility
+_SIMILAR_CANDIDATES = 5
+
+_stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0}
+
+
+class PlanCacheKeys(NamedTuple):
+    request_hash: str
+    constraint_hash: str
+    # Embedded for the similarity fallback
+    text: str
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def canonicalize_request(request: AuditRequest) -> dict:
+    return {
+        "ingredients": sorted({_normalize(i) for i in request.ingredients if i.strip()}),
+        "equipment": sorted({_normalize(e) for e in request.equipment if e.strip()}),
+        "skill_tier": SKILL_MAP.get(request.user_skill, 2),
+        "time_limit_minutes": request.time_limit_minutes,
+        "guest_count": request.guest_count,
+        "intent": _normalize(request.intent) if request.intent and request.intent.strip() else None,
+    }
+
+
+def _digest(obj) -> str:
+    payload = json.dumps(obj, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def plan_cache_keys(request: AuditRequest) -> PlanCacheKeys:
+    canonical = canonicalize_request(request)
+    hard = {k: canonical[k] for k in _HARD_KEYS}
+    text = f"{canonical['intent'] or ''} | {', '.join(canonical['ingredients'])}"
+    return PlanCacheKeys(_digest(canonical), _digest(hard), text)
+
+
+async def plan_cache_columns(llm: LLMService, request: AuditRequest) -> dict:
+    """Values for the plan_history cache columns of a newly generated plan."""
+    keys = plan_cache_keys(request)
+    return {
+        "request_hash": keys.request_hash,
+        "constraint_hash": keys.constraint_hash,
+        "request_embedding": await embed_query(llm, keys.text),
+    }
+
+
+def _reusable(cached_request: dict, canonical: dict) -> bool:
+    """Past plan needs nothing the new request lacks, under identical constraints."""
+    cached = canonicalize_request(AuditRequest.model_validate(cached_request))
+    return set(cached["ingredients"]) <= set(canonical["ingredients"]) and all(
+        cached[k] == canonical[k] for k in _HARD_KEYS
+    )
+
+
+async def lookup_cached_plan(
+    session: AsyncSession, llm: LLMService, request: AuditRequest
+) -> tuple[str, ExecutionPlan] | None:
+    """Return (plan_id, plan) of a reusable past plan, or None."""
+    keys = plan_cache_keys(request)
+
+    result = await session.execute(
+        select(PlanHistory.id, PlanHistory.execution_plan)
+        .where(PlanHistory.request_hash == keys.request_hash)
+        .order_by(PlanHistory.created_at.desc())
+        .limit(1)
+    )
+    row = result.first()
+    if row is not None:
+        _stats["exact_hits"] += 1
+        return str(row.id), ExecutionPlan.model_validate(row.execution_plan)
+
+    threshold = settings.plan_cache_similarity_threshold
+    if threshold < 1.0:
+        canonical = canonicalize_request(request)
+        embedding = await embed_query(llm, keys.text)
+        distance = PlanHistory.request_embedding.cosine_distance(embedding)
+        result = await session.execute(
+            select(
+                PlanHistory.id,
+                PlanHistory.execution_plan,
+                PlanHistory.audit_request,
+                distance.label("distance"),
+            )
+            .where(
+                PlanHistory.constraint_hash == keys.constraint_hash,
+                PlanHistory.request_embedding.is_not(None),
+                distance <= 1 - threshold,
+            )
+            .order_by(distance)
+            .limit(_SIMILAR_CANDIDATES)
+        )
+        for row in result.all():
+            if _reusable(row.audit_request, canonical):
+                _stats["similar_hits"] += 1
+                logger.info("Plan cache: reusing %s (similarity %.3f)", row.id, 1 - row.distance)
+                return str(row.id), ExecutionPlan.model_validate(row.execution_plan)
+
+    _stats["misses"] += 1
+    return None
+
+
+def plan_cache_stats() -> dict:
+    lookups = sum(_stats.values())
+    hits = _stats["exact_hits"] + _stats["similar_hits"]
+    return {**_stats, "hit_rate": round(hits / lookups, 4) if lookups else 0.0}
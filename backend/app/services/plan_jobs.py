@@ -0,0 +1,266 @@
+"""Postgres-backed queue for asynchronous plan generation.
+
+``POST /plans/generate:async`` inserts a ``plan_jobs`` row and returns its id;
+workers claim pending rows with ``FOR UPDATE SKIP LOCKED`` so any number of
+them — tasks in the API process or separate ``seed.plan_worker`` processes —
+can poll the same table without handing out a job twice.  A finished job's
+plan is stored in ``plan_history`` under the job's id.
+
+Each worker only claims jobs for its own LLM backend, and never while
+``plan_job_concurrency[backend]`` jobs for it are already running.  That
+count-then-claim runs under a per-backend transaction advisory lock, so the cap
+holds across processes.  A job still ``running`` after
+``plan_job_timeout_seconds`` (its worker died) is claimed again, up to
+``plan_job_max_attempts``.  Only the worker that holds a job can finish it, and
+a reclaimed job whose plan was already saved is marked done without re-running.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, func, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.orchestrator import run_pipeline
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.plan_history import PlanHistory
+from app.models.plan_job import PlanJob
+from app.schemas.audit import AuditRequest
+from app.services.llm.base import LLMService
+
+logger = logging.getLogger(__name__)
+
+_stats = {"claimed": 0, "done": 0, "failed": 0, "retried": 0}
+
+
+async def enqueue_plan_job(
+    session: AsyncSession, request: AuditRequest, llm_backend: str
+) -> PlanJob:
+    job = PlanJob(
+        id=uuid.uuid4(),
+        status="pending",
+        audit_request=request.model_dump(),
+        llm_backend=llm_backend,
+        attempts=0,
+    )
+    session.add(job)
+    await session.commit()
+    return job
+
+
+async def get_plan_job(session: AsyncSession, job_id: uuid.UUID) -> PlanJob | None:
+    return await session.get(PlanJob, job_id)
+
+
+async def claim_plan_job(
+    session: AsyncSession, llm_backend: str, worker_id: str
+) -> tuple[uuid.UUID, dict, int] | None:
+    """Claim the oldest runnable job for ``llm_backend``; commits.
+
+    Returns (job_id, audit_request, attempts) or None when nothing is runnable.
+    """
+    now = datetime.now(UTC)
+    stale = now - timedelta(seconds=settings.plan_job_timeout_seconds)
+    limit = settings.plan_job_concurrency.get(llm_backend, 1)
+
+    async with session.begin():
+        # Serializes claims per backend so the running-count check holds
+        await session.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"plan_jobs:{llm_backend}"},
+        )
+        # Stale jobs out of attempts are given up on
+        await session.execute(
+            update(PlanJob)
+            .where(
+                PlanJob.llm_backend == llm_backend,
+                PlanJob.status == "running",
+                PlanJob.started_at < stale,
+                PlanJob.attempts >= settings.plan_job_max_attempts,
+            )
+            .values(status="failed", error="Timed out", finished_at=now)
+        )
+        running = await session.scalar(
+            select(func.count()).where(
+                PlanJob.llm_backend == llm_backend,
+                PlanJob.status == "running",
+                PlanJob.started_at >= stale,
+            )
+        )
+        if running >= limit:
+            return None
+
+        next_job = (
+            select(PlanJob.id)
+            .where(
+                PlanJob.llm_backend == llm_backend,
+                or_(
+                    PlanJob.status == "pending",
+                    and_(PlanJob.status == "running", PlanJob.started_at < stale),
+                ),
+            )
+            .order_by(PlanJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        row = (await session.execute(
+            update(PlanJob)
+            .where(PlanJob.id == next_job)
+            .values(
+                status="running",
+                attempts=PlanJob.attempts + 1,
+                started_at=now,
+                worker_id=worker_id,
+                error=None,
+            )
+            .returning(PlanJob.id, PlanJob.audit_request, PlanJob.attempts)
+        )).first()
+
+    if row is None:
+        return None
+    _stats["claimed"] += 1
+    return row.id, row.audit_request, row.attempts
+
+
+async def _finish(
+    session: AsyncSession,
+    job_id: uuid.UUID,
+    worker_id: str,
+    status: str,
+    error: str | None = None,
+) -> bool:
+    """Record the outcome unless the job was reclaimed by another worker meanwhile."""
+    result = await session.execute(
+        update(PlanJob)
+        .where(
+            PlanJob.id == job_id,
+            PlanJob.worker_id == worker_id,
+            PlanJob.status == "running",
+        )
+        .values(
+            status=status,
+            error=error,
+            finished_at=datetime.now(UTC) if status != "pending" else None,
+        )
+    )
+    await session.commit()
+    if result.rowcount == 0:
+        logger.info(f"{worker_id}: plan job {job_id} was reclaimed; not recording {status}")
+        return False
+    return True
+
+
+async def _plan_saved(session: AsyncSession, job_id: uuid.UUID) -> bool:
+    return await session.scalar(select(PlanHistory.id).where(PlanHistory.id == job_id)) is not None
+
+
+class PlanWorker:
+    """Claims and runs plan jobs for one LLM backend until stopped."""
+
+    def __init__(
+        self,
+        llm: LLMService,
+        llm_backend: str,
+        worker_id: str,
+        session_factory: Callable[[], AsyncSession] = async_session,
+    ):
+        self.llm = llm
+        self.llm_backend = llm_backend
+        self.worker_id = worker_id
+        self._session_factory = session_factory
+
+    async def run_once(self) -> bool:
+        """Run one job if one is runnable; returns whether a job was run."""
+        async with self._session_factory() as session:
+            claimed = await claim_plan_job(session, self.llm_backend, self.worker_id)
+        if claimed is None:
+            return False
+
+        job_id, audit_request, attempts = claimed
+        async with self._session_factory() as session:
+            # A previous attempt saved the plan but died before marking the job done
+            if attempts > 1 and await _plan_saved(session, job_id):
+                await _finish(session, job_id, self.worker_id, "done")
+                _stats["done"] += 1
+                return True
+
+            logger.info(f"{self.worker_id}: running plan job {job_id} (attempt {attempts})")
+            try:
+                await run_pipeline(
+                    AuditRequest.model_validate(audit_request),
+                    session,
+                    self.llm,
+                    session_factory=self._session_factory,
+                    plan_id=str(job_id),
+                )
+            except Exception as e:
+                await session.rollback()
+                # A worker holding a reclaimed copy may have saved the same plan id first
+                duplicate = isinstance(e, IntegrityError) and await _plan_saved(session, job_id)
+                if not duplicate:
+                    retry = attempts < settings.plan_job_max_attempts
+                    logger.warning(
+                        f"Plan job {job_id} failed (attempt {attempts}): {e}", exc_info=True
+                    )
+                    _stats["retried" if retry else "failed"] += 1
+                    await _finish(
+                        session, job_id, self.worker_id, "pending" if retry else "failed", str(e)
+                    )
+                    return True
+            await _finish(session, job_id, self.worker_id, "done")
+        _stats["done"] += 1
+        return True
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                worked = await self.run_once()
+            except Exception:
+                logger.warning(f"{self.worker_id}: plan job poll failed", exc_info=True)
+                worked = False
+            if not worked:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(stop.wait(), settings.plan_job_poll_seconds)
+
+
+class PlanWorkerPool:
+    """``count`` PlanWorker tasks on the current event loop."""
+
+    def __init__(self, count: int, llm: LLMService, llm_backend: str):
+        prefix = f"{os.uname().nodename}:{os.getpid()}"
+        self.workers = [
+            PlanWorker(llm, llm_backend, f"{prefix}:{i}") for i in range(count)
+        ]
+        self._stop = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(w.run(self._stop)) for w in self.workers]
+
+    async def wait(self) -> None:
+        await asyncio.gather(*self._tasks)
+
+    async def stop(self, grace_seconds: float = 10.0) -> None:
+        """Let in-flight jobs finish for up to ``grace_seconds``, then cancel.
+
+        A cancelled job stays ``running`` and is reclaimed after the timeout.
+        """
+        self._stop.set()
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(self._tasks, timeout=grace_seconds)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def plan_worker_stats() -> dict:
+    return dict(_stats)
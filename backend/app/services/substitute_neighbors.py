@@ -0,0 +1,108 @@
+"""Precomputed top-K substitute table.
+
+The ingredient → substitute relation is small enough to materialize: each
+ingredient's top-K same-category neighbors (existing Jaccard semantics) are
+stored in ``substitute_neighbors`` and served with one primary-key lookup.
+When an ingredient's flavor profiles change only its category's rows are
+recomputed.
+"""
+
+import logging
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.ingredient import Ingredient
+from app.models.substitute_neighbor import SubstituteNeighbor
+from app.services.descriptor_index import DescriptorIndex, build_descriptor_index
+
+logger = logging.getLogger(__name__)
+
+
+def _neighbor_rows(index: DescriptorIndex, ingredient_ids: list[int], top_k: int) -> list[dict]:
+    rows = []
+    for ing_id in ingredient_ids:
+        for rank, sub in enumerate(index.find_substitutes(ing_id, top_k=top_k), start=1):
+            rows.append({
+                "ingredient_id": ing_id,
+                "rank": rank,
+                "neighbor_id": sub["ingredient_id"],
+                "jaccard_score": sub["jaccard_score"],
+            })
+    return rows
+
+
+async def rebuild_substitute_neighbors(session: AsyncSession, top_k: int | None = None) -> int:
+    """Recompute the whole table. Returns the number of rows written.
+
+    The caller owns the transaction.
+    """
+    top_k = top_k or settings.substitute_neighbors_k
+    index = await build_descriptor_index(session)
+    ingredient_ids = list((await session.execute(select(Ingredient.id))).scalars())
+    rows = _neighbor_rows(index, ingredient_ids, top_k)
+
+    await session.execute(delete(SubstituteNeighbor))
+    if rows:
+        await session.execute(insert(SubstituteNeighbor), rows)
+    logger.info(
+        "Rebuilt substitute_neighbors: %d ingredients, %d rows", len(ingredient_ids), len(rows)
+    )
+    return len(rows)
+
+
+async def refresh_substitute_neighbors(
+    session: AsyncSession, ingredient_ids: list[int], top_k: int | None = None
+) -> int:
+    """Recompute rows affected by a change to these ingredients' flavor profiles.
+
+    A changed ingredient's score against every same-category ingredient moves,
+    so the affected set is every ingredient sharing a category with one of
+    them.  The caller owns the transaction.
+    """
+    if not ingredient_ids:
+        return 0
+    top_k = top_k or settings.substitute_neighbors_k
+
+    categories = select(Ingredient.category).where(Ingredient.id.in_(ingredient_ids))
+    affected = set(
+        (await session.execute(
+            select(Ingredient.id).where(Ingredient.category.in_(categories))
+        )).scalars()
+    )
+    affected.update(ingredient_ids)
+
+    # Neighbors are same-category only, so the affected rows need no one else
+    index = await build_descriptor_index(session, sorted(affected))
+    rows = _neighbor_rows(index, sorted(affected), top_k)
+
+    await session.execute(
+        delete(SubstituteNeighbor).where(SubstituteNeighbor.ingredient_id.in_(affected))
+    )
+    if rows:
+        await session.execute(insert(SubstituteNeighbor), rows)
+    logger.info("Refreshed substitute_neighbors for %d ingredients", len(affected))
+    return len(rows)
+
+
+async def lookup_substitutes(
+    session: AsyncSession, ingredient_id: int, top_k: int = 5
+) -> list[dict]:
+    """Read precomputed substitutes — same shape as ``find_substitutes``."""
+    stmt = (
+        select(SubstituteNeighbor.neighbor_id, SubstituteNeighbor.jaccard_score, Ingredient.name)
+        .join(Ingredient, Ingredient.id == SubstituteNeighbor.neighbor_id)
+        .where(SubstituteNeighbor.ingredient_id == ingredient_id)
+        .order_by(SubstituteNeighbor.rank)
+        .limit(top_k)
+    )
+    result = await session.execute(stmt)
+    return [
+        {
+            "ingredient_id": row.neighbor_id,
+            "ingredient_name": row.name,
+            "jaccard_score": row.jaccard_score,
+        }
+        for row in result.all()
+    ]
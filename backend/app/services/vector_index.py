@@ -0,0 +1,78 @@
+"""ANN index lifecycle for ``culinary_embeddings.embedding``.
+
+Without an index every ``search_knowledge`` call is a sequential scan over
+all vectors.  HNSW (the default) can be built on an empty table and is
+maintained on insert; IVFFlat clusters existing rows, so it must be built
+after ingest with ``lists`` sized from the row count, and rebuilt as the
+corpus grows.  Query-time recall/speed knobs (``hnsw.ef_search`` /
+``ivfflat.probes``) are applied per transaction from config.
+"""
+
+import logging
+import math
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.embedding import CulinaryEmbedding
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAMES = {
+    "hnsw": "ix_culinary_embeddings_embedding_hnsw",
+    "ivfflat": "ix_culinary_embeddings_embedding_ivfflat",
+}
+
+
+def ivfflat_lists(row_count: int) -> int:
+    """pgvector's guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+    if row_count <= 1_000_000:
+        return max(1, row_count // 1000)
+    return int(math.sqrt(row_count))
+
+
+async def build_vector_index(
+    session: AsyncSession,
+    method: str | None = None,
+    m: int | None = None,
+    ef_construction: int | None = None,
+    lists: int | None = None,
+) -> str:
+    """(Re)build the ANN index, dropping any existing one. Returns the index DDL.
+
+    The caller owns the transaction.
+    """
+    method = method or settings.vector_index_method
+    if method not in INDEX_NAMES:
+        raise ValueError(f"Unknown vector index method: {method}")
+
+    if method == "hnsw":
+        m = m or settings.hnsw_m
+        ef_construction = ef_construction or settings.hnsw_ef_construction
+        options = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+    else:
+        if lists is None:
+            row_count = await session.scalar(
+                select(func.count()).select_from(CulinaryEmbedding)
+            )
+            lists = ivfflat_lists(row_count or 0)
+        options = f"lists = {int(lists)}"
+
+    for name in INDEX_NAMES.values():
+        await session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    ddl = (
+        f"CREATE INDEX {INDEX_NAMES[method]} ON culinary_embeddings "
+        f"USING {method} (embedding vector_cosine_ops) WITH ({options})"
+    )
+    await session.execute(text(ddl))
+    logger.info("Built vector index: %s", ddl)
+    return ddl
+
+
+async def apply_search_settings(session: AsyncSession) -> None:
+    """Set the ANN recall/speed knob for the current transaction."""
+    if settings.vector_index_method == "ivfflat":
+        await session.execute(text(f"SET LOCAL ivfflat.probes = {int(settings.ivfflat_probes)}"))
+    else:
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(settings.hnsw_ef_search)}"))
@@ -0,0 +1,190 @@
+"""In-process vector search over ``culinary_embeddings``.
+
+For a small knowledge corpus the pgvector round trip dominates
+``search_knowledge`` latency.  With ``knowledge_backend = "memory"`` every
+embedding is held in one contiguous, L2-normalized float32 matrix (optionally a
+memory-mapped ``.npy`` file) and a query is a single matmul plus
+``argpartition``; ``content_type`` filters use precomputed row masks.
+
+The store is process-wide.  Ingest runs in a separate process, so staleness is
+detected by polling the table's row count, max id and a digest of every row's
+``content_hash`` at most every ``vector_store_check_seconds``; a change —
+including a chunk re-embedded in place with new text — triggers a reload.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.embedding import CulinaryEmbedding
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class VectorStore:
+    """Normalized embedding matrix plus the row metadata search results carry."""
+
+    def __init__(self, rows: list[dict], vectors: np.ndarray, version: tuple = ()):
+        """rows: dicts with id, content_type, source_table, text_content, metadata —
+        aligned with ``vectors`` (already L2-normalized, float32)."""
+        self.rows = rows
+        self.vectors = vectors
+        self.version = version
+        types = np.array([r["content_type"] for r in rows], dtype=object)
+        self._masks = {t: types == t for t in set(types.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def search(self, query, content_type: str | None = None, top_k: int = 5) -> list[dict]:
+        """Top-k rows by cosine similarity — same shape as ``search_knowledge``."""
+        if not self.rows or top_k <= 0:
+            return []
+        scores = self.vectors @ _normalize(np.asarray(query, dtype=np.float32))
+        if content_type:
+            mask = self._masks.get(content_type)
+            if mask is None:
+                return []
+            scores = np.where(mask, scores, -np.inf)
+            top_k = min(top_k, int(mask.sum()))
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {**self.rows[i], "similarity": round(float(scores[i]), 4)}
+            for i in top
+        ]
+
+
+def _ids_path(path: Path) -> Path:
+    return path.with_name(path.stem + ".ids.npy")
+
+
+def _digest_path(path: Path) -> Path:
+    return path.with_name(path.stem + ".digest")
+
+
+def save_vectors(path: Path, ids: np.ndarray, vectors: np.ndarray, digest: str = "") -> None:
+    """Write the normalized matrix to ``path`` with its row ids and content digest."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, vectors)
+    np.save(_ids_path(path), ids)
+    _digest_path(path).write_text(digest)
+
+
+def load_vectors(path: Path, ids: np.ndarray, digest: str = "") -> np.ndarray | None:
+    """Memory-map ``path`` if it was saved for exactly these row ids and contents."""
+    if not path.is_file() or not _ids_path(path).is_file():
+        return None
+    if not np.array_equal(np.load(_ids_path(path)), ids):
+        return None
+    saved = _digest_path(path).read_text() if _digest_path(path).is_file() else ""
+    if saved != digest:
+        return None
+    return np.load(path, mmap_mode="r")
+
+
+async def _table_version(session: AsyncSession) -> tuple[int, int, str]:
+    """Row count, max id and an md5 over every row's content hash in id order."""
+    row_hash = func.coalesce(
+        CulinaryEmbedding.content_hash, func.md5(CulinaryEmbedding.text_content)
+    )
+    result = await session.execute(
+        select(
+            func.count(),
+            func.coalesce(func.max(CulinaryEmbedding.id), 0),
+            func.coalesce(
+                func.md5(func.string_agg(
+                    row_hash, aggregate_order_by(literal_column("','"), CulinaryEmbedding.id)
+                )),
+                "",
+            ),
+        )
+    )
+    count, max_id, digest = result.one()
+    return int(count), int(max_id), digest
+
+
+async def build_vector_store(session: AsyncSession) -> VectorStore:
+    version = await _table_version(session)
+    result = await session.execute(
+        select(
+            CulinaryEmbedding.id,
+            CulinaryEmbedding.content_type,
+            CulinaryEmbedding.source_table,
+            CulinaryEmbedding.text_content,
+            CulinaryEmbedding.metadata_,
+        ).order_by(CulinaryEmbedding.id)
+    )
+    rows = [
+        {
+            "id": row.id,
+            "content_type": row.content_type,
+            "source_table": row.source_table,
+            "text_content": row.text_content,
+            "metadata": row.metadata_,
+        }
+        for row in result.all()
+    ]
+    ids = np.array([r["id"] for r in rows], dtype=np.int64)
+
+    path = Path(settings.vector_store_path) if settings.vector_store_path else None
+    vectors = load_vectors(path, ids, version[2]) if path else None
+    if vectors is None:
+        result = await session.execute(
+            select(CulinaryEmbedding.id, CulinaryEmbedding.embedding)
+        )
+        by_id = {row.id: row.embedding for row in result.all()}
+        # Rows deleted between the two reads are dropped; new ones wait for the next reload
+        rows = [r for r in rows if r["id"] in by_id]
+        ids = np.array([r["id"] for r in rows], dtype=np.int64)
+        if rows:
+            vectors = _normalize(np.stack([
+                np.asarray(by_id[r["id"]], dtype=np.float32) for r in rows
+            ]))
+        else:
+            vectors = np.zeros((0, settings.embedding_dim), dtype=np.float32)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if path:
+            save_vectors(path, ids, vectors, version[2])
+            vectors = np.load(path, mmap_mode="r")
+
+    store = VectorStore(rows, vectors, version)
+    logger.info("Built in-process vector store: %d rows (%s)", len(store), path or "in memory")
+    return store
+
+
+_store: VectorStore | None = None
+_checked_at = 0.0
+
+
+async def get_vector_store(session: AsyncSession) -> VectorStore:
+    """Return the process-wide store, reloading it if the table changed."""
+    global _store, _checked_at
+    now = time.monotonic()
+    if _store is None:
+        _store = await build_vector_store(session)
+        _checked_at = now
+    elif now - _checked_at >= settings.vector_store_check_seconds:
+        _checked_at = now
+        if await _table_version(session) != _store.version:
+            _store = await build_vector_store(session)
+    return _store
+
+
+def invalidate_vector_store() -> None:
+    """Force a reload on next use (after in-process writes to culinary_embeddings)."""
+    global _store
+    _store = None
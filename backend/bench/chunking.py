@@ -0,0 +1,131 @@
+"""Benchmark the knowledge chunkers: speed, truncation coverage and recall.
+
+Compares the previous heading-only chunker with the token-aware one on a docs
+directory.  Coverage is the share of chunk tokens that fall inside the
+embedding model's 256-token window (what actually gets embedded).  With
+``--recall`` every chunk is embedded and sampled corpus sentences are used as
+queries against an in-process vector store; a hit is a top-k chunk containing
+the sentence.
+
+Usage:
+    python -m bench.chunking [--docs-dir backend/knowledge_docs] [--rounds 5]
+                             [--tokenizer] [--recall --queries 200 --k 5]
+"""
+
+import argparse
+import logging
+import random
+import re
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from app.services.vector_store import VectorStore, _normalize
+from seed.ingest_knowledge import chunk_by_heading, chunk_markdown, embed_texts, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+MODEL_MAX_TOKENS = 256
+
+CHUNKERS: dict[str, Callable[[str, str], list[dict]]] = {
+    "heading": chunk_by_heading,
+    "token": chunk_markdown,
+}
+
+
+def chunk_corpus(docs: dict[str, str], chunker) -> list[dict]:
+    return [c for name, text in docs.items() for c in chunker(text, name)]
+
+
+def coverage(chunks: list[dict], count_tokens: Callable[[str], int]) -> tuple[float, int, int]:
+    """(embedded share of tokens, mean tokens per chunk, max tokens per chunk)."""
+    sizes = [count_tokens(c["body"]) for c in chunks]
+    total = sum(sizes)
+    embedded = sum(min(n, MODEL_MAX_TOKENS) for n in sizes)
+    return (embedded / total if total else 1.0), int(np.mean(sizes)), max(sizes)
+
+
+def sample_sentences(docs: dict[str, str], n: int) -> list[str]:
+    sentences = [
+        s.strip()
+        for text in docs.values()
+        for s in re.split(r"(?<=[.!?])\s+", re.sub(r"^#.*$", "", text, flags=re.MULTILINE))
+        if len(s.split()) >= 8 and "\n" not in s.strip()
+    ]
+    random.Random(0).shuffle(sentences)
+    return sentences[:n]
+
+
+def recall_at_k(chunks: list[dict], queries: list[str], k: int) -> float:
+    rows = [
+        {"id": i, "content_type": "knowledge", "source_table": "", "text_content": c["body"],
+         "metadata": None}
+        for i, c in enumerate(chunks)
+    ]
+    vectors = _normalize(np.asarray(embed_texts([c["body"] for c in chunks]), dtype=np.float32))
+    store = VectorStore(rows, vectors)
+    query_vectors = embed_texts(queries)
+    hits = sum(
+        any(q in r["text_content"] for r in store.search(vec, top_k=k))
+        for q, vec in zip(queries, query_vectors)
+    )
+    return hits / len(queries)
+
+
+def run(docs_dir: Path, rounds: int, use_tokenizer: bool, recall: bool, n_queries: int, k: int):
+    docs = {p.stem: p.read_text(encoding="utf-8") for p in sorted(docs_dir.glob("**/*.md"))}
+    if not docs:
+        logger.error("No .md files found in %s", docs_dir)
+        return
+
+    count_tokens = estimate_tokens
+    if use_tokenizer:
+        from app.services.llm.embedding import get_embedder
+
+        tokenizer = get_embedder().tokenizer
+
+        def count_tokens(text: str) -> int:
+            return len(tokenizer.tokenize(text))
+
+    queries = sample_sentences(docs, n_queries) if recall else []
+    logger.info("Benchmarking %d docs, %d rounds", len(docs), rounds)
+    for name, chunker in CHUNKERS.items():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            chunks = chunk_corpus(docs, chunker)
+        docs_per_s = len(docs) * rounds / (time.perf_counter() - start)
+        share, mean_tokens, max_tokens = coverage(chunks, count_tokens)
+        line = (
+            f"{name:<8} {docs_per_s:10.0f} docs/s  chunks={len(chunks):<6} "
+            f"mean={mean_tokens:<4} max={max_tokens:<5} embedded={share:.3f}"
+        )
+        if queries:
+            line += f"  hit@{k}={recall_at_k(chunks, queries, k):.3f}"
+        logger.info(line)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Benchmark knowledge chunkers")
+    parser.add_argument(
+        "--docs-dir",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent / "knowledge_docs",
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--tokenizer", action="store_true", help="Count tokens with the embedding model's tokenizer"
+    )
+    parser.add_argument("--recall", action="store_true", help="Embed chunks and measure hit@k")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.docs_dir, args.rounds, args.tokenizer, args.recall, args.queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark vector-only vs hybrid (full-text + vector, RRF) knowledge search.
+
+Each technique name from ``seed/techniques.json`` is used as a query; a result
+counts as relevant when its text mentions that name verbatim (case-insensitive).
+Queries with no such chunk in the corpus are skipped.  Reports hit rate@k,
+MRR and per-query latency for each mode.
+
+Usage:
+    python -m bench.knowledge_search [--modes vector hybrid] [--k 5]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.services.knowledge_base import search_knowledge
+from app.services.llm.factory import get_llm_service
+from bench.substitutions import percentile
+
+logger = logging.getLogger(__name__)
+
+TECHNIQUES_FILE = Path(__file__).resolve().parent.parent / "seed" / "techniques.json"
+
+
+async def load_queries() -> list[str]:
+    names = [t["name"] for t in json.loads(TECHNIQUES_FILE.read_text())]
+    queries = []
+    async with async_session() as session:
+        for name in names:
+            found = await session.scalar(
+                text("SELECT 1 FROM culinary_embeddings WHERE text_content ILIKE :p LIMIT 1"),
+                {"p": f"%{name}%"},
+            )
+            if found:
+                queries.append(name)
+    return queries
+
+
+async def bench_mode(mode: str, queries: list[str], k: int) -> None:
+    llm = get_llm_service(settings)
+    latencies: list[float] = []
+    hits = 0
+    reciprocal_ranks: list[float] = []
+    async with async_session() as session:
+        # Warm-up builds the embedding model and query cache outside the timed region
+        for query in queries:
+            await search_knowledge(session, llm, query, top_k=k, mode=mode)
+        for query in queries:
+            start = time.perf_counter()
+            results = await search_knowledge(session, llm, query, top_k=k, mode=mode)
+            latencies.append((time.perf_counter() - start) * 1000)
+            ranks = [
+                i for i, r in enumerate(results, start=1)
+                if query.lower() in r["text_content"].lower()
+            ]
+            if ranks:
+                hits += 1
+            reciprocal_ranks.append(1 / ranks[0] if ranks else 0.0)
+
+    logger.info(
+        "%-7s hit@%d=%.3f  mrr=%.3f  p50=%7.2fms  p99=%7.2fms  mean=%7.2fms",
+        mode,
+        k,
+        hits / len(queries),
+        statistics.fmean(reciprocal_ranks),
+        percentile(latencies, 50),
+        percentile(latencies, 99),
+        statistics.fmean(latencies),
+    )
+
+
+async def run(modes: list[str], k: int) -> None:
+    queries = await load_queries()
+    if not queries:
+        logger.error(
+            "No technique names found in the corpus — run `python -m seed.ingest_knowledge`"
+        )
+        return
+    logger.info("Benchmarking %d technique-name queries, k=%d", len(queries), k)
+    for mode in modes:
+        await bench_mode(mode, queries, k)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Benchmark knowledge search modes")
+    parser.add_argument(
+        "--modes", nargs="+", choices=["vector", "hybrid"], default=["vector", "hybrid"]
+    )
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.modes, args.k))
+
+
+if __name__ == "__main__":
+    main()
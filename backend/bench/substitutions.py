@@ -0,0 +1,110 @@
+"""Benchmark substitution engines against the seeded dataset.
+
+Runs ``find_substitutes`` for every ingredient with each engine, checks that
+the engines agree on scores, and reports per-call latency percentiles.  The
+``precomputed`` engine reads ``substitute_neighbors`` directly, without the
+index fallback ``find_substitutes`` uses, so it refuses to run on an empty table.
+
+Usage:
+    python -m bench.substitutions [--engines index sql loop] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from sqlalchemy import func, select
+
+from app.core.database import async_session
+from app.models.ingredient import Ingredient
+from app.models.substitute_neighbor import SubstituteNeighbor
+from app.services.flavor_graph import SUBSTITUTION_ENGINES, find_substitutes
+from app.services.substitute_neighbors import lookup_substitutes
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+async def substitutes(session, ingredient_id: int, engine: str) -> list[dict]:
+    if engine == "precomputed":
+        return await lookup_substitutes(session, ingredient_id)
+    return await find_substitutes(session, ingredient_id, engine=engine)
+
+
+async def bench_engine(
+    engine: str, ingredient_ids: list[int], rounds: int
+) -> tuple[list[float], dict]:
+    """Return (latencies in ms, results keyed by ingredient id) for one engine."""
+    latencies: list[float] = []
+    results: dict[int, list[dict]] = {}
+    async with async_session() as session:
+        # Warm-up call builds any in-process caches outside the timed region
+        await substitutes(session, ingredient_ids[0], engine)
+        for _ in range(rounds):
+            for ing_id in ingredient_ids:
+                start = time.perf_counter()
+                results[ing_id] = await substitutes(session, ing_id, engine)
+                latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, results
+
+
+def scores_of(results: dict[int, list[dict]]) -> dict[int, list[float]]:
+    return {k: [r["jaccard_score"] for r in v] for k, v in results.items()}
+
+
+async def run(engines: list[str], rounds: int) -> None:
+    async with async_session() as session:
+        ingredient_ids = list((await session.execute(select(Ingredient.id))).scalars())
+        neighbors = await session.scalar(select(func.count()).select_from(SubstituteNeighbor))
+    if not ingredient_ids:
+        logger.error("No ingredients found — run `python -m seed.runner` first")
+        return
+    if "precomputed" in engines and not neighbors:
+        logger.error(
+            "substitute_neighbors is empty — run `python -m seed.runner` "
+            "or drop precomputed from --engines"
+        )
+        raise SystemExit(1)
+
+    logger.info("Benchmarking %d ingredients × %d rounds", len(ingredient_ids), rounds)
+    baseline = None
+    for engine in engines:
+        latencies, results = await bench_engine(engine, ingredient_ids, rounds)
+        agree = ""
+        if baseline is None:
+            baseline = scores_of(results)
+        else:
+            mismatches = sum(1 for k, v in scores_of(results).items() if baseline[k] != v)
+            agree = f"  score mismatches vs {engines[0]}: {mismatches}"
+        logger.info(
+            "%-6s p50=%7.2fms  p99=%7.2fms  mean=%7.2fms%s",
+            engine,
+            percentile(latencies, 50),
+            percentile(latencies, 99),
+            statistics.fmean(latencies),
+            agree,
+        )
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Benchmark substitution engines")
+    parser.add_argument(
+        "--engines", nargs="+", choices=SUBSTITUTION_ENGINES, default=list(SUBSTITUTION_ENGINES)
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.engines, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark knowledge-base ANN search against exact search.
+
+Samples stored chunks as queries (their own embeddings), computes the exact
+top-k with index scans disabled, then measures recall@k and latency of the
+indexed search across a sweep of ``hnsw.ef_search`` / ``ivfflat.probes``.
+
+Usage:
+    python -m bench.vector_index [--queries 100] [--k 5] [--sweep 10 20 40 80 160]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import async_session
+from bench.substitutions import percentile
+
+logger = logging.getLogger(__name__)
+
+_SEARCH_SQL = text("""
+    SELECT id FROM culinary_embeddings
+    ORDER BY embedding <=> CAST(:embedding AS vector)
+    LIMIT :limit
+""")
+
+
+async def sample_queries(n: int) -> list[str]:
+    async with async_session() as session:
+        result = await session.execute(
+            text("SELECT embedding::text FROM culinary_embeddings ORDER BY random() LIMIT :n"),
+            {"n": n},
+        )
+        return list(result.scalars())
+
+
+async def search(
+    queries: list[str], k: int, setup: list[str]
+) -> tuple[list[list[int]], list[float]]:
+    """Run each query in its own transaction after ``setup`` statements."""
+    ids: list[list[int]] = []
+    latencies: list[float] = []
+    async with async_session() as session:
+        for embedding in queries:
+            async with session.begin():
+                for stmt in setup:
+                    await session.execute(text(stmt))
+                start = time.perf_counter()
+                result = await session.execute(_SEARCH_SQL, {"embedding": embedding, "limit": k})
+                ids.append(list(result.scalars()))
+                latencies.append((time.perf_counter() - start) * 1000)
+    return ids, latencies
+
+
+def recall(exact: list[list[int]], approx: list[list[int]]) -> float:
+    hits = sum(len(set(e) & set(a)) for e, a in zip(exact, approx))
+    total = sum(len(e) for e in exact)
+    return hits / total if total else 1.0
+
+
+async def run(n_queries: int, k: int, sweep: list[int]) -> None:
+    queries = await sample_queries(n_queries)
+    if not queries:
+        logger.error("No embeddings found — run `python -m seed.ingest_knowledge` first")
+        return
+
+    method = settings.vector_index_method
+    knob = "ivfflat.probes" if method == "ivfflat" else "hnsw.ef_search"
+    logger.info("Benchmarking %d queries, k=%d, %s index", len(queries), k, method)
+
+    exact, latencies = await search(
+        queries, k, ["SET LOCAL enable_indexscan = off", "SET LOCAL enable_bitmapscan = off"]
+    )
+    logger.info(
+        "%-22s recall=1.000  p50=%7.2fms  p99=%7.2fms  mean=%7.2fms",
+        "exact (seq scan)",
+        percentile(latencies, 50),
+        percentile(latencies, 99),
+        statistics.fmean(latencies),
+    )
+
+    for value in sweep:
+        approx, latencies = await search(queries, k, [f"SET LOCAL {knob} = {int(value)}"])
+        logger.info(
+            "%-22s recall=%.3f  p50=%7.2fms  p99=%7.2fms  mean=%7.2fms",
+            f"{knob}={value}",
+            recall(exact, approx),
+            percentile(latencies, 50),
+            percentile(latencies, 99),
+            statistics.fmean(latencies),
+        )
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Benchmark knowledge-base ANN recall/latency")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--sweep", type=int, nargs="+", default=[10, 20, 40, 80, 160])
+    args = parser.parse_args()
+
+    asyncio.run(run(args.queries, args.k, args.sweep))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,47 @@
 """Ingest markdown knowledge docs into pgvector.
 
-Chunks files by heading, embeds with sentence-transformers, and upserts into
-the culinary_embeddings table.  Idempotent — skips chunks whose text_content
-already exists.
+Chunks files by heading into token-bounded, overlapping windows, embeds with
+sentence-transformers, and inserts into the culinary_embeddings table.
+Idempotent — skips chunks whose content hash already exists.
+
+Incremental: a JSON manifest (``.ingest_manifest.json`` in the docs dir) records
+each file's mtime, size, sha256 and chunk hashes.  Files whose mtime/size (or,
+failing that, content hash) are unchanged are skipped without chunking; for
+changed files only new chunks are embedded and chunks that no longer exist are
+deleted, as are all chunks of files removed from the corpus.  ``--full`` (or a
+change to the chunker settings) ignores the manifest.
+
+Streaming: files are read and chunked lazily, chunks flow through fixed-size
+batches (hash lookup → embed on a worker pool → one multi-row INSERT), and at
+most ``workers`` batches are in flight, so memory stays bounded regardless of
+corpus size.
 
 Usage:
     python -m seed.ingest_knowledge [--docs-dir backend/knowledge_docs]
+                                    [--batch-size 128] [--workers 2] [--full]
 """
 
 import argparse
 import asyncio
+import hashlib
+import json
 import logging
+import os
 import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 
-from sqlalchemy import select, func
+from sqlalchemy import delete, insert, select
 
 from app.core.config import settings
 from app.core.database import async_session
 from app.models.embedding import CulinaryEmbedding
+from app.services.knowledge_base import content_hash
+from app.services.llm.embedding import get_embedder
+from app.services.vector_index import build_vector_index
 
 logger = logging.getLogger(__name__)
 
@@ -27,33 +50,140 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 _HEADING_RE = re.compile(r"^(#{1,3})\s+(.+)$", re.MULTILINE)
+# Rough word-piece proxy: ASCII words and every other non-space character (accented
+# letters count on their own, as WordPiece tends to split them).  The real tokenizer
+# splits rare words further, so the default budget leaves headroom below 256.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.ASCII)
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(*-])")
 
 
-def chunk_markdown(text: str, source_name: str) -> list[dict]:
-    """Split markdown into chunks at heading boundaries.
+def estimate_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text))
 
-    Each chunk keeps the heading as its first line so the embedding captures
-    the topic.  Text before the first heading becomes a "preamble" chunk.
+
+def _sections(text: str, source_name: str) -> Iterator[tuple[str, str, str]]:
+    """Yield (heading, heading path, body without the heading line) per section."""
+    matches = list(_HEADING_RE.finditer(text))
+    if not matches:
+        yield source_name, source_name, text.strip()
+        return
+
+    preamble = text[: matches[0].start()].strip()
+    if preamble:
+        yield f"{source_name} — preamble", source_name, preamble
+
+    stack: list[tuple[int, str]] = []
+    for idx, m in enumerate(matches):
+        level, heading = len(m.group(1)), m.group(2).strip()
+        stack = [(lvl, h) for lvl, h in stack if lvl < level] + [(level, heading)]
+        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
+        path = " > ".join([source_name] + [h for _, h in stack])
+        yield heading, path, text[m.end():end].strip()
+
+
+def _units(body: str, budget: int) -> list[tuple[str, int]]:
+    """Split into sentences/paragraphs of at most ``budget`` tokens each."""
+    # Fast path for short sections (English runs ~4-6 chars per token, so longer
+    # bodies essentially never fit and counting them twice would be wasted)
+    if len(body) <= budget * 8:
+        total = estimate_tokens(body)
+        if total <= budget:
+            return [(body, total)]
+    pieces = [
+        sentence
+        for paragraph in body.split("\n\n")
+        for sentence in _SENTENCE_END_RE.split(paragraph)
+    ]
+    units = []
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        n = estimate_tokens(piece)
+        if n <= budget:
+            units.append((piece, n))
+            continue
+        # A single over-long sentence: fall back to word windows
+        words, size = [], 0
+        for word in piece.split():
+            k = estimate_tokens(word)
+            if words and size + k > budget:
+                units.append((" ".join(words), size))
+                words, size = [], 0
+            words.append(word)
+            size += k
+        if words:
+            units.append((" ".join(words), size))
+    return units
+
+
+def _pack(units: list[tuple[str, int]], budget: int, overlap: int) -> list[str]:
+    """Greedy windows of whole units; each window repeats the previous one's
+    trailing units (up to ``overlap`` tokens)."""
+    windows: list[str] = []
+    window: list[tuple[str, int]] = []
+    size = 0
+    for unit, n in units:
+        if window and size + n > budget:
+            windows.append(" ".join(u for u, _ in window))
+            carry: list[tuple[str, int]] = []
+            carried = 0
+            for u, k in reversed(window):
+                if carried + k > overlap or carried + k + n > budget:
+                    break
+                carry.insert(0, (u, k))
+                carried += k
+            window, size = carry, carried
+        window.append((unit, n))
+        size += n
+    if window:
+        windows.append(" ".join(u for u, _ in window))
+    return windows
+
+
+def chunk_markdown(
+    text: str, source_name: str, max_tokens: int | None = None, overlap: int | None = None
+) -> list[dict]:
+    """Split markdown into chunks that fit the embedding model's token budget.
+
+    Sections are split at headings, then packed into sliding windows of whole
+    sentences with ``overlap`` tokens repeated between neighbours.  Each chunk
+    body starts with its heading path ("doc > Section > Subsection") so the
+    embedding captures the topic.  Text before the first heading becomes a
+    "preamble" chunk.
     """
-    positions = [(m.start(), m.group(2).strip()) for m in _HEADING_RE.finditer(text)]
+    max_tokens = max_tokens or settings.chunk_max_tokens
+    overlap = settings.chunk_overlap_tokens if overlap is None else overlap
 
+    chunks: list[dict] = []
+    for heading, path, body in _sections(text, source_name):
+        if not body:
+            continue
+        budget = max(max_tokens - estimate_tokens(path), 1)
+        for window in _pack(_units(body, budget), budget, overlap):
+            chunks.append({
+                "heading": heading,
+                "heading_path": path,
+                "body": f"{path}\n\n{window}",
+            })
+    return chunks
+
+
+def chunk_by_heading(text: str, source_name: str) -> list[dict]:
+    """Previous chunker — one chunk per heading section, unbounded (for benchmarks)."""
+    positions = [(m.start(), m.group(2).strip()) for m in _HEADING_RE.finditer(text)]
     if not positions:
-        # No headings — treat entire file as one chunk
         return [{"heading": source_name, "body": text.strip()}] if text.strip() else []
 
     chunks: list[dict] = []
-
-    # Preamble (text before first heading)
     preamble = text[: positions[0][0]].strip()
     if preamble:
         chunks.append({"heading": f"{source_name} — preamble", "body": preamble})
-
     for idx, (start, heading) in enumerate(positions):
         end = positions[idx + 1][0] if idx + 1 < len(positions) else len(text)
         body = text[start:end].strip()
         if body:
             chunks.append({"heading": heading, "body": body})
-
     return chunks
 
 
@@ -63,85 +193,256 @@ def chunk_markdown(text: str, source_name: str) -> list[dict]:
 
 
 def embed_texts(texts: list[str]) -> list[list[float]]:
-    """Embed with sentence-transformers (CPU, synchronous)."""
-    from sentence_transformers import SentenceTransformer
-
-    model = SentenceTransformer(settings.embedding_model)
-    vectors = model.encode(texts, show_progress_bar=True)
+    """Embed with the shared sentence-transformers model (CPU, synchronous)."""
+    vectors = get_embedder().encode(texts, show_progress_bar=False)
     return vectors.tolist()
 
 
 # ---------------------------------------------------------------------------
-# Main ingestion
+# Manifest (change detection)
 # ---------------------------------------------------------------------------
 
+MANIFEST_NAME = ".ingest_manifest.json"
 
-async def ingest(docs_dir: Path) -> int:
-    md_files = sorted(docs_dir.glob("**/*.md"))
-    if not md_files:
-        logger.warning("No .md files found in %s", docs_dir)
-        return 0
 
-    logger.info("Found %d markdown file(s) in %s", len(md_files), docs_dir)
+def load_manifest(path: Path) -> dict[str, dict]:
+    """Return {relative path: {mtime, size, sha256, chunks}} — empty if missing/corrupt."""
+    try:
+        return json.loads(path.read_text())["files"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
 
-    all_chunks: list[dict] = []
+def manifest_chunker(path: Path) -> dict | None:
+    """Chunker parameters the manifest's chunk hashes were produced with."""
+    try:
+        return json.loads(path.read_text()).get("chunker")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def chunker_params() -> dict:
+    return {"max_tokens": settings.chunk_max_tokens, "overlap": settings.chunk_overlap_tokens}
+
+
+def save_manifest(path: Path, files: dict[str, dict]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    document = {"version": 1, "chunker": chunker_params(), "files": files}
+    tmp.write_text(json.dumps(document, indent=1, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def scan_files(
+    docs_dir: Path, md_files: list[Path], manifest: dict[str, dict]
+) -> tuple[dict[Path, dict], dict[str, dict]]:
+    """Split files into changed ones and the manifest entries of unchanged ones.
+
+    mtime+size match → unchanged without reading; otherwise the file's sha256
+    decides (a touched-but-identical file only gets its mtime refreshed).
+    Changed files map to their new {mtime, size, sha256}.
+    """
+    changed: dict[Path, dict] = {}
+    unchanged: dict[str, dict] = {}
+    for md_file in md_files:
+        key = md_file.relative_to(docs_dir).as_posix()
+        stat = md_file.stat()
+        entry = manifest.get(key)
+        if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            unchanged[key] = entry
+            continue
+        current = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "sha256": hashlib.sha256(md_file.read_bytes()).hexdigest(),
+        }
+        if entry and entry["sha256"] == current["sha256"]:
+            unchanged[key] = {**entry, **current}
+        else:
+            changed[md_file] = current
+    return changed, unchanged
+
+
+async def _delete_stale(stale: dict[str, list[str]]) -> int:
+    """Delete each source file's chunks whose hash is not in its current list."""
+    deleted = 0
+    async with async_session() as session:
+        async with session.begin():
+            for source_file, hashes in stale.items():
+                result = await session.execute(
+                    delete(CulinaryEmbedding).where(
+                        CulinaryEmbedding.content_type == "knowledge",
+                        CulinaryEmbedding.metadata_["source_file"].astext == source_file,
+                        CulinaryEmbedding.content_hash.not_in(hashes),
+                    )
+                )
+                deleted += result.rowcount
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Streaming pipeline
+# ---------------------------------------------------------------------------
+
+
+def iter_chunks(docs_dir: Path, md_files: Iterable[Path]) -> Iterator[dict]:
+    """Yield chunks one file at a time, each tagged with its source and hash.
+
+    ``source_file`` is the path relative to ``docs_dir`` (the manifest key), so
+    same-named files in different subdirectories stay distinct.
+    """
     for md_file in md_files:
         text = md_file.read_text(encoding="utf-8")
-        source = md_file.stem
-        chunks = chunk_markdown(text, source)
-        for chunk in chunks:
-            chunk["source_file"] = md_file.name
-        all_chunks.extend(chunks)
+        for chunk in chunk_markdown(text, md_file.stem):
+            chunk["path"] = md_file
+            chunk["source_file"] = md_file.relative_to(docs_dir).as_posix()
+            chunk["content_hash"] = content_hash(chunk["body"])
+            yield chunk
 
-    logger.info("Produced %d chunks from %d file(s)", len(all_chunks), len(md_files))
 
-    if not all_chunks:
-        return 0
+def batched(items: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
 
-    # Check which chunks already exist (idempotent)
+async def _stored_chunks(batch: list[dict]) -> set[tuple[str, str]]:
+    """(source_file, content_hash) pairs of the batch already stored (indexed hash lookup)."""
+    source_file = CulinaryEmbedding.metadata_["source_file"].astext
     async with async_session() as session:
-        existing = set()
         result = await session.execute(
-            select(CulinaryEmbedding.text_content).where(
-                CulinaryEmbedding.content_type == "knowledge"
+            select(source_file.label("source_file"), CulinaryEmbedding.content_hash).where(
+                CulinaryEmbedding.content_type == "knowledge",
+                CulinaryEmbedding.content_hash.in_([c["content_hash"] for c in batch]),
+                source_file.in_(sorted({c["source_file"] for c in batch})),
             )
         )
-        for row in result.scalars():
-            existing.add(row)
+        return {(row.source_file, row.content_hash) for row in result.all()}
+
+
+async def _new_chunks(batch: list[dict], seen: set[tuple[str, str]]) -> list[dict]:
+    """Drop chunks already stored for their file or already seen this run.
 
-    new_chunks = [c for c in all_chunks if c["body"] not in existing]
+    Dedup is per source file: chunk bodies start with the file stem, so a file
+    moved between subdirectories (or two same-stem files sharing a section)
+    hashes the same, and ``_delete_stale`` works file by file.
+    """
+    seen.update(await _stored_chunks(batch))
+
+    fresh = []
+    for chunk in batch:
+        key = (chunk["source_file"], chunk["content_hash"])
+        if key not in seen:
+            seen.add(key)
+            fresh.append(chunk)
+    return fresh
+
+
+async def _insert_chunks(chunks: list[dict], vectors: list[list[float]]) -> None:
+    rows = [
+        {
+            "content_type": "knowledge",
+            "source_id": 0,
+            "source_table": "knowledge_docs",
+            "text_content": chunk["body"],
+            "content_hash": chunk["content_hash"],
+            "embedding": vec,
+            "metadata_": {
+                "heading": chunk["heading"],
+                "heading_path": chunk["heading_path"],
+                "source_file": chunk["source_file"],
+            },
+        }
+        for chunk, vec in zip(chunks, vectors)
+    ]
+    async with async_session() as session:
+        async with session.begin():
+            # executemany — batched into multi-row INSERTs by the driver
+            await session.execute(insert(CulinaryEmbedding), rows)
+
+
+# ---------------------------------------------------------------------------
+# Main ingestion
+# ---------------------------------------------------------------------------
+
+
+async def ingest(
+    docs_dir: Path, batch_size: int = 128, workers: int = 2, full: bool = False
+) -> int:
+    md_files = sorted(docs_dir.glob("**/*.md"))
+    manifest_path = docs_dir / MANIFEST_NAME
+    previous = load_manifest(manifest_path)
+    # Different chunker settings produce different chunks for unchanged files
+    rechunk = full or manifest_chunker(manifest_path) != chunker_params()
+    manifest = {} if rechunk else previous
+
+    changed, entries = scan_files(docs_dir, md_files, manifest)
+    removed = [key for key in previous if not (docs_dir / key).is_file()]
     logger.info(
-        "%d new chunks to insert (%d already exist)", len(new_chunks), len(all_chunks) - len(new_chunks)
+        "Found %d markdown file(s) in %s: %d changed, %d unchanged, %d removed",
+        len(md_files), docs_dir, len(changed), len(entries), len(removed),
     )
-
-    if not new_chunks:
+    if not changed and not removed:
+        if entries != previous:
+            save_manifest(manifest_path, entries)
         return 0
 
-    # Embed
-    texts = [c["body"] for c in new_chunks]
-    logger.info("Embedding %d chunks...", len(texts))
-    vectors = embed_texts(texts)
+    loop = asyncio.get_running_loop()
+    seen: set[tuple[str, str]] = set()
+    file_chunks: dict[Path, list[str]] = {md_file: [] for md_file in changed}
+    pending: deque[tuple[list[dict], asyncio.Future]] = deque()
+    total = inserted = 0
 
-    # Insert
-    async with async_session() as session:
-        async with session.begin():
-            for chunk, vec in zip(new_chunks, vectors):
-                session.add(
-                    CulinaryEmbedding(
-                        content_type="knowledge",
-                        source_id=0,
-                        source_table="knowledge_docs",
-                        text_content=chunk["body"],
-                        embedding=vec,
-                        metadata_={
-                            "heading": chunk["heading"],
-                            "source_file": chunk["source_file"],
-                        },
-                    )
-                )
-        logger.info("Inserted %d knowledge chunks", len(new_chunks))
+    def recording(chunks: Iterator[dict]) -> Iterator[dict]:
+        for chunk in chunks:
+            file_chunks[chunk["path"]].append(chunk["content_hash"])
+            yield chunk
+
+    async def drain_one() -> None:
+        nonlocal inserted
+        chunks, future = pending.popleft()
+        await _insert_chunks(chunks, await future)
+        inserted += len(chunks)
+        logger.info("Inserted %d chunks (%d so far)", len(chunks), inserted)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest-embed") as pool:
+        for batch in batched(recording(iter_chunks(docs_dir, changed)), batch_size):
+            total += len(batch)
+            fresh = await _new_chunks(batch, seen)
+            if not fresh:
+                continue
+            if len(pending) >= workers:
+                await drain_one()
+            future = loop.run_in_executor(pool, embed_texts, [c["body"] for c in fresh])
+            pending.append((fresh, future))
+        while pending:
+            await drain_one()
+
+    # Chunks edited away or belonging to deleted files
+    stale = {
+        md_file.relative_to(docs_dir).as_posix(): hashes
+        for md_file, hashes in file_chunks.items()
+    }
+    stale.update({key: [] for key in removed})
+    deleted = await _delete_stale(stale)
+
+    logger.info(
+        "Processed %d chunks from %d changed file(s): %d inserted, %d already present, "
+        "%d stale deleted",
+        total, len(changed), inserted, total - inserted, deleted,
+    )
 
-    return len(new_chunks)
+    for md_file, hashes in file_chunks.items():
+        entries[md_file.relative_to(docs_dir).as_posix()] = {**changed[md_file], "chunks": hashes}
+    save_manifest(manifest_path, entries)
+
+    # IVFFlat centroids are trained on existing rows — rebuild after ingest.
+    # HNSW is maintained on insert and needs nothing here.
+    if (inserted or deleted) and settings.vector_index_method == "ivfflat":
+        async with async_session() as session:
+            async with session.begin():
+                await build_vector_index(session)
+
+    return inserted
 
 
 # ---------------------------------------------------------------------------
@@ -159,13 +460,18 @@ def main():
         default=Path(__file__).resolve().parent.parent / "knowledge_docs",
         help="Directory containing .md files (default: backend/knowledge_docs/)",
     )
+    parser.add_argument("--batch-size", type=int, default=128, help="Chunks per embed/insert")
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent embedding batches")
+    parser.add_argument(
+        "--full", action="store_true", help="Ignore the manifest and re-check every file"
+    )
     args = parser.parse_args()
 
     if not args.docs_dir.is_dir():
         logger.error("Docs directory does not exist: %s", args.docs_dir)
         raise SystemExit(1)
 
-    inserted = asyncio.run(ingest(args.docs_dir))
+    inserted = asyncio.run(ingest(args.docs_dir, args.batch_size, args.workers, args.full))
     logger.info("Done — %d new chunks ingested", inserted)
 
 
@@ -0,0 +1,55 @@
+"""Run plan_jobs workers outside the API process.
+
+Leave PLAN_WORKERS at 0 on the API when plan generation should only run here.
+
+Usage:
+    python -m seed.plan_worker [--workers N]
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.core.config import settings
+from app.services.llm.factory import close_llm_service, get_llm_service, llm_backend_name
+from app.services.plan_jobs import PlanWorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+async def serve(workers: int):
+    backend = llm_backend_name(settings)
+    pool = PlanWorkerPool(workers, get_llm_service(settings), backend)
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    logger.info(
+        f"{workers} plan worker(s) for {backend} "
+        f"(backend limit {settings.plan_job_concurrency.get(backend, 1)})"
+    )
+    pool.start()
+    await stopping.wait()
+    logger.info("Stopping — letting running jobs finish")
+    await pool.stop(grace_seconds=settings.plan_job_timeout_seconds)
+    await close_llm_service()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    parser = argparse.ArgumentParser(description="Run asynchronous plan generation workers")
+    parser.add_argument(
+        "--workers", type=int, default=max(settings.plan_workers, 1),
+        help="Concurrent workers in this process (default: PLAN_WORKERS, at least 1)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.workers))
+    logger.info("Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,10 @@ from app.models.flavor_profile import FlavorProfile
 from app.models.flavor_affinity import FlavorAffinity
 from app.models.equipment import Equipment
 from app.models.technique import Technique
+from app.models.substitute_neighbor import SubstituteNeighbor
+from app.services.affinity_graph import bump_affinity_version
+from app.services.flavor_graph import flavor_profiles_changed
+from app.services.substitute_neighbors import rebuild_substitute_neighbors
 
 SEED_DIR = Path(__file__).parent
 
@@ -51,14 +55,16 @@ async def seed_ingredients(session: AsyncSession) -> dict[str, int]:
     return name_to_id
 
 
-async def seed_flavor_profiles(session: AsyncSession, name_to_id: dict[str, int]):
+async def seed_flavor_profiles(session: AsyncSession, name_to_id: dict[str, int]) -> list[int]:
+    """Returns the ids of ingredients whose profiles were written."""
     count = await session.scalar(select(func.count()).select_from(FlavorProfile))
     if count and count > 0:
         print(f"  Flavor profiles already seeded ({count} rows), skipping")
-        return
+        return []
 
     data = load_json("flavor_profiles.json")
     added = 0
+    changed: set[int] = set()
     for item in data:
         ing_id = name_to_id.get(item["ingredient_name"].lower())
         if not ing_id:
@@ -68,9 +74,11 @@ async def seed_flavor_profiles(session: AsyncSession, name_to_id: dict[str, int]
             descriptor=item["descriptor"],
             intensity=item["intensity"],
         ))
+        changed.add(ing_id)
         added += 1
     await session.flush()
     print(f"  Seeded {added} flavor profiles")
+    return sorted(changed)
 
 
 async def seed_flavor_affinities(session: AsyncSession, name_to_id: dict[str, int]):
@@ -97,6 +105,7 @@ async def seed_flavor_affinities(session: AsyncSession, name_to_id: dict[str, in
         ))
         added += 1
     await session.flush()
+    bump_affinity_version()
     print(f"  Seeded {added} flavor affinities")
 
 
@@ -164,15 +173,31 @@ async def seed_techniques(session: AsyncSession):
     print(f"  Seeded {len(data)} techniques")
 
 
+async def seed_substitute_neighbors(session: AsyncSession) -> bool:
+    """Returns whether the table was (re)built."""
+    count = await session.scalar(select(func.count()).select_from(SubstituteNeighbor))
+    if count and count > 0:
+        print(f"  Substitute neighbors already built ({count} rows), skipping")
+        return False
+
+    written = await rebuild_substitute_neighbors(session)
+    print(f"  Built {written} substitute neighbors")
+    return True
+
+
 async def run_seed():
     print("Seeding database...")
     async with async_session() as session:
         async with session.begin():
             name_to_id = await seed_ingredients(session)
-            await seed_flavor_profiles(session, name_to_id)
+            changed_profiles = await seed_flavor_profiles(session, name_to_id)
             await seed_flavor_affinities(session, name_to_id)
             await seed_equipment(session)
             await seed_techniques(session)
+            rebuilt = await seed_substitute_neighbors(session)
+            if changed_profiles and not rebuilt:
+                # Profiles were re-seeded under an existing neighbor table
+                await flavor_profiles_changed(session, changed_profiles)
     print("Seeding complete!")
 
 
@@ -0,0 +1,38 @@
+"""Rebuild the precomputed substitute_neighbors table.
+
+Usage:
+    python -m seed.substitute_neighbors [--top-k 20]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.core.database import async_session
+from app.services.substitute_neighbors import rebuild_substitute_neighbors
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(top_k: int | None) -> int:
+    async with async_session() as session:
+        async with session.begin():
+            return await rebuild_substitute_neighbors(session, top_k)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    parser = argparse.ArgumentParser(description="Rebuild the substitute_neighbors table")
+    parser.add_argument(
+        "--top-k", type=int, default=None,
+        help="Neighbors per ingredient (default: SUBSTITUTE_NEIGHBORS_K)",
+    )
+    args = parser.parse_args()
+
+    written = asyncio.run(rebuild(args.top_k))
+    logger.info("Done — %d neighbor rows written", written)
+
+
+if __name__ == "__main__":
+    main()
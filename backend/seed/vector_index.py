@@ -0,0 +1,47 @@
+"""Build (or rebuild) the ANN index on culinary_embeddings.
+
+Usage:
+    python -m seed.vector_index [--method hnsw|ivfflat] [--m 16] [--ef-construction 64]
+                                [--lists N]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.core.database import async_session
+from app.services.vector_index import INDEX_NAMES, build_vector_index
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(
+    method: str | None, m: int | None, ef_construction: int | None, lists: int | None
+):
+    async with async_session() as session:
+        async with session.begin():
+            await build_vector_index(session, method, m, ef_construction, lists)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    parser = argparse.ArgumentParser(description="Build the culinary_embeddings ANN index")
+    parser.add_argument(
+        "--method", choices=list(INDEX_NAMES), default=None,
+        help="Index type (default: VECTOR_INDEX_METHOD)",
+    )
+    parser.add_argument("--m", type=int, default=None, help="HNSW max connections per node")
+    parser.add_argument("--ef-construction", type=int, default=None, help="HNSW build beam width")
+    parser.add_argument(
+        "--lists", type=int, default=None,
+        help="IVFFlat cluster count (default: sized from the row count)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(rebuild(args.method, args.m, args.ef_construction, args.lists))
+    logger.info("Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -89,6 +89,50 @@ class MockLLMService:
         return True
 
 
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def one(self):
+        (row,) = self._rows
+        return row
+
+    def scalars(self):
+        return iter(self._rows)
+
+
+class FakeSession:
+    """AsyncSession stand-in: returns queued row lists in order, one per execute().
+
+    Executed statements and their parameters are kept in ``statements`` and
+    ``params``; once the queue is empty every execute() returns no rows.
+    """
+
+    def __init__(self, *results):
+        self._results = list(results)
+        self.statements = []
+        self.params = []
+
+    def sql(self, dialect=None) -> list[str]:
+        """Executed statements compiled for ``dialect`` (default: PostgreSQL)."""
+        if dialect is None:
+            from sqlalchemy.dialects import postgresql
+
+            dialect = postgresql.dialect()
+        return [str(stmt.compile(dialect=dialect)) for stmt in self.statements]
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        self.params.append(params)
+        return FakeResult(self._results.pop(0) if self._results else [])
+
+
 @pytest.fixture
 def mock_llm():
     return MockLLMService()
@@ -0,0 +1,155 @@
+"""Unit tests for the in-process affinity adjacency cache."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.affinity_graph import AffinityGraph
+
+
+@pytest.fixture
+def graph():
+    names = {1: "Lemon", 2: "Thyme", 3: "Chicken", 4: "Butter", 5: "Saffron"}
+    edges = [
+        (1, 2, 0.8, "Flavor Bible"),
+        (1, 3, 0.9, None),
+        (2, 3, 0.85, None),
+        (3, 4, 0.7, None),
+        (1, 4, 0.4, None),
+    ]
+    return AffinityGraph(names, edges)
+
+
+def test_symmetric_and_sorted(graph):
+    assert [a["ingredient_name"] for a in graph.affinities(1)] == ["Chicken", "Thyme", "Butter"]
+    # Pair stored as (1, 2) is visible from either side
+    assert graph.affinities(2)[1] == {
+        "ingredient_name": "Lemon", "affinity_score": 0.8, "source": "Flavor Bible",
+    }
+
+
+def test_min_score_and_limit(graph):
+    assert [a["affinity_score"] for a in graph.affinities(1, min_score=0.8)] == [0.9, 0.8]
+    assert len(graph.affinities(1, limit=1)) == 1
+    assert graph.affinities(1, min_score=0.95) == []
+
+
+def test_isolated_and_unknown_ingredients(graph):
+    assert graph.affinities(5) == []
+    assert graph.affinities(42) == []
+
+
+def test_name_lookup_is_case_insensitive(graph):
+    assert graph.id_for_name("lemon") == 1
+    assert graph.id_for_name("LEMON") == 1
+    assert graph.id_for_name("yuzu") is None
+
+
+async def test_batch_lookup_keys_by_requested_name(graph, monkeypatch):
+    import app.services.affinity_graph as graph_mod
+    from app.services.flavor_graph import get_affinities_for_ingredients
+
+    monkeypatch.setattr(graph_mod, "_graph", graph)
+    monkeypatch.setattr(graph_mod, "_checked_at", time.monotonic())
+    result = await get_affinities_for_ingredients(
+        None, ["LEMON", "yuzu", "thyme"], min_score=0.8, limit=5
+    )
+    assert list(result) == ["LEMON", "thyme"]
+    assert [a["ingredient_name"] for a in result["LEMON"]] == ["Chicken", "Thyme"]
+
+
+def test_pairing_paths_requires_all_starts(graph):
+    # Chicken pairs directly with both Lemon and Thyme; Butter only via a hop
+    results = graph.pairing_paths([1, 2], depth=1)
+    assert [r["ingredient_name"] for r in results] == ["Chicken"]
+    assert results[0]["score"] == pytest.approx(0.9 * 0.85)
+    assert results[0]["paths"] == {"Lemon": ["Lemon", "Chicken"], "Thyme": ["Thyme", "Chicken"]}
+
+
+def test_pairing_paths_multi_hop(graph):
+    results = graph.pairing_paths([2], depth=2, combine="min")
+    by_name = {r["ingredient_name"]: r for r in results}
+    # Thyme → Chicken → Butter scores min(0.85, 0.7)
+    assert by_name["Butter"]["score"] == pytest.approx(0.7)
+    assert by_name["Butter"]["paths"]["Thyme"] == ["Thyme", "Chicken", "Butter"]
+    assert "Thyme" not in by_name
+
+
+def test_pairing_paths_beam_and_min_score(graph):
+    assert graph.pairing_paths([2], depth=2, min_score=0.95) == []
+    # One neighbor per hop: Thyme → Chicken → Lemon; Butter is never expanded
+    narrow = graph.pairing_paths([2], depth=2, beam_width=1)
+    assert {r["ingredient_name"] for r in narrow} == {"Chicken", "Lemon"}
+    with pytest.raises(ValueError):
+        graph.pairing_paths([1], combine="sum")
+
+
+def test_complete_flavor_set(graph):
+    suggestions = graph.complete_flavor_set([1, 2])
+    assert suggestions == [
+        {"add": ["Chicken"], "score": 1.75},
+        {"add": ["Butter"], "score": 0.4},
+        # 1.75 + 0.4 + Chicken–Butter 0.7
+        {"add": ["Chicken", "Butter"], "score": 2.85},
+    ]
+
+
+def test_complete_flavor_set_no_affinities(graph):
+    assert graph.complete_flavor_set([5]) == []
+    assert graph.complete_flavor_set([]) == []
+
+
+@pytest.fixture
+def graph_cache(monkeypatch):
+    """Fake table version + builder behind get_affinity_graph; returns the build log."""
+    import app.services.affinity_graph as graph_mod
+
+    state = {"version": (1,), "builds": []}
+
+    async def table_version(session):
+        return state["version"]
+
+    async def build(session):
+        await asyncio.sleep(0.01)
+        state["builds"].append(state["version"])
+        return AffinityGraph({}, [], state["version"])
+
+    monkeypatch.setattr(graph_mod, "_graph", None)
+    monkeypatch.setattr(graph_mod, "_lock", asyncio.Lock())
+    monkeypatch.setattr(graph_mod, "_table_version", table_version)
+    monkeypatch.setattr(graph_mod, "build_affinity_graph", build)
+    monkeypatch.setattr(graph_mod.settings, "affinity_graph_check_seconds", 0.0)
+    return state
+
+
+async def test_concurrent_cold_calls_build_once(graph_cache, monkeypatch):
+    import app.services.affinity_graph as graph_mod
+
+    monkeypatch.setattr(graph_mod.settings, "affinity_graph_check_seconds", 60.0)
+    graphs = await asyncio.gather(*(graph_mod.get_affinity_graph(None) for _ in range(5)))
+    assert graph_cache["builds"] == [(1,)]
+    assert all(g is graphs[0] for g in graphs)
+
+
+async def test_reseed_in_another_process_reloads(graph_cache):
+    import app.services.affinity_graph as graph_mod
+
+    first = await graph_mod.get_affinity_graph(None)
+    assert await graph_mod.get_affinity_graph(None) is first
+
+    graph_cache["version"] = (2,)
+    assert (await graph_mod.get_affinity_graph(None)).version == (2,)
+    assert graph_cache["builds"] == [(1,), (2,)]
+
+
+async def test_bump_forces_a_check(graph_cache, monkeypatch):
+    import app.services.affinity_graph as graph_mod
+
+    monkeypatch.setattr(graph_mod.settings, "affinity_graph_check_seconds", 60.0)
+    await graph_mod.get_affinity_graph(None)
+    graph_cache["version"] = (2,)
+    assert (await graph_mod.get_affinity_graph(None)).version == (1,)
+
+    graph_mod.bump_affinity_version()
+    assert (await graph_mod.get_affinity_graph(None)).version == (2,)
@@ -0,0 +1,109 @@
+"""Unit tests for the pipeline stage DAG scheduler."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.agents.base import AgentContext, AgentTrace
+from app.agents.dag import Stage, run_dag, validate_stages
+from app.schemas.audit import AuditRequest
+
+
+class FakeSessions:
+    def __init__(self):
+        self.opened = 0
+
+    @asynccontextmanager
+    async def __call__(self):
+        self.opened += 1
+        yield object()
+
+
+def sleeper(name: str, seconds: float, log: list):
+    async def run(ctx, session):
+        log.append(f"start {name}")
+        await asyncio.sleep(seconds)
+        log.append(f"end {name}")
+    return run
+
+
+def rendezvous(name: str, mine: asyncio.Event, other: asyncio.Event, log: list):
+    """Finishes only if the ``other`` stage starts while this one is still running."""
+    async def run(ctx, session):
+        log.append(f"start {name}")
+        mine.set()
+        await asyncio.wait_for(other.wait(), timeout=1.0)
+        log.append(f"end {name}")
+    return run
+
+
+def make_ctx() -> AgentContext:
+    return AgentContext(audit_request=AuditRequest(ingredients=["lemon"]))
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently():
+    log: list[str] = []
+    sessions = FakeSessions()
+    a_started, b_started = asyncio.Event(), asyncio.Event()
+    stages = [
+        Stage("A", rendezvous("A", a_started, b_started, log),
+              provides=frozenset({"a"}), uses_db=True),
+        Stage("B", rendezvous("B", b_started, a_started, log),
+              provides=frozenset({"b"}), uses_db=True),
+        Stage("C", sleeper("C", 0.01, log), requires=frozenset({"a", "b"})),
+    ]
+    ctx = make_ctx()
+
+    # Each of A and B waits for the other to start, so this only completes if they overlap
+    await run_dag(stages, ctx, sessions)
+
+    assert log[:2] == ["start A", "start B"]
+    assert log[-2:] == ["start C", "end C"]
+    assert sessions.opened == 2
+    traces = {t.agent_name: t for t in ctx.trace}
+    assert traces["C"].started_ms >= max(traces["A"].finished_ms, traces["B"].finished_ms)
+
+
+@pytest.mark.asyncio
+async def test_agent_trace_gets_stage_offsets():
+    async def agent(ctx, session):
+        ctx.trace.append(AgentTrace("Auditor", "in", "out", latency_ms=3))
+
+    ctx = make_ctx()
+    await run_dag([Stage("Auditor", agent)], ctx, FakeSessions())
+
+    assert len(ctx.trace) == 1
+    assert ctx.trace[0].output_summary == "out"
+    assert ctx.trace[0].started_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_running_stages():
+    log: list[str] = []
+
+    async def boom(ctx, session):
+        raise RuntimeError("translator down")
+
+    stages = [
+        Stage("Slow", sleeper("Slow", 1.0, log), provides=frozenset({"x"})),
+        Stage("Boom", boom, provides=frozenset({"y"})),
+    ]
+    ctx = make_ctx()
+    with pytest.raises(RuntimeError, match="translator down"):
+        await run_dag(stages, ctx, FakeSessions())
+
+    assert log == ["start Slow"]
+    assert [t.error for t in ctx.trace if t.agent_name == "Boom"] == ["translator down"]
+
+
+def test_validate_rejects_missing_and_duplicate_outputs():
+    noop = sleeper("noop", 0, [])
+    with pytest.raises(ValueError, match="Unsatisfiable"):
+        validate_stages([Stage("A", noop, requires=frozenset({"missing"}))])
+    with pytest.raises(ValueError, match="re-provides"):
+        validate_stages([
+            Stage("A", noop, provides=frozenset({"x"})),
+            Stage("B", noop, provides=frozenset({"x"})),
+        ])
@@ -0,0 +1,110 @@
+"""Unit tests for the in-memory descriptor bitset index."""
+
+import pytest
+
+from app.services.descriptor_index import DescriptorIndex
+from tests.conftest import FakeSession
+
+
+@pytest.fixture
+def index():
+    ingredients = {
+        1: ("lemon", "Fruit"),
+        2: ("lime", "Fruit"),
+        3: ("orange", "Fruit"),
+        4: ("thyme", "Herb"),
+        5: ("dragonfruit", "Fruit"),
+    }
+    descriptors = {
+        1: {"citrus", "sour", "bright"},
+        2: {"citrus", "sour", "floral"},
+        3: {"citrus", "sweet"},
+        4: {"herbal", "earthy", "citrus"},
+    }
+    return DescriptorIndex(ingredients, descriptors)
+
+
+def test_vocabulary_is_sorted_union(index):
+    assert index.vocabulary == ["bright", "citrus", "earthy", "floral", "herbal", "sour", "sweet"]
+
+
+def test_same_category_ranking(index):
+    results = index.find_substitutes(1)
+    assert [r["ingredient_name"] for r in results] == ["lime", "orange", "dragonfruit"]
+    # lemon ∩ lime = {citrus, sour}, ∪ = 4 descriptors
+    assert results[0]["jaccard_score"] == 0.5
+    assert results[1]["jaccard_score"] == 0.25
+    assert results[2]["jaccard_score"] == 0.0
+
+
+def test_explicit_candidates_cross_category(index):
+    results = index.find_substitutes(1, candidate_ids=[4, 99])
+    assert results == [{"ingredient_id": 4, "ingredient_name": "thyme", "jaccard_score": 0.2}]
+
+
+def test_top_k_and_unknown_target(index):
+    assert len(index.find_substitutes(1, top_k=1)) == 1
+    assert index.find_substitutes(42) == []
+
+
+def test_wide_vocabulary_spans_multiple_words():
+    ingredients = {1: ("a", "X"), 2: ("b", "X")}
+    descriptors = {1: {f"d{i}" for i in range(100)}, 2: {f"d{i}" for i in range(50, 150)}}
+    index = DescriptorIndex(ingredients, descriptors)
+    # 50 shared out of 150 total
+    assert index.find_substitutes(1)[0]["jaccard_score"] == pytest.approx(0.333)
+
+
+@pytest.fixture
+def index_cache(monkeypatch):
+    """Fake table version + builder behind get_descriptor_index; returns the build log."""
+    import asyncio
+
+    import app.services.descriptor_index as index_mod
+
+    state = {"version": (1,), "builds": []}
+
+    async def version(session):
+        return state["version"]
+
+    async def build(session):
+        state["builds"].append(state["version"])
+        return DescriptorIndex({7: ("yuzu", "Fruit")}, {7: {"citrus"}}, state["version"])
+
+    monkeypatch.setattr(index_mod, "_index", None)
+    monkeypatch.setattr(index_mod, "_lock", asyncio.Lock())
+    monkeypatch.setattr(index_mod, "flavor_profiles_version", version)
+    monkeypatch.setattr(index_mod, "build_descriptor_index", build)
+    monkeypatch.setattr(index_mod.settings, "flavor_profiles_check_seconds", 0.0)
+    return state
+
+
+async def test_reseed_in_another_process_rebuilds(index_cache):
+    import app.services.descriptor_index as index_mod
+
+    first = await index_mod.get_descriptor_index(None)
+    assert await index_mod.get_descriptor_index(None) is first
+
+    index_cache["version"] = (2,)
+    assert (await index_mod.get_descriptor_index(None)).version == (2,)
+    assert index_cache["builds"] == [(1,), (2,)]
+
+
+async def test_version_is_not_rechecked_within_interval(index_cache, monkeypatch):
+    import app.services.descriptor_index as index_mod
+
+    monkeypatch.setattr(index_mod.settings, "flavor_profiles_check_seconds", 60.0)
+    await index_mod.get_descriptor_index(None)
+    index_cache["version"] = (2,)
+    assert (await index_mod.get_descriptor_index(None)).version == (1,)
+
+
+async def test_profiles_version_hashes_every_row():
+    import app.models.flavor_profile  # noqa: F401 — mapper configuration
+    from app.services.descriptor_index import flavor_profiles_version
+
+    session = FakeSession([(3, 9, -42)], [(3, 10, 7)])
+    assert await flavor_profiles_version(session) == (3, 9, -42, 3, 10, 7)
+    profiles, ingredients = session.sql()
+    assert "sum(hashtext(concat_ws(" in profiles and "flavor_profiles.intensity" in profiles
+    assert "ingredients.category" in ingredients
@@ -0,0 +1,91 @@
+"""Unit tests for the shared embedder and its micro-batching executor."""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.services.llm.embedding import EmbeddingBatcher
+
+
+class RecordingEncoder:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+        self.threads: set[str] = set()
+
+    def __call__(self, texts: list[str]):
+        self.calls.append(list(texts))
+        self.threads.add(threading.current_thread().name)
+        return np.array([[float(len(t))] for t in texts])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingBatcher(encoder, max_wait_ms=50)
+
+    results = await asyncio.gather(
+        batcher.embed(["a"]), batcher.embed(["bb", "ccc"]), batcher.embed(["dddd"])
+    )
+
+    assert results == [[[1.0]], [[2.0], [3.0]], [[4.0]]]
+    assert encoder.calls == [["a", "bb", "ccc", "dddd"]]
+    assert batcher.stats()["batches"] == 1
+    assert all(name.startswith("embed") for name in encoder.threads)
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_batches_split_at_max_batch_size():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingBatcher(encoder, max_batch_size=2, max_wait_ms=50)
+
+    await asyncio.gather(*(batcher.embed([str(i)]) for i in range(5)))
+
+    assert [len(c) for c in encoder.calls] == [2, 2, 1]
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_encode_errors_reach_every_caller():
+    def failing(texts):
+        raise RuntimeError("model exploded")
+
+    batcher = EmbeddingBatcher(failing, max_wait_ms=20)
+    results = await asyncio.gather(
+        batcher.embed(["a"]), batcher.embed(["b"]), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    await batcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_empty_input_skips_encode():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingBatcher(encoder)
+    assert await batcher.embed([]) == []
+    assert encoder.calls == []
+
+
+@pytest.mark.asyncio
+async def test_shared_embedder_loads_once_and_warms_up(monkeypatch):
+    from unittest.mock import MagicMock
+
+    import app.services.llm.embedding as embedding_mod
+
+    model = MagicMock()
+    loader = MagicMock(return_value=model)
+    monkeypatch.setattr(embedding_mod, "_embedder", None)
+    monkeypatch.setattr(embedding_mod, "_load_ms", None)
+    monkeypatch.setattr(embedding_mod, "_load_embedder", loader)
+
+    assert embedding_mod.embedder_status()["loaded"] is False
+    await embedding_mod.warm_up_embedder()
+    assert embedding_mod.get_embedder() is model
+
+    loader.assert_called_once()
+    model.encode.assert_called_once_with(["warm-up"], show_progress_bar=False)
+    status = embedding_mod.embedder_status()
+    assert status["loaded"] is True
+    assert status["load_ms"] is not None
@@ -0,0 +1,86 @@
+"""Unit tests for the query-embedding LRU/TTL cache."""
+
+import numpy as np
+import pytest
+
+from app.services.embedding_cache import EmbeddingCache, embed_query, normalize_query
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_normalize_query():
+    assert normalize_query("  Dish with  CHICKEN\tbreast ") == "dish with chicken breast"
+
+
+def test_hit_miss_and_normalized_key():
+    cache = EmbeddingCache()
+    assert cache.get("m", "Lemon chicken") is None
+    cache.put("m", "Lemon chicken", [0.1, 0.2])
+    vec = cache.get("m", "  lemon   CHICKEN ")
+    assert vec.dtype == np.float32
+    assert cache.get("other-model", "lemon chicken") is None
+    assert cache.stats() == {
+        "entries": 1, "hits": 1, "misses": 2, "evictions": 0, "hit_rate": 0.3333,
+    }
+
+
+def test_lru_eviction():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("m", "a", [1.0])
+    cache.put("m", "b", [2.0])
+    cache.get("m", "a")  # refresh "a"
+    cache.put("m", "c", [3.0])
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "a") is not None
+    assert cache.evictions == 1
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = EmbeddingCache(ttl_seconds=60, clock=clock)
+    cache.put("m", "a", [1.0])
+    clock.now += 61
+    assert cache.get("m", "a") is None
+    assert len(cache) == 0
+
+
+def test_save_and_load_round_trip(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "cache.npz"
+    cache = EmbeddingCache(ttl_seconds=60, clock=clock)
+    cache.put("m", "fresh", [1.0, 2.0])
+    clock.now -= 120
+    cache.put("m", "stale", [3.0, 4.0])
+    clock.now += 120
+    cache.save(path)
+
+    restored = EmbeddingCache(ttl_seconds=60, clock=clock)
+    assert restored.load(path) == 1
+    np.testing.assert_allclose(restored.get("m", "fresh"), [1.0, 2.0])
+    assert restored.get("m", "stale") is None
+
+
+@pytest.mark.asyncio
+async def test_embed_query_calls_llm_once(mock_llm, monkeypatch):
+    import app.services.embedding_cache as cache_mod
+
+    monkeypatch.setattr(cache_mod, "_cache", EmbeddingCache())
+    calls = []
+    original = mock_llm.embed
+
+    async def counting_embed(texts):
+        calls.append(texts)
+        return await original(texts)
+
+    mock_llm.embed = counting_embed
+    first = await embed_query(mock_llm, "Braised short ribs")
+    second = await embed_query(mock_llm, "braised short ribs")
+    assert first == second
+    assert len(first) == 384
+    assert calls == [["Braised short ribs"]]
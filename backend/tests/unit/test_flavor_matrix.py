@@ -0,0 +1,136 @@
+"""Unit tests for the dense intensity-weighted flavor matrix."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import flavor_graph, flavor_matrix
+from app.services.flavor_matrix import FlavorMatrix
+from tests.conftest import FakeSession
+
+
+@pytest.fixture
+def matrix():
+    ingredients = {
+        1: ("lemon", "Fruit"),
+        2: ("lime", "Fruit"),
+        3: ("orange", "Fruit"),
+    }
+    profiles = {
+        1: {"citrus": 0.9, "sour": 0.8},
+        2: {"citrus": 0.8, "sour": 0.9},
+        3: {"citrus": 0.6, "sweet": 0.7},
+    }
+    return FlavorMatrix(ingredients, profiles)
+
+
+def test_weighted_jaccard(matrix):
+    results = matrix.find_substitutes(1)
+    assert [r["ingredient_name"] for r in results] == ["lime", "orange"]
+    # Σmin / Σmax = (0.8 + 0.8) / (0.9 + 0.9)
+    assert results[0]["jaccard_score"] == pytest.approx(0.889, abs=1e-3)
+    # (0.6 + 0 + 0) / (0.9 + 0.8 + 0.7)
+    assert results[1]["jaccard_score"] == pytest.approx(0.25, abs=1e-3)
+
+
+def test_cosine(matrix):
+    results = matrix.find_substitutes(1, metric="cosine")
+    assert results[0]["ingredient_name"] == "lime"
+    assert results[0]["jaccard_score"] == pytest.approx(0.993, abs=1e-3)
+
+
+def test_unknown_metric(matrix):
+    with pytest.raises(ValueError):
+        matrix.find_substitutes(1, metric="euclidean")
+
+
+def test_upsert_updates_row_and_grows_vocabulary(matrix):
+    matrix.upsert(3, "orange", "Fruit", {"citrus": 0.9, "sour": 0.8, "bitter": 0.2})
+    assert "bitter" in matrix.vocabulary
+    assert matrix.find_substitutes(1)[0]["ingredient_name"] == "orange"
+
+    matrix.upsert(4, "yuzu", "Fruit", {"citrus": 0.9, "sour": 0.8})
+    assert matrix.find_substitutes(1, top_k=1)[0] == {
+        "ingredient_id": 4, "ingredient_name": "yuzu", "jaccard_score": 1.0,
+    }
+
+
+def test_remove(matrix):
+    matrix.remove(2)
+    assert 2 not in matrix
+    assert [r["ingredient_id"] for r in matrix.find_substitutes(1)] == [3]
+    assert matrix.find_substitutes(3)[0]["ingredient_id"] == 1
+
+
+async def test_profile_change_moves_matrix(matrix, monkeypatch):
+    refreshed = []
+
+    async def refresh_neighbors(session, ingredient_ids):
+        refreshed.append(ingredient_ids)
+
+    monkeypatch.setattr(flavor_matrix, "_matrix", matrix)
+    monkeypatch.setattr(flavor_graph, "refresh_substitute_neighbors", refresh_neighbors)
+    assert matrix.find_substitutes(1)[0]["ingredient_name"] == "lime"
+
+    # Orange's profile now matches lemon's exactly
+    session = FakeSession(
+        [SimpleNamespace(id=3, name="orange", category="Fruit")],
+        [
+            SimpleNamespace(ingredient_id=3, descriptor="citrus", intensity=0.9),
+            SimpleNamespace(ingredient_id=3, descriptor="sour", intensity=0.8),
+        ],
+    )
+    await flavor_graph.flavor_profiles_changed(session, [3])
+
+    assert matrix.find_substitutes(1)[0] == {
+        "ingredient_id": 3, "ingredient_name": "orange", "jaccard_score": 1.0,
+    }
+    assert refreshed == [[3]]
+
+
+async def test_reseed_in_another_process_upserts_changed_rows(matrix, monkeypatch):
+    import asyncio
+
+    state = {"version": (2,), "digests": {1: "a", 2: "b", 3: "c2"}}
+
+    async def version(session):
+        return state["version"]
+
+    async def digests(session):
+        return state["digests"]
+
+    matrix.version, matrix.digests = (1,), {1: "a", 2: "b", 3: "c"}
+    monkeypatch.setattr(flavor_matrix, "_matrix", matrix)
+    monkeypatch.setattr(flavor_matrix, "_checked_at", 0.0)
+    monkeypatch.setattr(flavor_matrix, "_lock", asyncio.Lock())
+    monkeypatch.setattr(flavor_matrix, "flavor_profiles_version", version)
+    monkeypatch.setattr(flavor_matrix, "_row_digests", digests)
+    monkeypatch.setattr(flavor_matrix.settings, "flavor_profiles_check_seconds", 0.0)
+
+    # The seed runner rewrote orange's profile; this process never heard about it
+    session = FakeSession(
+        [SimpleNamespace(id=3, name="orange", category="Fruit")],
+        [
+            SimpleNamespace(ingredient_id=3, descriptor="citrus", intensity=0.9),
+            SimpleNamespace(ingredient_id=3, descriptor="sour", intensity=0.8),
+        ],
+    )
+    assert await flavor_matrix.get_flavor_matrix(session) is matrix
+    assert matrix.find_substitutes(1)[0]["ingredient_name"] == "orange"
+    assert matrix.version == (2,)
+    # Only the changed ingredient was reloaded
+    assert [list(stmt.compile().params.values()) for stmt in session.statements] == [[[3]], [[3]]]
+
+    # Unchanged version: no reload
+    session = FakeSession()
+    await flavor_matrix.get_flavor_matrix(session)
+    assert session.statements == []
+
+
+async def test_row_digests_cover_name_category_and_profiles():
+    session = FakeSession([SimpleNamespace(id=1, digest="abc")])
+    assert await flavor_matrix._row_digests(session) == {1: "abc"}
+    (sql,) = session.sql()
+    assert "md5(concat_ws(" in sql and "ingredients.category" in sql
+    assert "string_agg(concat_ws(" in sql and "ORDER BY flavor_profiles.descriptor" in sql
+    assert "LEFT OUTER JOIN flavor_profiles" in sql
@@ -0,0 +1,176 @@
+"""Unit tests for the streaming knowledge ingest helpers."""
+
+import os
+
+import pytest
+
+import seed.ingest_knowledge as ingest_mod
+from app.services.knowledge_base import content_hash
+from seed.ingest_knowledge import (
+    MANIFEST_NAME,
+    batched,
+    chunk_markdown,
+    estimate_tokens,
+    iter_chunks,
+    load_manifest,
+    save_manifest,
+    scan_files,
+)
+
+
+def test_iter_chunks_tags_source_and_hash(tmp_path):
+    (tmp_path / "sauces.md").write_text("# Beurre Monté\nWhisk butter into water.\n")
+    (tmp_path / "eggs.md").write_text("Intro.\n\n## Poaching\nSwirl the water.\n")
+
+    chunks = list(iter_chunks(tmp_path, sorted(tmp_path.glob("*.md"))))
+
+    assert [(c["source_file"], c["heading"]) for c in chunks] == [
+        ("eggs.md", "eggs — preamble"),
+        ("eggs.md", "Poaching"),
+        ("sauces.md", "Beurre Monté"),
+    ]
+    assert all(c["content_hash"] == content_hash(c["body"]) for c in chunks)
+
+
+async def test_same_named_files_in_subdirectories_stay_distinct(tmp_path, monkeypatch):
+    (tmp_path / "french").mkdir()
+    (tmp_path / "italian").mkdir()
+    (tmp_path / "french" / "sauces.md").write_text("# Velouté\nThicken stock with roux.\n")
+    (tmp_path / "italian" / "sauces.md").write_text("# Pomodoro\nSimmer tomatoes.\n")
+
+    inserted, stale = [], []
+
+    async def new_chunks(batch, seen):
+        return batch
+
+    async def insert_chunks(chunks, vectors):
+        inserted.extend(chunks)
+
+    async def delete_stale(by_file):
+        stale.append(by_file)
+        return 0
+
+    monkeypatch.setattr(ingest_mod, "_new_chunks", new_chunks)
+    monkeypatch.setattr(ingest_mod, "_insert_chunks", insert_chunks)
+    monkeypatch.setattr(ingest_mod, "_delete_stale", delete_stale)
+    monkeypatch.setattr(ingest_mod, "embed_texts", lambda texts: [[0.0]] * len(texts))
+
+    await ingest_mod.ingest(tmp_path, workers=1)
+    assert sorted(c["source_file"] for c in inserted) == ["french/sauces.md", "italian/sauces.md"]
+    assert set(stale[0]) == {"french/sauces.md", "italian/sauces.md"}
+
+    # Removing one only clears that file's chunks
+    (tmp_path / "italian" / "sauces.md").unlink()
+    await ingest_mod.ingest(tmp_path, workers=1)
+    assert stale[1] == {"italian/sauces.md": []}
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    """In-memory culinary_embeddings knowledge rows as (source_file, content_hash) pairs."""
+    rows: set[tuple[str, str]] = set()
+
+    async def stored_chunks(batch):
+        return {(c["source_file"], c["content_hash"]) for c in batch} & rows
+
+    async def insert_chunks(chunks, vectors):
+        rows.update((c["source_file"], c["content_hash"]) for c in chunks)
+
+    async def delete_stale(by_file):
+        gone = {(f, h) for f, h in rows if f in by_file and h not in by_file[f]}
+        rows.difference_update(gone)
+        return len(gone)
+
+    monkeypatch.setattr(ingest_mod, "_stored_chunks", stored_chunks)
+    monkeypatch.setattr(ingest_mod, "_insert_chunks", insert_chunks)
+    monkeypatch.setattr(ingest_mod, "_delete_stale", delete_stale)
+    monkeypatch.setattr(ingest_mod, "embed_texts", lambda texts: [[0.0]] * len(texts))
+    return rows
+
+
+async def test_moving_a_file_keeps_its_chunks(tmp_path, stored):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "sauces.md").write_text("# Velouté\nThicken stock with roux.\n")
+    await ingest_mod.ingest(tmp_path, workers=1)
+    assert {f for f, _ in stored} == {"a/sauces.md"}
+
+    # Same stem, same body, same hash — only the directory changed
+    (tmp_path / "a" / "sauces.md").rename(tmp_path / "b" / "sauces.md")
+    assert await ingest_mod.ingest(tmp_path, workers=1) == 1
+    assert {f for f, _ in stored} == {"b/sauces.md"}
+
+
+async def test_same_stem_files_sharing_a_section_both_keep_it(tmp_path, stored):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "sauces.md").write_text("# Roux\nCook flour in butter.\n")
+    (tmp_path / "b" / "sauces.md").write_text(
+        "# Roux\nCook flour in butter.\n\n# Gravy\nWhisk in stock.\n"
+    )
+    assert await ingest_mod.ingest(tmp_path, workers=1) == 3
+
+    (tmp_path / "a" / "sauces.md").unlink()
+    await ingest_mod.ingest(tmp_path, workers=1)
+    assert sorted(f for f, _ in stored) == ["b/sauces.md", "b/sauces.md"]
+
+
+def test_batched():
+    assert [len(b) for b in batched(({"i": i} for i in range(5)), 2)] == [2, 2, 1]
+
+
+def test_scan_files_detects_changes(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    kept, edited, touched = docs / "kept.md", docs / "edited.md", docs / "touched.md"
+    for f in (kept, edited, touched):
+        f.write_text(f"# {f.stem}\nbody\n")
+
+    changed, unchanged = scan_files(docs, sorted(docs.glob("*.md")), {})
+    assert set(changed) == {kept, edited, touched}
+    assert unchanged == {}
+
+    manifest_path = docs / MANIFEST_NAME
+    save_manifest(
+        manifest_path,
+        {f.relative_to(docs).as_posix(): {**e, "chunks": []} for f, e in changed.items()},
+    )
+    manifest = load_manifest(manifest_path)
+
+    edited.write_text("# edited\nnew body\n")
+    os.utime(touched, (0, 12345))
+
+    changed, unchanged = scan_files(docs, sorted(docs.glob("*.md")), manifest)
+    assert list(changed) == [edited]
+    assert set(unchanged) == {"kept.md", "touched.md"}
+    assert unchanged["touched.md"]["mtime"] == 12345
+
+
+def test_load_manifest_tolerates_missing_or_corrupt(tmp_path):
+    path = tmp_path / MANIFEST_NAME
+    assert load_manifest(path) == {}
+    path.write_text("{not json")
+    assert load_manifest(path) == {}
+
+
+def test_chunks_respect_budget_and_overlap():
+    sentences = " ".join(f"Step {i} whisks cold butter into the emulsion." for i in range(40))
+    text = f"# Sauces\n## Beurre Monté\n{sentences}\n### Holding\nKeep it below 85C.\n"
+
+    chunks = chunk_markdown(text, "sauces", max_tokens=60, overlap=20)
+    monte = [c for c in chunks if c["heading"] == "Beurre Monté"]
+
+    assert len(monte) > 1
+    assert all(estimate_tokens(c["body"]) <= 60 for c in chunks)
+    assert all(c["body"].startswith("sauces > Sauces > Beurre Monté\n\n") for c in monte)
+    # Consecutive windows share their boundary sentence(s)
+    first_tail = monte[0]["body"].rsplit(". ", 1)[-1]
+    assert first_tail in monte[1]["body"]
+    assert chunks[-1]["heading_path"] == "sauces > Sauces > Beurre Monté > Holding"
+
+
+def test_overlong_sentence_is_split_into_word_windows():
+    text = "# Stock\n" + " ".join(["simmer"] * 500)
+    chunks = chunk_markdown(text, "stocks", max_tokens=100, overlap=0)
+    assert len(chunks) >= 5
+    assert all(estimate_tokens(c["body"]) <= 100 for c in chunks)
@@ -0,0 +1,48 @@
+"""Unit tests for hybrid knowledge search statement construction."""
+
+from types import SimpleNamespace
+
+from app.services import knowledge_base
+from app.services.knowledge_base import _hybrid_sql
+from tests.conftest import FakeSession
+
+
+def test_hybrid_sql_without_filter():
+    sql = str(_hybrid_sql(""))
+    assert "WHERE text_search @@ tsq.q" in sql
+    # Both legs are capped and fused by reciprocal rank
+    assert sql.count("LIMIT :candidates") == 2
+    assert "sum(1.0 / (:rrf_k + rank))" in sql
+    assert "ORDER BY fused.rrf_score DESC" in sql
+
+
+def test_hybrid_sql_applies_filter_to_both_legs():
+    sql = str(_hybrid_sql("WHERE content_type = :content_type"))
+    assert sql.count("WHERE content_type = :content_type") == 2
+    assert "WHERE content_type = :content_type AND text_search @@ tsq.q" in sql
+
+
+async def test_hybrid_search_binds_every_parameter(monkeypatch):
+    async def embed_query(llm, query):
+        return [0.1, 0.2]
+
+    async def apply_search_settings(session):
+        pass
+
+    monkeypatch.setattr(knowledge_base, "embed_query", embed_query)
+    monkeypatch.setattr(knowledge_base, "apply_search_settings", apply_search_settings)
+    monkeypatch.setattr(knowledge_base.settings, "hybrid_candidates", 20)
+
+    row = SimpleNamespace(
+        id=1, content_type="technique", source_table="t", text_content="Sear",
+        metadata=None, similarity=0.91234,
+    )
+    session = FakeSession([row])
+    results = await knowledge_base.search_knowledge(
+        session, None, "sear scallops", content_type="technique", top_k=30, mode="hybrid"
+    )
+    assert results[0]["similarity"] == 0.9123
+    (stmt,), (params,) = session.statements, session.params
+    assert set(stmt.compile().params) == set(params)
+    assert params["candidates"] == 30
+    assert params["query"] == "sear scallops"
@@ -0,0 +1,176 @@
+"""Unit tests for the exact-match LLM response cache."""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.config import Settings
+from app.services.llm.cache import (
+    CachingLLMService,
+    MemoryLLMCache,
+    PostgresLLMCache,
+    SqliteLLMCache,
+    decode_response,
+    encode_response,
+    llm_cache_key,
+)
+
+
+class Dish(BaseModel):
+    name: str
+    steps: list[str]
+
+
+class CountingLLM:
+    _model = "test-model"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, system_prompt, user_prompt, response_model=None,
+                       temperature=0.7, max_tokens=4096):
+        self.calls += 1
+        if response_model is None:
+            return f"text for {user_prompt}"
+        return response_model(name=user_prompt, steps=["sear", "rest"])
+
+    async def check_connectivity(self):
+        return True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_key_covers_schema_and_params():
+    base = llm_cache_key("m", "sys", "user", Dish, 0.7, 4096)
+    assert base == llm_cache_key("m", "sys", "user", Dish, 0.7, 4096)
+    assert base != llm_cache_key("m", "sys", "user", None, 0.7, 4096)
+    assert base != llm_cache_key("m", "sys", "user", Dish, 0.2, 4096)
+    assert base != llm_cache_key("other", "sys", "user", Dish, 0.7, 4096)
+
+
+@pytest.mark.asyncio
+async def test_hit_returns_validated_copy():
+    inner = CountingLLM()
+    llm = CachingLLMService(inner, MemoryLLMCache())
+
+    first = await llm.generate("sys", "chicken", response_model=Dish)
+    first.steps.append("mutated by caller")
+    second = await llm.generate("sys", "chicken", response_model=Dish)
+
+    assert inner.calls == 1
+    assert isinstance(second, Dish)
+    assert second.steps == ["sear", "rest"]
+    assert llm.cache_stats()["hits"] == 1
+    # Delegated attributes of the wrapped service
+    assert llm._model == "test-model"
+    assert await llm.check_connectivity() is True
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_ttl_and_lru():
+    clock = FakeClock()
+    cache = MemoryLLMCache(max_entries=2, ttl_seconds=60, clock=clock)
+    await cache.set("a", "A")
+    await cache.set("b", "B")
+    await cache.get("a")
+    await cache.set("c", "C")
+    assert await cache.get("b") is None
+    assert await cache.get("a") == "A"
+    clock.now += 61
+    assert await cache.get("a") is None
+
+
+def test_encoded_responses_round_trip():
+    dish = Dish(name="soup", steps=["simmer"])
+    assert decode_response(encode_response(dish), Dish) == dish
+    assert decode_response(encode_response("plain text"), None) == "plain text"
+    # Stored for another response model (or for text) — treated as a miss
+    assert decode_response(encode_response(dish), None) is None
+    assert decode_response(encode_response("plain text"), Dish) is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_persists_instances(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    clock = FakeClock()
+    cache = SqliteLLMCache(path, max_entries=2, ttl_seconds=60, clock=clock)
+    await cache.set("dish", Dish(name="soup", steps=["simmer"]))
+    await cache.aclose()
+
+    reopened = SqliteLLMCache(path, max_entries=2, ttl_seconds=60, clock=clock)
+    assert decode_response(await reopened.get("dish"), Dish) == Dish(name="soup", steps=["simmer"])
+    clock.now += 1
+    await reopened.set("b", "B")
+    clock.now += 1
+    await reopened.set("c", "C")
+    assert await reopened.get("dish") is None  # evicted as least recently used
+    clock.now += 120
+    assert await reopened.get("c") is None  # expired
+    await reopened.aclose()
+
+
+def test_factory_wraps_when_enabled():
+    import app.services.llm.factory as factory_mod
+
+    factory_mod._instance = None
+    try:
+        svc = factory_mod.get_llm_service(Settings(
+            database_url="postgresql+asyncpg://x:x@localhost/x",
+            llm_model="qwen2.5",
+            llm_cache_backend="memory",
+        ))
+        assert isinstance(svc, CachingLLMService)
+        assert svc._model == "qwen2.5"
+    finally:
+        factory_mod._instance = None
+
+
+async def test_persistent_hit_is_rebuilt_from_json(tmp_path):
+    inner = CountingLLM()
+    llm = CachingLLMService(inner, SqliteLLMCache(str(tmp_path / "llm.sqlite3")))
+
+    first = await llm.generate("sys", "chicken", response_model=Dish)
+    second = await llm.generate("sys", "chicken", response_model=Dish)
+    text = [await llm.generate("sys", "stock") for _ in range(2)]
+
+    assert inner.calls == 2
+    assert second == first and second is not first
+    assert text == ["text for stock"] * 2
+    await llm.aclose()
+
+
+async def test_postgres_hit_only_touches_stale_rows():
+    accessed = {"at": datetime.now(UTC)}
+    updates = []
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def begin(self):
+            return self
+
+        async def execute(self, stmt):
+            if stmt.is_select:
+                row = SimpleNamespace(value=b"\n\"hi\"", accessed_at=accessed["at"])
+                return SimpleNamespace(first=lambda: row)
+            updates.append(stmt)
+
+    cache = PostgresLLMCache(FakeSession, touch_seconds=60)
+    assert await cache.get("k") == b'\n"hi"'
+    assert updates == []
+
+    accessed["at"] -= timedelta(seconds=61)
+    await cache.get("k")
+    assert len(updates) == 1
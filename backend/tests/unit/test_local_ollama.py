@@ -167,7 +167,8 @@ async def test_check_connectivity_success():
 
         assert await svc.check_connectivity() is True
 
-    mock_client.get.assert_called_once_with("http://localhost:11434/api/tags")
+    mock_client.get.assert_called_once()
+    assert mock_client.get.call_args[0][0] == "http://localhost:11434/api/tags"
 
 
 @pytest.mark.asyncio
@@ -184,6 +185,55 @@ async def test_check_connectivity_failure():
         assert await svc.check_connectivity() is False
 
 
+# ---------------------------------------------------------------------------
+# Pooled client
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_across_calls_and_closed():
+    svc = _make_service()
+
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"response": "ok"}
+    mock_response.raise_for_status = MagicMock()
+    mock_response.status_code = 200
+
+    with patch("app.services.llm.local.httpx.AsyncClient") as MockClient:
+        mock_client = AsyncMock()
+        mock_client.post.return_value = mock_response
+        mock_client.get.return_value = mock_response
+        MockClient.return_value = mock_client
+
+        await svc.generate("sys", "one")
+        await svc.generate("sys", "two")
+        await svc.check_connectivity()
+        await svc.aclose()
+
+    MockClient.assert_called_once()
+    assert mock_client.post.call_count == 2
+    mock_client.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_connection_stats_count_reuse():
+    svc = _make_service()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"response": "ok"}))
+    svc._client = httpx.AsyncClient(
+        transport=transport, event_hooks={"request": [svc._on_request]}
+    )
+
+    for _ in range(3):
+        await svc.generate("sys", "prompt")
+    # MockTransport opens no sockets; simulate the pool's single connect
+    await svc._trace("connection.connect_tcp.complete", {})
+
+    assert svc.connection_stats() == {
+        "requests": 3, "connections_opened": 1, "reused": 2, "reuse_rate": 0.6667,
+    }
+    await svc.aclose()
+
+
 # ---------------------------------------------------------------------------
 # embed
 # ---------------------------------------------------------------------------
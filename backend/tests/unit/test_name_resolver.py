@@ -0,0 +1,61 @@
+"""Unit tests for bulk name resolution and its reuse by the Translator."""
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.models.flavor_profile  # noqa: F401  (configures Ingredient's relationship)
+from app.agents.base import AgentContext
+from app.agents.translator import run_translator
+from app.models.ingredient import Ingredient
+from app.schemas.audit import AuditRequest
+from app.services.name_resolver import resolve_names, resolve_names_stmt
+
+
+def test_resolver_binds_all_names_as_one_array():
+    sql = str(resolve_names_stmt(Ingredient, ["lemon", "thyme"]).compile(
+        dialect=postgresql.dialect()
+    ))
+    assert "lower(ingredients.name) = ANY (%(names)s::VARCHAR[])" in sql
+
+
+@pytest.mark.asyncio
+async def test_resolver_skips_query_for_no_names():
+    assert await resolve_names(None, Ingredient, ["", ""]) == {}
+
+
+class RecordingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def scalars(self, stmt):
+        self.statements.append(stmt)
+        return self.rows
+
+
+@pytest.mark.asyncio
+async def test_translator_scaling_reuses_auditor_rows(mock_llm):
+    rows = {
+        "chicken breast": Ingredient(name="chicken breast", category="poultry"),
+        "lemon": Ingredient(name="lemon", category="citrus", is_potent=False),
+    }
+    session = RecordingSession([
+        Ingredient(name="Thyme", category="herb", is_potent=True,
+                   scaling_exponent=0.8, safety_ceiling=None),
+    ])
+    ctx = AgentContext(
+        audit_request=AuditRequest(ingredients=["chicken breast", "lemon"], guest_count=8),
+        affinities_text=[],
+        flavor_set_suggestions=[],
+        knowledge_text="",
+        ingredient_rows=rows,
+    )
+
+    await run_translator(ctx, session, mock_llm)
+
+    # Only the LLM-added ingredients are resolved, in a single query
+    assert len(session.statements) == 1
+    assert session.statements[0].compile().params["names"] == ["butter", "thyme"]
+    scaled = {i.name: i for i in ctx.ingredients_list}
+    assert scaled["lemon"].amount_grams == 120
+    assert scaled["thyme"].scaling_notes.startswith("Scaled")
@@ -0,0 +1,41 @@
+"""Unit tests for the incremental JSON parser behind plan streaming."""
+
+import json
+
+from app.services.partial_json import PartialJSONParser
+
+DOC = {
+    "dish_name": 'Lemon "Thyme" Chicken',
+    "ingredients": [
+        {"name": "chicken", "amount_grams": 350.5, "original_amount": "2 breasts"},
+        {"name": "lemon", "amount_grams": 60, "original_amount": "1"},
+    ],
+    "difficulty": "Intermediate",
+    "flags": [True, False, None],
+}
+
+
+def test_every_prefix_parses():
+    text = "```json\n" + json.dumps(DOC, indent=2) + "\n```"
+    for i in range(text.index("{") + 1, len(text) + 1):
+        value = PartialJSONParser().feed(text[:i])
+        assert isinstance(value, dict), text[:i]
+
+
+def test_open_string_value_is_closed_in_place():
+    parser = PartialJSONParser()
+    assert parser.feed('{"dish_name": "Lemon Th') == {"dish_name": "Lemon Th"}
+    # Unfinished keys, numbers and literals fall back to the last complete element
+    assert parser.feed('yme", "serv') == {"dish_name": "Lemon Thyme"}
+    assert parser.feed('es": 1') == {"dish_name": "Lemon Thyme"}
+    assert parser.feed('2, "ok": tr') == {"dish_name": "Lemon Thyme", "serves": 12}
+
+
+def test_chunked_feed_matches_full_document():
+    text = json.dumps(DOC)
+    parser = PartialJSONParser()
+    for i in range(0, len(text), 7):
+        parser.feed(text[i:i + 7])
+    assert parser.complete
+    assert parser.value() == DOC
+    assert parser.feed(" trailing prose") == DOC
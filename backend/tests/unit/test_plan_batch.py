@@ -0,0 +1,142 @@
+"""Unit tests for batch plan generation and the shared Auditor catalog."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.agents import orchestrator
+from app.agents.auditor import AuditCatalog, run_audit
+from app.agents.base import AgentContext
+from app.models.equipment import Equipment
+from app.models.ingredient import Ingredient
+from app.models.plan_history import PlanHistory
+from app.schemas.audit import AuditRequest
+from app.schemas.plan import ExecutionPlan
+
+
+@pytest.mark.asyncio
+async def test_run_audit_with_catalog_issues_no_queries():
+    catalog = AuditCatalog(
+        equipment={"anova": Equipment(name="Anova", category="x", capabilities=["can_sous_vide"])},
+        ingredients={"lemon": Ingredient(name="lemon", category="citrus")},
+    )
+    ctx = AgentContext(audit_request=AuditRequest(
+        ingredients=["Lemon", "yuzu kosho"], equipment=["anova", "cast iron skillet"],
+    ))
+
+    await run_audit(ctx, None, catalog)
+
+    assert ctx.constraints.can_sous_vide and ctx.constraints.can_sear_high_heat
+    assert [f for f in ctx.flags if "not in database" in f] == [
+        "Ingredient 'yuzu kosho' not in database — will use LLM knowledge"
+    ]
+
+
+class FakeSession:
+    """Commits fail while a plan named in ``rejected`` is pending."""
+
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.pending = []
+        self.added = []
+        self.commits = 0
+
+    def add(self, row):
+        self.pending.append(row)
+
+    def add_all(self, rows):
+        self.pending.extend(rows)
+
+    async def commit(self):
+        if any(r.execution_plan["dish_name"] in self.rejected for r in self.pending):
+            raise RuntimeError("value too long for type character varying(100)")
+        self.added.extend(self.pending)
+        self.pending = []
+        self.commits += 1
+
+    async def rollback(self):
+        self.pending = []
+
+
+def plan(name: str) -> ExecutionPlan:
+    return ExecutionPlan(
+        dish_name=name, dish_description="", serves=2, total_time_minutes=30,
+        active_time_minutes=20, difficulty="Intermediate", ingredients=[],
+        substitution_notes=[], timeline=[], chefs_secrets=[],
+    )
+
+
+def record(name: str) -> tuple[PlanHistory, ExecutionPlan]:
+    generated = plan(name)
+    return PlanHistory(id=uuid.uuid4(), execution_plan=generated.model_dump()), generated
+
+
+@pytest.fixture
+def fake_generation(monkeypatch):
+    async def load(session, equipment, ingredients):
+        return AuditCatalog(equipment={}, ingredients={})
+
+    async def build(request, llm, session_factory, catalog=None):
+        return record(request.intent)
+
+    monkeypatch.setattr(orchestrator, "load_audit_catalog", load)
+    monkeypatch.setattr(orchestrator, "build_plan_record", build)
+
+
+@pytest.mark.asyncio
+async def test_batch_shares_catalog_and_inserts_once(monkeypatch):
+    shared = AuditCatalog(equipment={}, ingredients={})
+    loads = []
+    running = 0
+    peak = 0
+
+    async def load(session, equipment, ingredients):
+        loads.append((sorted(equipment), sorted(ingredients)))
+        return shared
+
+    async def build(request, llm, session_factory, catalog=None):
+        nonlocal running, peak
+        assert catalog is shared
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if request.intent == "fail":
+            raise RuntimeError("translator down")
+        return record(request.intent)
+
+    monkeypatch.setattr(orchestrator, "load_audit_catalog", load)
+    monkeypatch.setattr(orchestrator, "build_plan_record", build)
+
+    requests = [
+        AuditRequest(ingredients=["Lemon", "chicken"], equipment=["oven"], intent="a"),
+        AuditRequest(ingredients=["chicken", "lemon"], equipment=["Oven"], intent="A"),
+        AuditRequest(ingredients=["leek"], intent="fail"),
+        AuditRequest(ingredients=["rice"], intent="b"),
+        AuditRequest(ingredients=["egg"], intent="c"),
+    ]
+    session = FakeSession()
+    results = await orchestrator.run_pipeline_batch(requests, session, object(), max_concurrency=2)
+
+    assert len(loads) == 1
+    assert peak == 2
+    # Canonically identical requests still get a plan each
+    assert [r[1].dish_name for r in results[:2]] == ["a", "A"]
+    assert results[0][0] != results[1][0]
+    assert isinstance(results[2], RuntimeError)
+    assert [r[1].dish_name for r in results[3:]] == ["b", "c"]
+    assert session.commits == 1
+    assert len(session.added) == 4
+
+
+async def test_failed_batch_commit_falls_back_to_per_item_inserts(fake_generation):
+    requests = [AuditRequest(ingredients=[name], intent=name) for name in ("a", "bad", "c")]
+    session = FakeSession(rejected={"bad"})
+
+    results = await orchestrator.run_pipeline_batch(requests, session, object())
+
+    assert [r[1].dish_name for r in (results[0], results[2])] == ["a", "c"]
+    assert isinstance(results[1], RuntimeError)
+    assert [r.execution_plan["dish_name"] for r in session.added] == ["a", "c"]
+
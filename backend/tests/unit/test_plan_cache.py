@@ -0,0 +1,112 @@
+"""Unit tests for plan-cache request canonicalization and lookup."""
+
+import uuid
+from types import SimpleNamespace
+
+from app.api.v1.plans import _cached_plan
+from app.schemas.audit import AuditRequest
+from app.schemas.plan import ExecutionPlan
+from app.services import plan_cache
+from app.services.plan_cache import canonicalize_request, plan_cache_keys
+from tests.conftest import FakeSession
+
+
+def test_canonical_form_ignores_order_case_and_duplicates():
+    a = AuditRequest(
+        ingredients=["Chicken Breast", "lemon", " thyme "],
+        equipment=["Cast Iron Skillet", "oven"],
+        user_skill="Home Cook",
+    )
+    b = AuditRequest(
+        ingredients=["thyme", "LEMON", "chicken  breast", "lemon"],
+        equipment=["Oven", "cast iron skillet"],
+        user_skill="Home Cook",
+    )
+    assert canonicalize_request(a) == {
+        "ingredients": ["chicken breast", "lemon", "thyme"],
+        "equipment": ["cast iron skillet", "oven"],
+        "skill_tier": 1,
+        "time_limit_minutes": 120,
+        "guest_count": 2,
+        "intent": None,
+    }
+    assert plan_cache_keys(a) == plan_cache_keys(b)
+
+
+def test_constraint_hash_separates_hard_constraints():
+    base = AuditRequest(ingredients=["lemon", "chicken breast"], equipment=["oven"])
+    one_more = base.model_copy(update={"ingredients": ["lemon", "chicken breast", "salt"]})
+    more_guests = base.model_copy(update={"guest_count": 6})
+
+    assert plan_cache_keys(base).request_hash != plan_cache_keys(one_more).request_hash
+    # Same hard constraints — eligible for the similarity fallback
+    assert plan_cache_keys(base).constraint_hash == plan_cache_keys(one_more).constraint_hash
+    assert plan_cache_keys(base).constraint_hash != plan_cache_keys(more_guests).constraint_hash
+
+
+def plan_json(name: str) -> dict:
+    return ExecutionPlan(
+        dish_name=name, dish_description="", serves=2, total_time_minutes=30,
+        active_time_minutes=20, difficulty="Intermediate", ingredients=[], timeline=[],
+    ).model_dump()
+
+
+def lookup_session(exact=None, similar=()) -> FakeSession:
+    """Answers the exact-hash query with ``exact`` and the similarity query with ``similar``."""
+    return FakeSession([exact] if exact else [], list(similar))
+
+
+def candidate(name: str, request: AuditRequest, distance: float = 0.01):
+    return SimpleNamespace(
+        id=uuid.uuid4(), execution_plan=plan_json(name),
+        audit_request=request.model_dump(), distance=distance,
+    )
+
+
+async def fake_embed(llm, text):
+    return [0.0] * 3
+
+
+async def test_lookup_exact_hit_skips_similarity(monkeypatch):
+    monkeypatch.setattr(plan_cache, "embed_query", fake_embed)
+    row = SimpleNamespace(id=uuid.uuid4(), execution_plan=plan_json("Roast"))
+    session = lookup_session(exact=row)
+
+    hit = await plan_cache.lookup_cached_plan(session, None, AuditRequest(ingredients=["lemon"]))
+    assert hit == (str(row.id), ExecutionPlan.model_validate(plan_json("Roast")))
+    assert len(session.statements) == 1
+
+
+async def test_similar_plan_must_use_only_requested_ingredients(monkeypatch):
+    monkeypatch.setattr(plan_cache, "embed_query", fake_embed)
+    monkeypatch.setattr(plan_cache.settings, "plan_cache_similarity_threshold", 0.9)
+    request = AuditRequest(ingredients=["Lemon", "chicken breast", "thyme"], equipment=["oven"])
+    needs_saffron = candidate("Saffron chicken", request.model_copy(
+        update={"ingredients": ["lemon", "chicken breast", "saffron"]}
+    ))
+    subset = candidate("Lemon chicken", request.model_copy(
+        update={"ingredients": ["lemon", "chicken breast"]}
+    ), distance=0.05)
+    session = lookup_session(similar=[needs_saffron, subset])
+
+    hit = await plan_cache.lookup_cached_plan(session, None, request)
+    assert hit[0] == str(subset.id)
+    assert hit[1].dish_name == "Lemon chicken"
+
+
+async def test_similar_plan_must_match_constraints(monkeypatch):
+    monkeypatch.setattr(plan_cache, "embed_query", fake_embed)
+    monkeypatch.setattr(plan_cache.settings, "plan_cache_similarity_threshold", 0.9)
+    request = AuditRequest(ingredients=["lemon", "chicken breast"], equipment=["oven"])
+    # constraint_hash is only a hash; the stored request is compared field by field
+    other = candidate("Roast", request.model_copy(update={"guest_count": 8}))
+
+    session = lookup_session(similar=[other])
+    assert await plan_cache.lookup_cached_plan(session, None, request) is None
+
+
+async def test_force_skips_the_cache(monkeypatch):
+    monkeypatch.setattr(plan_cache.settings, "plan_cache_enabled", True)
+    session = lookup_session(exact=SimpleNamespace(id=uuid.uuid4(), execution_plan=plan_json("R")))
+    assert await _cached_plan(session, None, AuditRequest(), force=True) is None
+    assert session.statements == []
@@ -0,0 +1,202 @@
+"""Unit tests for the plan job worker's run / retry bookkeeping."""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from app.services import plan_jobs
+from app.services.plan_jobs import PlanWorker, PlanWorkerPool, _finish, claim_plan_job
+
+REQUEST = {"ingredients": ["lemon", "chicken"]}
+# plan_history ids that already exist
+SAVED_PLANS: set[uuid.UUID] = set()
+
+
+class FakeSession:
+    async def rollback(self):
+        pass
+
+    async def scalar(self, stmt):
+        job_id = stmt.compile().params["id_1"]
+        return job_id if job_id in SAVED_PLANS else None
+
+
+@asynccontextmanager
+async def fake_sessions():
+    yield FakeSession()
+
+
+@pytest.fixture
+def job_calls(monkeypatch):
+    calls = {"claimed": [], "finished": [], "pipeline": []}
+    queue = []
+
+    async def claim(session, llm_backend, worker_id):
+        calls["claimed"].append((llm_backend, worker_id))
+        return queue.pop(0) if queue else None
+
+    async def finish(session, job_id, worker_id, status, error=None):
+        calls["finished"].append((job_id, status, error))
+
+    monkeypatch.setattr(plan_jobs, "claim_plan_job", claim)
+    monkeypatch.setattr(plan_jobs, "_finish", finish)
+    monkeypatch.setattr(plan_jobs.settings, "plan_job_max_attempts", 2)
+    monkeypatch.setattr(plan_jobs.settings, "plan_job_poll_seconds", 0.01)
+    SAVED_PLANS.clear()
+    calls["queue"] = queue
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_successful_job_uses_job_id_as_plan_id(job_calls, monkeypatch):
+    job_id = uuid.uuid4()
+    job_calls["queue"].append((job_id, REQUEST, 1))
+
+    async def pipeline(request, session, llm, session_factory, plan_id):
+        job_calls["pipeline"].append((request.ingredients, plan_id))
+        return plan_id, None
+
+    monkeypatch.setattr(plan_jobs, "run_pipeline", pipeline)
+    worker = PlanWorker(object(), "ollama", "w0", session_factory=fake_sessions)
+
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+    assert job_calls["pipeline"] == [(["lemon", "chicken"], str(job_id))]
+    assert job_calls["finished"] == [(job_id, "done", None)]
+    assert job_calls["claimed"] == [("ollama", "w0"), ("ollama", "w0")]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_requeued_until_attempts_run_out(job_calls, monkeypatch):
+    job_id = uuid.uuid4()
+    job_calls["queue"].extend([(job_id, REQUEST, 1), (job_id, REQUEST, 2)])
+
+    async def pipeline(*args, **kwargs):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(plan_jobs, "run_pipeline", pipeline)
+    worker = PlanWorker(object(), "ollama", "w0", session_factory=fake_sessions)
+
+    await worker.run_once()
+    await worker.run_once()
+    assert job_calls["finished"] == [
+        (job_id, "pending", "model unavailable"),
+        (job_id, "failed", "model unavailable"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pool_polls_until_stopped(job_calls, monkeypatch):
+    pool = PlanWorkerPool(2, object(), "anthropic")
+    for worker in pool.workers:
+        worker._session_factory = fake_sessions
+
+    pool.start()
+    await asyncio.sleep(0.05)
+    await pool.stop(grace_seconds=1.0)
+
+    worker_ids = {w for _, w in job_calls["claimed"]}
+    assert len(worker_ids) == 2
+    assert all(t.done() for t in pool._tasks)
+
+
+async def test_reclaimed_job_with_saved_plan_is_not_rerun(job_calls, monkeypatch):
+    job_id = uuid.uuid4()
+    job_calls["queue"].append((job_id, REQUEST, 2))
+    SAVED_PLANS.add(job_id)
+
+    async def pipeline(*args, **kwargs):
+        job_calls["pipeline"].append(kwargs["plan_id"])
+
+    monkeypatch.setattr(plan_jobs, "run_pipeline", pipeline)
+    worker = PlanWorker(object(), "ollama", "w1", session_factory=fake_sessions)
+
+    assert await worker.run_once() is True
+    assert job_calls["pipeline"] == []
+    assert job_calls["finished"] == [(job_id, "done", None)]
+
+
+async def test_duplicate_plan_from_concurrent_copy_counts_as_done(job_calls, monkeypatch):
+    job_id = uuid.uuid4()
+    job_calls["queue"].append((job_id, REQUEST, 1))
+
+    async def pipeline(*args, **kwargs):
+        # The stale worker's copy finished first and inserted the same plan_history id
+        SAVED_PLANS.add(job_id)
+        raise IntegrityError("INSERT INTO plan_history", {}, Exception("duplicate key"))
+
+    monkeypatch.setattr(plan_jobs, "run_pipeline", pipeline)
+    worker = PlanWorker(object(), "ollama", "w1", session_factory=fake_sessions)
+
+    await worker.run_once()
+    assert job_calls["finished"] == [(job_id, "done", None)]
+
+
+class RecordingSession:
+    """Records compiled SQL; ``running`` is the count the cap check sees."""
+
+    def __init__(self, running=0, claimed=None, rowcount=1):
+        self.running = running
+        self.claimed = claimed
+        self.rowcount = rowcount
+        self.sql: list[str] = []
+        self.params: list[dict | None] = []
+
+    @asynccontextmanager
+    async def begin(self):
+        yield
+
+    def _record(self, stmt):
+        self.sql.append(str(stmt.compile(dialect=postgresql.dialect())))
+
+    async def execute(self, stmt, params=None):
+        self._record(stmt)
+        self.params.append(params)
+        return SimpleNamespace(first=lambda: self.claimed, rowcount=self.rowcount)
+
+    async def scalar(self, stmt):
+        self._record(stmt)
+        return self.running
+
+    async def commit(self):
+        pass
+
+
+async def test_claim_locks_checks_cap_and_skips_locked_rows(monkeypatch):
+    monkeypatch.setattr(plan_jobs.settings, "plan_job_concurrency", {"ollama": 1})
+    job_id = uuid.uuid4()
+    row = SimpleNamespace(id=job_id, audit_request=REQUEST, attempts=1)
+    session = RecordingSession(running=0, claimed=row)
+
+    assert await claim_plan_job(session, "ollama", "w0") == (job_id, REQUEST, 1)
+    lock, expire, count, claim = session.sql
+    assert lock == "SELECT pg_advisory_xact_lock(hashtext(%(key)s))"
+    assert session.params[0] == {"key": "plan_jobs:ollama"}
+    assert expire.startswith("UPDATE plan_jobs SET status=")
+    assert "plan_jobs.attempts >= " in expire
+    assert count.startswith("SELECT count(*)")
+    assert "FOR UPDATE SKIP LOCKED" in claim
+    assert "RETURNING plan_jobs.id, plan_jobs.audit_request, plan_jobs.attempts" in claim
+
+
+async def test_claim_stops_at_backend_cap(monkeypatch):
+    monkeypatch.setattr(plan_jobs.settings, "plan_job_concurrency", {"ollama": 1})
+    session = RecordingSession(running=1)
+
+    assert await claim_plan_job(session, "ollama", "w0") is None
+    # Lock, expiry and count only — no claim attempted
+    assert len(session.sql) == 3
+    assert not any("SKIP LOCKED" in sql for sql in session.sql)
+
+
+async def test_finish_only_applies_to_the_claiming_worker():
+    session = RecordingSession(rowcount=0)
+
+    assert await _finish(session, uuid.uuid4(), "w0", "done") is False
+    assert "plan_jobs.worker_id = %(worker_id_1)s" in session.sql[0]
+    assert "plan_jobs.status = %(status_1)s" in session.sql[0]
@@ -0,0 +1,74 @@
+"""Unit tests for the precomputed substitute_neighbors table."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import flavor_graph, substitute_neighbors
+from app.services.descriptor_index import DescriptorIndex
+from app.services.substitute_neighbors import (
+    _neighbor_rows,
+    lookup_substitutes,
+    refresh_substitute_neighbors,
+)
+from tests.conftest import FakeSession
+
+
+@pytest.fixture
+def index():
+    ingredients = {
+        1: ("lemon", "Fruit"),
+        2: ("lime", "Fruit"),
+        3: ("orange", "Fruit"),
+        4: ("thyme", "Herb"),
+    }
+    descriptors = {
+        1: {"citrus", "sour", "bright"},
+        2: {"citrus", "sour", "floral"},
+        3: {"citrus", "sweet"},
+        4: {"herbal", "earthy", "citrus"},
+    }
+    return DescriptorIndex(ingredients, descriptors)
+
+
+def test_neighbor_rows_are_ranked_per_ingredient(index):
+    rows = _neighbor_rows(index, [1, 4], top_k=2)
+    assert rows == [
+        {"ingredient_id": 1, "rank": 1, "neighbor_id": 2, "jaccard_score": 0.5},
+        {"ingredient_id": 1, "rank": 2, "neighbor_id": 3, "jaccard_score": 0.25},
+    ]
+
+
+async def test_lookup_substitutes_shape():
+    session = FakeSession([SimpleNamespace(neighbor_id=2, jaccard_score=0.5, name="lime")])
+    assert await lookup_substitutes(session, 1, top_k=3) == [
+        {"ingredient_id": 2, "ingredient_name": "lime", "jaccard_score": 0.5},
+    ]
+
+
+async def test_precomputed_falls_back_to_index_without_rows(index, monkeypatch):
+    async def get_index(session):
+        return index
+
+    monkeypatch.setattr(flavor_graph, "get_descriptor_index", get_index)
+    results = await flavor_graph.find_substitutes(
+        FakeSession([]), 1, top_k=2, engine="precomputed"
+    )
+    assert [r["ingredient_name"] for r in results] == ["lime", "orange"]
+
+
+async def test_refresh_indexes_only_affected_ingredients(index, monkeypatch):
+    built = []
+
+    async def build(session, ingredient_ids=None):
+        built.append(ingredient_ids)
+        return index
+
+    monkeypatch.setattr(substitute_neighbors, "build_descriptor_index", build)
+    # Affected set: every ingredient sharing a category with the changed one
+    session = FakeSession([1, 2, 3])
+
+    written = await refresh_substitute_neighbors(session, [2], top_k=1)
+
+    assert built == [[1, 2, 3]]
+    assert written == 3
@@ -0,0 +1,58 @@
+"""Unit tests for streaming Translator output through AgentContext.emit."""
+
+import json
+
+import pytest
+
+from app.agents.base import AgentContext
+from app.agents.translator import run_translator
+from app.schemas.audit import AuditRequest
+
+OUTPUT = {
+    "dish_name": "Charred Lemon Chicken",
+    "dish_description": "Crisp skin, bright sauce.",
+    "difficulty": "Intermediate",
+    "ingredients": [
+        {"name": "chicken thigh", "amount_grams": 400, "original_amount": "4 thighs"},
+        {"name": "lemon", "amount_grams": 60, "original_amount": "1 lemon"},
+    ],
+    "substitution_notes": [],
+}
+
+
+class StreamingLLM:
+    _model = "stream-model"
+
+    async def generate(self, *args, **kwargs):
+        raise AssertionError("streaming contexts must not call generate")
+
+    async def generate_stream(self, system_prompt, user_prompt, **kwargs):
+        assert "schema" in system_prompt
+        text = json.dumps(OUTPUT)
+        for i in range(0, len(text), 5):
+            yield text[i:i + 5]
+
+
+@pytest.mark.asyncio
+async def test_translator_emits_partial_output_before_completion():
+    events = []
+    ctx = AgentContext(
+        audit_request=AuditRequest(ingredients=["chicken", "lemon"], guest_count=4),
+        affinities_text=[],
+        flavor_set_suggestions=[],
+        knowledge_text="",
+        emit=lambda event, data: events.append((event, data)),
+    )
+
+    await run_translator(ctx, None, StreamingLLM())
+
+    partials = [data for event, data in events if event == "translator"]
+    # The dish name arrives while it is still being written
+    assert list(partials[0]) == ["dish_name"]
+    assert partials[0]["dish_name"] != OUTPUT["dish_name"]
+    first_with_items = next(p for p in partials if p.get("ingredients"))
+    # An item is only reported once the model has moved past it
+    assert [i["name"] for i in first_with_items["ingredients"]] == ["chicken thigh"]
+    assert [i["name"] for i in partials[-1]["ingredients"]] == ["chicken thigh", "lemon"]
+    assert ctx.dish_name == "Charred Lemon Chicken"
+    assert len(ctx.ingredients_list) == 2
@@ -0,0 +1,10 @@
+"""Unit tests for ANN index sizing."""
+
+from app.services.vector_index import ivfflat_lists
+
+
+def test_ivfflat_lists_scales_with_rows():
+    assert ivfflat_lists(0) == 1
+    assert ivfflat_lists(500) == 1
+    assert ivfflat_lists(250_000) == 250
+    assert ivfflat_lists(4_000_000) == 2000
@@ -0,0 +1,71 @@
+"""Unit tests for the in-process knowledge vector store."""
+
+import numpy as np
+
+from app.services.vector_store import VectorStore, _normalize, load_vectors, save_vectors
+from tests.conftest import FakeSession
+
+
+def make_store() -> VectorStore:
+    rows = [
+        {"id": i, "content_type": ct, "source_table": "t", "text_content": f"doc {i}",
+         "metadata": None}
+        for i, ct in enumerate(["technique", "technique", "pairing", "technique"], start=1)
+    ]
+    vectors = _normalize(np.array([
+        [1.0, 0.0, 0.0],
+        [0.8, 0.6, 0.0],
+        [0.9, 0.1, 0.0],
+        [0.0, 0.0, 1.0],
+    ], dtype=np.float32))
+    return VectorStore(rows, vectors)
+
+
+def test_search_orders_by_cosine():
+    results = make_store().search([2.0, 0.0, 0.0], top_k=3)
+    assert [r["id"] for r in results] == [1, 3, 2]
+    assert results[0]["similarity"] == 1.0
+    assert results[0]["text_content"] == "doc 1"
+
+
+def test_content_type_filter():
+    store = make_store()
+    assert [r["id"] for r in store.search([1.0, 0.0, 0.0], "technique", 5)] == [1, 2, 4]
+    assert store.search([1.0, 0.0, 0.0], "unknown") == []
+
+
+def test_empty_store():
+    store = VectorStore([], np.zeros((0, 3), dtype=np.float32))
+    assert store.search([1.0, 0.0, 0.0]) == []
+
+
+def test_memmap_round_trip(tmp_path):
+    path = tmp_path / "vectors.npy"
+    ids = np.array([1, 2], dtype=np.int64)
+    vectors = np.eye(2, dtype=np.float32)
+    save_vectors(path, ids, vectors)
+
+    loaded = load_vectors(path, ids)
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, vectors)
+    assert load_vectors(path, np.array([1, 3], dtype=np.int64)) is None
+
+
+def test_memmap_rejects_changed_contents(tmp_path):
+    # Same ids, but a chunk was re-embedded in place with new text
+    path = tmp_path / "vectors.npy"
+    ids = np.array([1, 2], dtype=np.int64)
+    save_vectors(path, ids, np.eye(2, dtype=np.float32), "digest-a")
+
+    assert load_vectors(path, ids, "digest-a") is not None
+    assert load_vectors(path, ids, "digest-b") is None
+
+
+async def test_table_version_digests_content_hashes():
+    from app.services.vector_store import _table_version
+
+    session = FakeSession([(2, 7, "abc")])
+    assert await _table_version(session) == (2, 7, "abc")
+    (sql,) = session.sql()
+    assert "md5(string_agg(coalesce(culinary_embeddings.content_hash" in sql
+    assert "ORDER BY culinary_embeddings.id" in sql
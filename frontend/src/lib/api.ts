@@ -1,9 +1,13 @@
 import { API_URL } from "./constants";
 import type {
+  AffinityBatchResponse,
+  PlanBatchItemResult,
   IngredientSearchResult,
   PlanGenerateRequest,
   PlanGenerateResponse,
   PlanGetResponse,
+  PlanJobResponse,
+  PlanStreamEvent,
   SubstitutionSuggestion,
 } from "./types";
 
@@ -28,6 +32,57 @@ export async function generatePlan(
   });
 }
 
+export async function generatePlanBatch(
+  items: PlanGenerateRequest[]
+): Promise<{ results: PlanBatchItemResult[] }> {
+  return fetchApi("/api/v1/plans/generate:batch", {
+    method: "POST",
+    body: JSON.stringify({ items }),
+  });
+}
+
+export async function generatePlanAsync(
+  request: PlanGenerateRequest
+): Promise<PlanJobResponse> {
+  return fetchApi("/api/v1/plans/generate:async", {
+    method: "POST",
+    body: JSON.stringify(request),
+  });
+}
+
+export async function streamPlan(
+  request: PlanGenerateRequest,
+  onEvent: (event: PlanStreamEvent) => void
+): Promise<void> {
+  const res = await fetch(`${API_URL}/api/v1/plans/generate:stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(request),
+  });
+  if (!res.ok || !res.body) {
+    const body = await res.text();
+    throw new Error(`API error ${res.status}: ${body}`);
+  }
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    let end: number;
+    while ((end = buffer.indexOf("\n\n")) >= 0) {
+      const frame = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      const event = frame.match(/^event: (.*)$/m)?.[1];
+      const data = frame.match(/^data: (.*)$/m)?.[1];
+      if (event && data) {
+        onEvent({ event, data: JSON.parse(data) } as PlanStreamEvent);
+      }
+    }
+  }
+}
+
 export async function getPlan(planId: string): Promise<PlanGetResponse> {
   return fetchApi(`/api/v1/plans/${planId}`);
 }
@@ -41,6 +96,17 @@ export async function searchIngredients(
   );
 }
 
+export async function getAffinitiesBatch(
+  names: string[],
+  minScore = 0,
+  limit = 20
+): Promise<AffinityBatchResponse> {
+  return fetchApi("/api/v1/ingredients/affinities:batch", {
+    method: "POST",
+    body: JSON.stringify({ names, min_score: minScore, limit }),
+  });
+}
+
 export async function suggestSubstitutions(
   ingredientName: string,
   availableIngredients: string[] = []
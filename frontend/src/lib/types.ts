@@ -43,6 +43,46 @@ export interface ExecutionPlan {
 export interface PlanGenerateResponse {
   id: string;
   plan: ExecutionPlan;
+  cached?: boolean;
+}
+
+export type PlanStreamEvent =
+  | { event: "accepted"; data: Record<string, never> }
+  | {
+      event: "stage";
+      data: {
+        name: string;
+        summary: string;
+        started_ms: number;
+        finished_ms: number;
+        error: string | null;
+      };
+    }
+  | {
+      event: "translator";
+      data: {
+        dish_name?: string;
+        dish_description?: string;
+        difficulty?: string;
+        ingredients?: PlanIngredient[];
+      };
+    }
+  | { event: "plan"; data: PlanGenerateResponse }
+  | { event: "error"; data: { detail: string } };
+
+export interface PlanBatchItemResult {
+  index: number;
+  id: string | null;
+  plan: ExecutionPlan | null;
+  cached: boolean;
+  error: string | null;
+}
+
+export interface PlanJobResponse {
+  id: string;
+  status: "pending" | "running" | "done" | "failed";
+  attempts: number;
+  error: string | null;
 }
 
 export interface PlanGetResponse {
@@ -59,6 +99,7 @@ export interface PlanGenerateRequest {
   user_skill: string;
   guest_count: number;
   intent?: string;
+  force?: boolean;
 }
 
 export interface IngredientSearchResult {
@@ -74,3 +115,14 @@ export interface SubstitutionSuggestion {
   rationale: string;
   adjustment_notes: string | null;
 }
+
+export interface AffinityOut {
+  ingredient_name: string;
+  affinity_score: number;
+  source: string | null;
+}
+
+export interface AffinityBatchResponse {
+  affinities: Record<string, AffinityOut[]>;
+  not_found: string[];
+}